@@ -1,29 +1,75 @@
-from .utils.agent_utils import Toolkit, create_msg_delete
-from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
-from .utils.memory import FinancialSituationMemory
+import importlib
+from typing import TYPE_CHECKING
 
-from .analysts.fundamentals_analyst import create_fundamentals_analyst
-from .analysts.market_analyst import create_market_analyst
-from .analysts.news_analyst import create_news_analyst
-from .analysts.social_media_analyst import create_social_media_analyst
-from .analysts.index_analyst import create_index_analyst
-from .analysts.sector_analyst import create_sector_analyst
+# 导入统一日志系统
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger("default")
 
-from .researchers.bear_researcher import create_bear_researcher
-from .researchers.bull_researcher import create_bull_researcher
+# 导出名称 -> 所在子模块（首次访问时才导入，只用到分析师时不会加载研究员/交易员/风控模块）
+_LAZY_EXPORTS = {
+    "Toolkit": ".utils.agent_utils",
+    "create_msg_delete": ".utils.agent_utils",
+    "AgentState": ".utils.agent_states",
+    "InvestDebateState": ".utils.agent_states",
+    "RiskDebateState": ".utils.agent_states",
+    "FinancialSituationMemory": ".utils.memory",
+    "create_fundamentals_analyst": ".analysts.fundamentals_analyst",
+    "create_market_analyst": ".analysts.market_analyst",
+    "create_news_analyst": ".analysts.news_analyst",
+    "create_social_media_analyst": ".analysts.social_media_analyst",
+    "create_index_analyst": ".analysts.index_analyst",
+    "create_sector_analyst": ".analysts.sector_analyst",
+    "create_bear_researcher": ".researchers.bear_researcher",
+    "create_bull_researcher": ".researchers.bull_researcher",
+    "create_risky_debator": ".risk_mgmt.aggresive_debator",
+    "create_safe_debator": ".risk_mgmt.conservative_debator",
+    "create_neutral_debator": ".risk_mgmt.neutral_debator",
+    "create_parallel_safe_neutral_debators": ".risk_mgmt.parallel_debators",
+    "create_research_manager": ".managers.research_manager",
+    "create_risk_manager": ".managers.risk_manager",
+    "create_trader": ".trader.trader",
+}
 
-from .risk_mgmt.aggresive_debator import create_risky_debator
-from .risk_mgmt.conservative_debator import create_safe_debator
-from .risk_mgmt.neutral_debator import create_neutral_debator
+if TYPE_CHECKING:
+    # 仅供类型检查/IDE 使用，运行时通过 __getattr__ 按需导入
+    from .utils.agent_utils import Toolkit, create_msg_delete
+    from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
+    from .utils.memory import FinancialSituationMemory
 
-from .managers.research_manager import create_research_manager
-from .managers.risk_manager import create_risk_manager
+    from .analysts.fundamentals_analyst import create_fundamentals_analyst
+    from .analysts.market_analyst import create_market_analyst
+    from .analysts.news_analyst import create_news_analyst
+    from .analysts.social_media_analyst import create_social_media_analyst
+    from .analysts.index_analyst import create_index_analyst
+    from .analysts.sector_analyst import create_sector_analyst
 
-from .trader.trader import create_trader
+    from .researchers.bear_researcher import create_bear_researcher
+    from .researchers.bull_researcher import create_bull_researcher
+
+    from .risk_mgmt.aggresive_debator import create_risky_debator
+    from .risk_mgmt.conservative_debator import create_safe_debator
+    from .risk_mgmt.neutral_debator import create_neutral_debator
+    from .risk_mgmt.parallel_debators import create_parallel_safe_neutral_debators
+
+    from .managers.research_manager import create_research_manager
+    from .managers.risk_manager import create_risk_manager
+
+    from .trader.trader import create_trader
+
+
+def __getattr__(name: str):
+    """按需导入导出对象，并写入模块全局变量，后续访问不再经过此函数"""
+    module_path = _LAZY_EXPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
-# 导入统一日志系统
-from tradingagents.utils.logging_init import get_logger
-logger = get_logger("default")
 
 __all__ = [
     "FinancialSituationMemory",
@@ -39,6 +85,7 @@ __all__ = [
     "create_market_analyst",
     "create_neutral_debator",
     "create_news_analyst",
+    "create_parallel_safe_neutral_debators",
     "create_risky_debator",
     "create_risk_manager",
     "create_safe_debator",
@@ -7,6 +7,7 @@ logger = get_logger("default")
 
 # 导入模板客户端
 from tradingagents.utils.template_client import get_agent_prompt
+from tradingagents.agents.utils.agent_states import debate_history_text
 
 
 def create_risk_manager(llm, memory):
@@ -16,7 +17,7 @@ def create_risk_manager(llm, memory):
 
         # 使用 .get() 安全访问辩论状态
         risk_debate_state = state.get("risk_debate_state", {})
-        history = risk_debate_state.get("history", "")
+        history = debate_history_text(risk_debate_state.get("history"))
         # 使用 .get() 安全访问，支持用户只选择部分分析师的情况
         market_research_report = state.get("market_report", "")
         news_report = state.get("news_report", "")
@@ -191,10 +192,10 @@ def create_risk_manager(llm, memory):
 
         new_risk_debate_state = {
             "judge_decision": response_content,
-            "history": risk_debate_state.get("history", ""),
-            "risky_history": risk_debate_state.get("risky_history", ""),
-            "safe_history": risk_debate_state.get("safe_history", ""),
-            "neutral_history": risk_debate_state.get("neutral_history", ""),
+            "history": risk_debate_state.get("history", []),
+            "risky_history": risk_debate_state.get("risky_history", []),
+            "safe_history": risk_debate_state.get("safe_history", []),
+            "neutral_history": risk_debate_state.get("neutral_history", []),
             "latest_speaker": "Judge",
             "current_risky_response": risk_debate_state.get("current_risky_response", ""),
             "current_safe_response": risk_debate_state.get("current_safe_response", ""),
@@ -5,6 +5,8 @@ import json
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
+from tradingagents.agents.utils.agent_states import debate_history_lines, debate_history_text
+
 # 导入模板客户端
 from tradingagents.utils.template_client import get_agent_prompt
 
@@ -13,8 +15,9 @@ def create_risky_debator(llm):
     def risky_node(state) -> dict:
         # 使用 .get() 安全访问辩论状态
         risk_debate_state = state.get("risk_debate_state", {})
-        history = risk_debate_state.get("history", "")
-        risky_history = risk_debate_state.get("risky_history", "")
+        history_lines = debate_history_lines(risk_debate_state.get("history"))
+        risky_history = debate_history_lines(risk_debate_state.get("risky_history"))
+        history = debate_history_text(history_lines)
 
         current_safe_response = risk_debate_state.get("current_safe_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
@@ -125,10 +128,10 @@ def create_risky_debator(llm):
         logger.info(f"🔥 [激进风险分析师] 发言完成，计数: {risk_debate_state['count']} -> {new_count}")
 
         new_risk_debate_state = {
-            "history": history + "\n" + argument,
-            "risky_history": risky_history + "\n" + argument,
-            "safe_history": risk_debate_state.get("safe_history", ""),
-            "neutral_history": risk_debate_state.get("neutral_history", ""),
+            "history": history_lines + [argument],
+            "risky_history": risky_history + [argument],
+            "safe_history": risk_debate_state.get("safe_history", []),
+            "neutral_history": risk_debate_state.get("neutral_history", []),
             "latest_speaker": "Risky",
             "current_risky_response": argument,
             "current_safe_response": risk_debate_state.get("current_safe_response", ""),
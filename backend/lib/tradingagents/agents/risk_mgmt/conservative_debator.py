@@ -1,21 +1,37 @@
-from langchain_core.messages import AIMessage
+import logging
 import time
-import json
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
-# 导入模板客户端
-from tradingagents.utils.template_client import get_agent_prompt
+from tradingagents.agents.utils.agent_states import debate_history_lines, debate_history_text
+
+# 导入模板系统（带缓存的提示词解析）
+from tradingagents.agents.utils.agent_context import EMPTY_AGENT_CONTEXT, clip_text, resolve_system_prompt
+from tradingagents.agents.utils.llm_response_cache import invoke_with_cache
+
+
+# 模板系统不可用时的降级提示词（模块级常量，长度预先计算）
+_FALLBACK_SAFE_PROMPT = """作为安全/保守风险分析师，您的主要目标是保护资产、最小化波动性，并确保稳定、可靠的增长。
+
+您优先考虑稳定性、安全性和风险缓解，仔细评估潜在损失、经济衰退和市场波动。
+
+在评估交易员的决策或计划时，请批判性地审查高风险要素，指出决策可能使公司面临不当风险的地方。
+
+您的任务是积极反驳激进和中性分析师的论点，突出他们的观点可能忽视的潜在威胁。
+
+请用中文以对话方式输出。"""
+_FALLBACK_SAFE_LEN = len(_FALLBACK_SAFE_PROMPT)
 
 
 def create_safe_debator(llm):
     def safe_node(state) -> dict:
         # 使用 .get() 安全访问辩论状态
         risk_debate_state = state.get("risk_debate_state", {})
-        history = risk_debate_state.get("history", "")
-        safe_history = risk_debate_state.get("safe_history", "")
+        history_lines = debate_history_lines(risk_debate_state.get("history"))
+        safe_history = debate_history_lines(risk_debate_state.get("safe_history"))
+        history = debate_history_text(history_lines)
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
@@ -26,21 +42,35 @@ def create_safe_debator(llm):
         news_report = state.get("news_report", "")
         fundamentals_report = state.get("fundamentals_report", "")
 
+        # ✂️ 按预算截断超长报告，控制 Prompt 总长度
+        clipped_reports = [clip_text(r) for r in (market_research_report, sentiment_report, news_report, fundamentals_report)]
+        if logger.isEnabledFor(logging.DEBUG):
+            for name, original, clipped in zip(
+                ("market_report", "sentiment_report", "news_report", "fundamentals_report"),
+                (market_research_report, sentiment_report, news_report, fundamentals_report),
+                clipped_reports
+            ):
+                if len(clipped) != len(original):
+                    logger.debug("✂️ [Safe Analyst] %s 超出预算已截断: %d -> %d 字符", name, len(original), len(clipped))
+        market_research_report, sentiment_report, news_report, fundamentals_report = clipped_reports
+
         trader_decision = state.get("trader_investment_plan", "")
 
-        # 📊 记录输入数据长度
-        logger.info(f"📊 [Safe Analyst] 输入数据长度统计:")
-        logger.info(f"  - market_report: {len(market_research_report):,} 字符")
-        logger.info(f"  - sentiment_report: {len(sentiment_report):,} 字符")
-        logger.info(f"  - news_report: {len(news_report):,} 字符")
-        logger.info(f"  - fundamentals_report: {len(fundamentals_report):,} 字符")
-        logger.info(f"  - trader_decision: {len(trader_decision):,} 字符")
-        logger.info(f"  - history: {len(history):,} 字符")
-        total_length = (len(market_research_report) + len(sentiment_report) +
-                       len(news_report) + len(fundamentals_report) +
-                       len(trader_decision) + len(history) +
-                       len(current_risky_response) + len(current_neutral_response))
-        logger.info(f"  - 总Prompt长度: {total_length:,} 字符 (~{total_length//4:,} tokens)")
+        # 📊 记录输入数据长度（仅在 INFO 级别启用时计算，使用 % 格式化延迟到真正输出时）
+        if logger.isEnabledFor(logging.INFO):
+            total_length = (len(market_research_report) + len(sentiment_report) +
+                           len(news_report) + len(fundamentals_report) +
+                           len(trader_decision) + len(history) +
+                           len(current_risky_response) + len(current_neutral_response))
+            logger.info(
+                "📊 [Safe Analyst] 输入数据长度统计: market_report=%d sentiment_report=%d "
+                "news_report=%d fundamentals_report=%d trader_decision=%d history=%d "
+                "总Prompt长度=%d 字符 (~%d tokens)",
+                len(market_research_report), len(sentiment_report),
+                len(news_report), len(fundamentals_report),
+                len(trader_decision), len(history),
+                total_length, total_length // 4
+            )
 
         # 🆕 使用模板系统获取提示词
         try:
@@ -56,42 +86,26 @@ def create_safe_debator(llm):
                 "tool_names": ""
             }
 
-            from tradingagents.utils.template_client import get_template_client
-            ctx = state.get("agent_context") or {}
-            tpl_info = get_template_client().get_effective_template(
-                agent_type="debators",
-                agent_name="conservative_debator",
-                user_id=ctx.get("user_id"),
-                preference_id=ctx.get("preference_id") or "conservative",
-                context=None
-            )
-            if tpl_info:
-                logger.info(f"📚 [模板选择] source={tpl_info.get('source')} id={tpl_info.get('template_id')} version={tpl_info.get('version')} agent=debators/conservative_debator")
-
-            # 从模板系统获取提示词
-            system_prompt = get_agent_prompt(
+            ctx = state.get("agent_context") or EMPTY_AGENT_CONTEXT
+            tpl_meta, system_prompt = resolve_system_prompt(
                 agent_type="debators",
                 agent_name="conservative_debator",
                 variables=template_variables,
                 preference_id="conservative",
-                fallback_prompt=None
+                user_id=ctx.get("user_id"),
+                selection_preference_id=ctx.get("preference_id") or "conservative"
             )
+            if tpl_meta:
+                source, template_id, version = tpl_meta
+                logger.info(f"📚 [模板选择] source={source} id={template_id} version={version} agent=debators/conservative_debator")
 
             logger.info(f"✅ [保守风险分析师] 成功从模板系统获取提示词 (长度: {len(system_prompt)})")
 
         except Exception as e:
             logger.error(f"❌ [保守风险分析师] 从模板系统获取提示词失败: {e}")
             # 降级：使用硬编码提示词
-            system_prompt = """作为安全/保守风险分析师，您的主要目标是保护资产、最小化波动性，并确保稳定、可靠的增长。
-
-您优先考虑稳定性、安全性和风险缓解，仔细评估潜在损失、经济衰退和市场波动。
-
-在评估交易员的决策或计划时，请批判性地审查高风险要素，指出决策可能使公司面临不当风险的地方。
-
-您的任务是积极反驳激进和中性分析师的论点，突出他们的观点可能忽视的潜在威胁。
-
-请用中文以对话方式输出。"""
-            logger.warning(f"⚠️ [保守风险分析师] 使用降级提示词 (长度: {len(system_prompt)})")
+            system_prompt = _FALLBACK_SAFE_PROMPT
+            logger.warning("⚠️ [保守风险分析师] 使用降级提示词 (长度: %d)", _FALLBACK_SAFE_LEN)
 
         # 构建完整提示词
         prompt = f"""{system_prompt}
@@ -114,21 +128,22 @@ def create_safe_debator(llm):
         logger.info(f"⏱️ [Safe Analyst] 开始调用LLM...")
         llm_start_time = time.time()
 
-        response = llm.invoke(prompt)
+        no_cache = bool((state.get("agent_context") or EMPTY_AGENT_CONTEXT).get("no_cache"))
+        response_content = invoke_with_cache(llm, prompt, no_cache=no_cache)
 
         llm_elapsed = time.time() - llm_start_time
         logger.info(f"⏱️ [Safe Analyst] LLM调用完成，耗时: {llm_elapsed:.2f}秒")
 
-        argument = f"Safe Analyst: {response.content}"
+        argument = f"Safe Analyst: {response_content}"
 
         new_count = risk_debate_state["count"] + 1
         logger.info(f"🛡️ [保守风险分析师] 发言完成，计数: {risk_debate_state['count']} -> {new_count}")
 
         new_risk_debate_state = {
-            "history": history + "\n" + argument,
-            "risky_history": risk_debate_state.get("risky_history", ""),
-            "safe_history": safe_history + "\n" + argument,
-            "neutral_history": risk_debate_state.get("neutral_history", ""),
+            "history": history_lines + [argument],
+            "risky_history": risk_debate_state.get("risky_history", []),
+            "safe_history": safe_history + [argument],
+            "neutral_history": risk_debate_state.get("neutral_history", []),
             "latest_speaker": "Safe",
             "current_risky_response": risk_debate_state.get(
                 "current_risky_response", ""
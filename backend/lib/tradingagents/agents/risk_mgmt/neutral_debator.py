@@ -1,20 +1,37 @@
+import logging
 import time
-import json
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
-# 导入模板客户端
-from tradingagents.utils.template_client import get_agent_prompt
+from tradingagents.agents.utils.agent_states import debate_history_lines, debate_history_text
+
+# 导入模板系统（带缓存的提示词解析）
+from tradingagents.agents.utils.agent_context import EMPTY_AGENT_CONTEXT, clip_text, resolve_system_prompt
+from tradingagents.agents.utils.llm_response_cache import invoke_with_cache
+
+
+# 模板系统不可用时的降级提示词（模块级常量，长度预先计算）
+_FALLBACK_NEUTRAL_PROMPT = """作为中性风险分析师，您的角色是提供平衡的视角，权衡交易员决策或计划的潜在收益和风险。
+
+您优先考虑全面的方法，评估上行和下行风险，同时考虑更广泛的市场趋势。
+
+您的任务是挑战激进和安全分析师，指出每种观点可能过于乐观或过于谨慎的地方。
+
+倡导更平衡的方法，说明为什么适度风险策略可能提供两全其美的效果。
+
+请用中文以对话方式输出。"""
+_FALLBACK_NEUTRAL_LEN = len(_FALLBACK_NEUTRAL_PROMPT)
 
 
 def create_neutral_debator(llm):
     def neutral_node(state) -> dict:
         # 使用 .get() 安全访问辩论状态
         risk_debate_state = state.get("risk_debate_state", {})
-        history = risk_debate_state.get("history", "")
-        neutral_history = risk_debate_state.get("neutral_history", "")
+        history_lines = debate_history_lines(risk_debate_state.get("history"))
+        neutral_history = debate_history_lines(risk_debate_state.get("neutral_history"))
+        history = debate_history_text(history_lines)
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_safe_response = risk_debate_state.get("current_safe_response", "")
@@ -25,25 +42,37 @@ def create_neutral_debator(llm):
         news_report = state.get("news_report", "")
         fundamentals_report = state.get("fundamentals_report", "")
 
+        # ✂️ 按预算截断超长报告，控制 Prompt 总长度
+        clipped_reports = [clip_text(r) for r in (market_research_report, sentiment_report, news_report, fundamentals_report)]
+        if logger.isEnabledFor(logging.DEBUG):
+            for name, original, clipped in zip(
+                ("market_report", "sentiment_report", "news_report", "fundamentals_report"),
+                (market_research_report, sentiment_report, news_report, fundamentals_report),
+                clipped_reports
+            ):
+                if len(clipped) != len(original):
+                    logger.debug("✂️ [Neutral Analyst] %s 超出预算已截断: %d -> %d 字符", name, len(original), len(clipped))
+        market_research_report, sentiment_report, news_report, fundamentals_report = clipped_reports
+
         trader_decision = state.get("trader_investment_plan", "")
 
-        # 📊 记录所有输入数据的长度，用于性能分析
-        logger.info(f"📊 [Neutral Analyst] 输入数据长度统计:")
-        logger.info(f"  - market_report: {len(market_research_report):,} 字符 (~{len(market_research_report)//4:,} tokens)")
-        logger.info(f"  - sentiment_report: {len(sentiment_report):,} 字符 (~{len(sentiment_report)//4:,} tokens)")
-        logger.info(f"  - news_report: {len(news_report):,} 字符 (~{len(news_report)//4:,} tokens)")
-        logger.info(f"  - fundamentals_report: {len(fundamentals_report):,} 字符 (~{len(fundamentals_report)//4:,} tokens)")
-        logger.info(f"  - trader_decision: {len(trader_decision):,} 字符 (~{len(trader_decision)//4:,} tokens)")
-        logger.info(f"  - history: {len(history):,} 字符 (~{len(history)//4:,} tokens)")
-        logger.info(f"  - current_risky_response: {len(current_risky_response):,} 字符 (~{len(current_risky_response)//4:,} tokens)")
-        logger.info(f"  - current_safe_response: {len(current_safe_response):,} 字符 (~{len(current_safe_response)//4:,} tokens)")
-
-        # 计算总prompt长度
-        total_prompt_length = (len(market_research_report) + len(sentiment_report) +
-                              len(news_report) + len(fundamentals_report) +
-                              len(trader_decision) + len(history) +
-                              len(current_risky_response) + len(current_safe_response))
-        logger.info(f"  - 🚨 总Prompt长度: {total_prompt_length:,} 字符 (~{total_prompt_length//4:,} tokens)")
+        # 📊 记录所有输入数据的长度，用于性能分析（仅在 INFO 级别启用时计算，使用 % 格式化延迟到真正输出时）
+        if logger.isEnabledFor(logging.INFO):
+            total_prompt_length = (len(market_research_report) + len(sentiment_report) +
+                                  len(news_report) + len(fundamentals_report) +
+                                  len(trader_decision) + len(history) +
+                                  len(current_risky_response) + len(current_safe_response))
+            logger.info(
+                "📊 [Neutral Analyst] 输入数据长度统计: market_report=%d sentiment_report=%d "
+                "news_report=%d fundamentals_report=%d trader_decision=%d history=%d "
+                "current_risky_response=%d current_safe_response=%d "
+                "🚨 总Prompt长度=%d 字符 (~%d tokens)",
+                len(market_research_report), len(sentiment_report),
+                len(news_report), len(fundamentals_report),
+                len(trader_decision), len(history),
+                len(current_risky_response), len(current_safe_response),
+                total_prompt_length, total_prompt_length // 4
+            )
 
         # 🆕 使用模板系统获取提示词
         try:
@@ -59,42 +88,26 @@ def create_neutral_debator(llm):
                 "tool_names": ""
             }
 
-            from tradingagents.utils.template_client import get_template_client
-            ctx = state.get("agent_context") or {}
-            tpl_info = get_template_client().get_effective_template(
-                agent_type="debators",
-                agent_name="neutral_debator",
-                user_id=ctx.get("user_id"),
-                preference_id=ctx.get("preference_id") or "neutral",
-                context=None
-            )
-            if tpl_info:
-                logger.info(f"📚 [模板选择] source={tpl_info.get('source')} id={tpl_info.get('template_id')} version={tpl_info.get('version')} agent=debators/neutral_debator")
-
-            # 从模板系统获取提示词
-            system_prompt = get_agent_prompt(
+            ctx = state.get("agent_context") or EMPTY_AGENT_CONTEXT
+            tpl_meta, system_prompt = resolve_system_prompt(
                 agent_type="debators",
                 agent_name="neutral_debator",
                 variables=template_variables,
                 preference_id="neutral",
-                fallback_prompt=None
+                user_id=ctx.get("user_id"),
+                selection_preference_id=ctx.get("preference_id") or "neutral"
             )
+            if tpl_meta:
+                source, template_id, version = tpl_meta
+                logger.info(f"📚 [模板选择] source={source} id={template_id} version={version} agent=debators/neutral_debator")
 
             logger.info(f"✅ [中性风险分析师] 成功从模板系统获取提示词 (长度: {len(system_prompt)})")
 
         except Exception as e:
             logger.error(f"❌ [中性风险分析师] 从模板系统获取提示词失败: {e}")
             # 降级：使用硬编码提示词
-            system_prompt = """作为中性风险分析师，您的角色是提供平衡的视角，权衡交易员决策或计划的潜在收益和风险。
-
-您优先考虑全面的方法，评估上行和下行风险，同时考虑更广泛的市场趋势。
-
-您的任务是挑战激进和安全分析师，指出每种观点可能过于乐观或过于谨慎的地方。
-
-倡导更平衡的方法，说明为什么适度风险策略可能提供两全其美的效果。
-
-请用中文以对话方式输出。"""
-            logger.warning(f"⚠️ [中性风险分析师] 使用降级提示词 (长度: {len(system_prompt)})")
+            system_prompt = _FALLBACK_NEUTRAL_PROMPT
+            logger.warning("⚠️ [中性风险分析师] 使用降级提示词 (长度: %d)", _FALLBACK_NEUTRAL_LEN)
 
         # 构建完整提示词
         prompt = f"""{system_prompt}
@@ -117,22 +130,23 @@ def create_neutral_debator(llm):
         logger.info(f"⏱️ [Neutral Analyst] 开始调用LLM...")
         llm_start_time = time.time()
 
-        response = llm.invoke(prompt)
+        no_cache = bool((state.get("agent_context") or EMPTY_AGENT_CONTEXT).get("no_cache"))
+        response_content = invoke_with_cache(llm, prompt, no_cache=no_cache)
 
         llm_elapsed = time.time() - llm_start_time
         logger.info(f"⏱️ [Neutral Analyst] LLM调用完成，耗时: {llm_elapsed:.2f}秒")
-        logger.info(f"📝 [Neutral Analyst] 响应长度: {len(response.content):,} 字符")
+        logger.info(f"📝 [Neutral Analyst] 响应长度: {len(response_content):,} 字符")
 
-        argument = f"Neutral Analyst: {response.content}"
+        argument = f"Neutral Analyst: {response_content}"
 
         new_count = risk_debate_state["count"] + 1
         logger.info(f"⚖️ [中性风险分析师] 发言完成，计数: {risk_debate_state['count']} -> {new_count}")
 
         new_risk_debate_state = {
-            "history": history + "\n" + argument,
-            "risky_history": risk_debate_state.get("risky_history", ""),
-            "safe_history": risk_debate_state.get("safe_history", ""),
-            "neutral_history": neutral_history + "\n" + argument,
+            "history": history_lines + [argument],
+            "risky_history": risk_debate_state.get("risky_history", []),
+            "safe_history": risk_debate_state.get("safe_history", []),
+            "neutral_history": neutral_history + [argument],
             "latest_speaker": "Neutral",
             "current_risky_response": risk_debate_state.get(
                 "current_risky_response", ""
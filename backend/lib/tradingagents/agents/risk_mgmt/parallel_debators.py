@@ -0,0 +1,89 @@
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from tradingagents.agents.utils.agent_states import debate_history_lines
+
+# 导入统一日志系统
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger("default")
+
+# 保守/中性并行发言共用的线程池（每次发言只提交两个任务，不再为每次调用新建线程池）
+PARALLEL_DEBATE_MAX_WORKERS = 8
+_debate_executor: Optional[ThreadPoolExecutor] = None
+_debate_executor_lock = threading.Lock()
+
+
+def _get_debate_executor() -> ThreadPoolExecutor:
+    """获取并行辩论线程池（首次调用时创建，进程退出时关闭）"""
+    global _debate_executor
+    if _debate_executor is None:
+        with _debate_executor_lock:
+            if _debate_executor is None:
+                _debate_executor = ThreadPoolExecutor(
+                    max_workers=PARALLEL_DEBATE_MAX_WORKERS,
+                    thread_name_prefix="risk-debate",
+                )
+                atexit.register(_debate_executor.shutdown, wait=False)
+    return _debate_executor
+
+
+def merge_debate_updates(risk_debate_state: dict, safe_update: dict, neutral_update: dict) -> dict:
+    """
+    合并保守/中性分析师在同一轮中并行产生的辩论状态
+
+    两个节点基于同一份 risk_debate_state 运行，合并时按固定顺序（Safe 在前，
+    Neutral 在后）追加历史，保证结果确定。
+
+    Args:
+        risk_debate_state: 并行执行前的辩论状态
+        safe_update: 保守分析师返回的 risk_debate_state
+        neutral_update: 中性分析师返回的 risk_debate_state
+
+    Returns:
+        合并后的 risk_debate_state
+    """
+    safe_argument = safe_update["current_safe_response"]
+    neutral_argument = neutral_update["current_neutral_response"]
+    history = debate_history_lines(risk_debate_state.get("history"))
+
+    return {
+        "history": history + [safe_argument, neutral_argument],
+        "risky_history": risk_debate_state.get("risky_history", []),
+        "safe_history": safe_update["safe_history"],
+        "neutral_history": neutral_update["neutral_history"],
+        "latest_speaker": "Neutral",
+        "current_risky_response": risk_debate_state.get("current_risky_response", ""),
+        "current_safe_response": safe_argument,
+        "current_neutral_response": neutral_argument,
+        "count": risk_debate_state["count"] + 2,
+    }
+
+
+def create_parallel_safe_neutral_debators(safe_node, neutral_node):
+    """
+    创建并行执行保守/中性分析师的节点
+
+    两者只依赖激进分析师的最新发言和此前的历史，互不依赖当前轮结果，
+    因此可以并发调用 LLM，耗时从两次调用之和降为两者中的较大值。
+    中性分析师看到的是上一轮的保守分析师发言。
+    """
+    def safe_neutral_node(state) -> dict:
+        risk_debate_state = state.get("risk_debate_state", {})
+
+        executor = _get_debate_executor()
+        safe_future = executor.submit(safe_node, state)
+        neutral_future = executor.submit(neutral_node, state)
+        safe_update = safe_future.result()["risk_debate_state"]
+        neutral_update = neutral_future.result()["risk_debate_state"]
+
+        new_risk_debate_state = merge_debate_updates(risk_debate_state, safe_update, neutral_update)
+        logger.info(
+            "🛡️⚖️ [保守/中性风险分析师] 并行发言完成，计数: %d -> %d",
+            risk_debate_state["count"], new_risk_debate_state["count"]
+        )
+
+        return {"risk_debate_state": new_risk_debate_state}
+
+    return safe_neutral_node
@@ -1,7 +1,12 @@
-from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+import os
+import sys
+import time
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, FrozenSet, Mapping, Tuple
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentContext:
     user_id: Optional[str] = None
     preference_id: Optional[str] = None
@@ -10,4 +15,140 @@ class AgentContext:
     # 🔥 调试模式相关字段
     is_debug_mode: bool = False  # 是否为调试模式
     debug_template_id: Optional[str] = None  # 调试模式下使用的模板ID
-    extra: Dict[str, Any] = field(default_factory=dict)
\ No newline at end of file
+    # 只读映射，不参与哈希/比较，保证实例可作为缓存键
+    extra: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}), hash=False, compare=False)
+
+    def __post_init__(self):
+        # 驻留字符串字段：user_id/preference_id 等在各节点间反复比较和作为缓存键
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, str):
+                object.__setattr__(self, f.name, sys.intern(value))
+        if not isinstance(self.extra, MappingProxyType):
+            object.__setattr__(self, "extra", MappingProxyType(dict(self.extra)))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """与 dict 形式的 agent_context 保持相同的读取方式"""
+        if key in _AGENT_CONTEXT_FIELDS:
+            return getattr(self, key)
+        return self.extra.get(key, default)
+
+
+_AGENT_CONTEXT_FIELDS = frozenset(f.name for f in fields(AgentContext))
+
+# 单个报告字段送入 LLM 前的最大字符数（超出部分截断中间，保留头尾）
+REPORT_MAX_CHARS = int(os.getenv("AGENT_REPORT_MAX_CHARS", "20000"))
+# 截断标记为常量，保证同一报告截断后的内容逐字节稳定，便于命中提供方的前缀缓存
+TRUNCATION_MARKER = "\n...[TRUNCATED]...\n"
+
+
+def clip_text(text: str, max_chars: int = REPORT_MAX_CHARS, head_frac: float = 0.7) -> str:
+    """
+    将超长文本截断为 头部 + 截断标记 + 尾部
+
+    Args:
+        text: 原始文本
+        max_chars: 最大保留字符数（不含截断标记）
+        head_frac: 头部所占比例
+
+    Returns:
+        未超长时返回原文本，否则返回截断后的文本
+    """
+    if not text or len(text) <= max_chars:
+        return text
+    head = int(max_chars * head_frac)
+    tail = max_chars - head
+    return text[:head] + TRUNCATION_MARKER + (text[-tail:] if tail > 0 else "")
+
+
+# 系统提示词缓存有效期（秒）。模板和用户偏好存放在 MongoDB 中，可在运行时修改，
+# 缓存按时间分桶，修改最迟在一个有效期后生效；<= 0 表示不缓存
+PROMPT_CACHE_TTL = int(os.getenv("AGENT_PROMPT_CACHE_TTL", "300"))
+
+# 空上下文单例，节点中 state.get("agent_context") 为空时使用，避免每次分配空 dict
+EMPTY_AGENT_CONTEXT = AgentContext()
+
+
+@lru_cache(maxsize=512)
+def _resolve_system_prompt(
+    agent_type: str,
+    agent_name: str,
+    user_id: Optional[str],
+    selection_preference_id: Optional[str],
+    preference_id: Optional[str],
+    variables_key: FrozenSet[Tuple[str, Any]],
+    ttl_bucket: int = 0,
+) -> Tuple[Optional[Tuple[Any, Any, Any]], str]:
+    # ttl_bucket 只参与缓存键，时间桶变化后重新查询模板
+    # 延迟导入：template_client 依赖本模块的 AgentContext
+    from tradingagents.utils.template_client import get_template_client, render_agent_prompt
+
+    client = get_template_client()
+    tpl_info = client.get_effective_template(
+        agent_type=agent_type,
+        agent_name=agent_name,
+        user_id=user_id,
+        preference_id=selection_preference_id,
+        context=None
+    )
+    tpl_meta = (
+        (tpl_info.get("source"), tpl_info.get("template_id"), tpl_info.get("version"))
+        if tpl_info else None
+    )
+
+    template_content = client.get_effective_template(agent_type, agent_name, None, preference_id, None)
+    if not template_content:
+        # 抛出异常而不是返回降级提示词，避免 lru_cache 缓存失败结果
+        raise LookupError(f"未找到可用模板: {agent_type}/{agent_name} (preference={preference_id})")
+
+    return tpl_meta, render_agent_prompt(template_content, dict(variables_key), agent_type, agent_name)
+
+
+def resolve_system_prompt(
+    agent_type: str,
+    agent_name: str,
+    variables: Dict[str, Any],
+    preference_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    selection_preference_id: Optional[str] = None,
+) -> Tuple[Optional[Tuple[Any, Any, Any]], str]:
+    """
+    获取渲染后的系统提示词（带缓存）
+
+    按 (agent_type, agent_name, user_id, preference_id, 模板变量) 缓存，
+    同一 ticker/日期的多轮辩论只查询和渲染一次模板。
+
+    注意：缓存没有变更通知，MongoDB 中的模板或用户偏好被修改后，最长需要
+    PROMPT_CACHE_TTL 秒（环境变量 AGENT_PROMPT_CACHE_TTL，默认 300）才会生效；
+    需要立即生效时调用 clear_system_prompt_cache()。
+
+    Args:
+        agent_type: Agent类型
+        agent_name: Agent名称
+        variables: 模板变量字典
+        preference_id: 渲染提示词使用的偏好ID
+        user_id: 用户ID（用于模板选择日志）
+        selection_preference_id: 用户上下文中的偏好ID（用于模板选择日志）
+
+    Returns:
+        (模板元信息 (source, template_id, version) 或 None, 系统提示词)
+
+    Raises:
+        LookupError: 未找到可用模板时抛出，调用方应使用降级提示词
+    """
+    args = (
+        agent_type,
+        agent_name,
+        user_id,
+        selection_preference_id,
+        preference_id,
+        frozenset(variables.items()),
+    )
+    if PROMPT_CACHE_TTL <= 0:
+        return _resolve_system_prompt.__wrapped__(*args)
+    return _resolve_system_prompt(*args, int(time.monotonic() // PROMPT_CACHE_TTL))
+
+
+def clear_system_prompt_cache() -> None:
+    """清空系统提示词缓存（模板更新后调用）"""
+    _resolve_system_prompt.cache_clear()
@@ -1,8 +1,7 @@
-from typing import Annotated, Sequence, Dict, Any
+from typing import Annotated, Sequence, Dict, Any, List, Union
 from datetime import date, timedelta, datetime
 from typing_extensions import TypedDict, Optional
 from langchain_openai import ChatOpenAI
-from tradingagents.agents import *
 from langgraph.prebuilt import ToolNode
 from langgraph.graph import END, StateGraph, START, MessagesState
 
@@ -11,6 +10,20 @@ from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
 
+def debate_history_lines(history: Union[str, List[str], None]) -> List[str]:
+    """读取辩论历史为列表（兼容旧版字符串格式的状态）"""
+    if isinstance(history, str):
+        return [history] if history else []
+    return history or []
+
+
+def debate_history_text(history: Union[str, List[str], None]) -> str:
+    """将辩论历史合并为字符串（兼容旧版字符串格式的状态）"""
+    if isinstance(history, str):
+        return history
+    return "\n".join(history or [])
+
+
 # Researcher team state
 class InvestDebateState(TypedDict):
     bull_history: Annotated[
@@ -26,17 +39,19 @@ class InvestDebateState(TypedDict):
 
 
 # Risk management team state
+# 辩论历史以 List[str] 存储，每次发言追加一项，避免每轮复制整个字符串；
+# 仅在拼接提示词或输出时通过 debate_history_text() 合并为字符串
 class RiskDebateState(TypedDict):
     risky_history: Annotated[
-        str, "Risky Agent's Conversation history"
+        List[str], "Risky Agent's Conversation history"
     ]  # Conversation history
     safe_history: Annotated[
-        str, "Safe Agent's Conversation history"
+        List[str], "Safe Agent's Conversation history"
     ]  # Conversation history
     neutral_history: Annotated[
-        str, "Neutral Agent's Conversation history"
+        List[str], "Neutral Agent's Conversation history"
     ]  # Conversation history
-    history: Annotated[str, "Conversation history"]  # Conversation history
+    history: Annotated[List[str], "Conversation history"]  # Conversation history
     latest_speaker: Annotated[str, "Analyst that spoke last"]
     current_risky_response: Annotated[
         str, "Latest response by the risky analyst"
@@ -12,7 +12,12 @@ Embedding 服务提供者
 """
 
 import os
+import asyncio
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
@@ -40,6 +45,15 @@ DEFAULT_EMBEDDING_MODELS = {
     "alibaba": "text-embedding-v3",  # 阿里百练别名
 }
 
+# 并发尝试的提供者数量（1 表示严格按优先级串行尝试，>1 时同时请求前 N 个提供者，取最先成功的结果）
+EMBEDDING_PROVIDER_FANOUT = int(os.getenv('EMBEDDING_PROVIDER_FANOUT', '1'))
+
+# 最近 embedding 结果缓存条数（同一文本重复请求时直接返回）
+RECENT_EMBEDDING_CACHE_SIZE = 256
+
+# DashScope 单次请求最多支持的文本条数
+DASHSCOPE_BATCH_SIZE = 10
+
 # 提供者优先级（数字越小优先级越高）
 PROVIDER_PRIORITY = {
     "dashscope": 1,      # 阿里百练优先（国内访问快）
@@ -57,8 +71,6 @@ class EmbeddingProviderManager:
     """
     
     _instance = None
-    _providers_cache: Optional[List[EmbeddingProviderConfig]] = None
-    _cache_timestamp: float = 0
     _cache_ttl: float = 300  # 缓存 5 分钟
     
     def __new__(cls):
@@ -70,6 +82,18 @@ class EmbeddingProviderManager:
         self._initialized = getattr(self, '_initialized', False)
         if not self._initialized:
             self._initialized = True
+            # 提供者列表缓存（时间戳使用 time.monotonic()，不受系统时钟调整影响）
+            self._providers_cache: Optional[List[EmbeddingProviderConfig]] = None
+            self._cache_timestamp: float = 0.0
+            # MongoDB 客户端延迟创建并复用（构造时需要做拓扑发现，开销较大）
+            self._mongo_client = None
+            # 最近 embedding 结果：hash(文本, 首选提供者) -> (向量, 提供者名称)
+            self._recent: "OrderedDict[str, Tuple[List[float], str]]" = OrderedDict()
+            self._recent_lock = threading.Lock()
+            # 按提供者缓存 SDK 客户端，复用连接池，避免每次调用重新握手
+            self._clients: Dict[str, Any] = {}
+            self._dashscope_api_key: Optional[str] = None
+            self._google_api_key: Optional[str] = None
             logger.info("🔧 [EmbeddingProviderManager] 初始化完成")
     
     def get_available_providers(self, force_refresh: bool = False) -> List[EmbeddingProviderConfig]:
@@ -82,8 +106,7 @@ class EmbeddingProviderManager:
         Returns:
             按优先级排序的提供者配置列表
         """
-        import time
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # 检查缓存是否有效
         if (not force_refresh and 
@@ -93,6 +116,10 @@ class EmbeddingProviderManager:
         
         # 从数据库获取配置
         providers = self._fetch_providers_from_db()
+
+        # 强制刷新或 TTL 到期重新加载后配置有变化（API Key / base_url 轮换等）时丢弃旧客户端
+        if force_refresh or providers != self._providers_cache:
+            self._reset_clients()
         
         # 更新缓存
         self._providers_cache = providers
@@ -100,6 +127,33 @@ class EmbeddingProviderManager:
         
         return providers
     
+    def _reset_clients(self) -> None:
+        """清空已缓存的 SDK 客户端"""
+        for client in self._clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        self._clients.clear()
+        self._dashscope_api_key = None
+        self._google_api_key = None
+
+    def _get_openai_client(self, provider: EmbeddingProviderConfig):
+        """获取（或创建）指定提供者的 OpenAI 兼容客户端"""
+        client = self._clients.get(provider.name)
+        if client is None:
+            import httpx
+            from openai import OpenAI
+
+            client = OpenAI(
+                api_key=provider.api_key,
+                base_url=provider.base_url,
+                timeout=30.0,
+                http_client=httpx.Client(limits=httpx.Limits(max_keepalive_connections=20))
+            )
+            client = self._clients.setdefault(provider.name, client)
+        return client
+
     def _fetch_providers_from_db(self) -> List[EmbeddingProviderConfig]:
         """从数据库获取支持 embedding 的提供者"""
         providers = []
@@ -112,14 +166,18 @@ class EmbeddingProviderManager:
             mongo_uri = os.getenv('MONGODB_CONNECTION_STRING', 'mongodb://localhost:27017')
             db_name = os.getenv('MONGODB_DATABASE_NAME', 'tradingagents')
             
-            client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-            db = client[db_name]
+            if self._mongo_client is None:
+                self._mongo_client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000, maxPoolSize=4)
+            db = self._mongo_client[db_name]
             
-            # 查询支持 embedding 的活跃厂商
-            cursor = db.llm_providers.find({
-                "is_active": True,
-                "supported_features": "embedding"
-            })
+            # 查询支持 embedding 的活跃厂商（只取用到的字段）
+            cursor = db.llm_providers.find(
+                {
+                    "is_active": True,
+                    "supported_features": "embedding"
+                },
+                {"name": 1, "display_name": 1, "api_key": 1, "default_base_url": 1, "_id": 0}
+            )
             
             for doc in cursor:
                 # 检查是否有有效的 API Key
@@ -144,8 +202,6 @@ class EmbeddingProviderManager:
                 )
                 providers.append(config)
             
-            client.close()
-            
         except Exception as e:
             logger.warning(f"⚠️ 从数据库获取 embedding 提供者失败: {e}")
         
@@ -218,104 +274,235 @@ class EmbeddingProviderManager:
         Returns:
             (embedding_vector, provider_name) 或 (None, error_message)
         """
-        providers = self.get_available_providers()
+        # 空文本/纯空白直接返回，不浪费一次远程调用
+        stripped = text.strip() if text else ""
+        if not stripped:
+            return None, "empty_text"
+
+        # 同一文本（如重复的 RAG 分块）直接复用最近的结果
+        key = self._recent_key(stripped, preferred_provider)
+        with self._recent_lock:
+            cached = self._recent.get(key)
+            if cached is not None:
+                self._recent.move_to_end(key)
+                return cached
+
+        if EMBEDDING_PROVIDER_FANOUT > 1:
+            future = asyncio.run_coroutine_threadsafe(
+                self.get_embedding_async(text, preferred_provider, EMBEDDING_PROVIDER_FANOUT),
+                _get_background_loop()
+            )
+            embedding, provider_name = future.result()
+        else:
+            embeddings, provider_name = self.get_embeddings([text], preferred_provider)
+            embedding = embeddings[0] if embeddings else None
+
+        if embedding is None:
+            return None, provider_name
+
+        with self._recent_lock:
+            self._recent[key] = (embedding, provider_name)
+            self._recent.move_to_end(key)
+            while len(self._recent) > RECENT_EMBEDDING_CACHE_SIZE:
+                self._recent.popitem(last=False)
+        return embedding, provider_name
+
+    @staticmethod
+    def _recent_key(text: str, preferred_provider: Optional[str]) -> str:
+        """计算最近结果缓存的键（blake2b 8 字节摘要，开销远小于重新获取 embedding）"""
+        h = hashlib.blake2b(text.encode("utf-8"), digest_size=8)
+        if preferred_provider:
+            h.update(b"\x00" + preferred_provider.encode("utf-8"))
+        return h.hexdigest()
+
+    def get_embeddings(self, texts: List[str], preferred_provider: Optional[str] = None) -> Tuple[Optional[List[List[float]]], str]:
+        """
+        批量获取文本的 embedding 向量
+
+        各提供者均支持数组输入，一次请求即可获取多条文本的向量，
+        避免逐条调用带来的 HTTP/TLS/鉴权开销
+
+        Args:
+            texts: 要获取 embedding 的文本列表
+            preferred_provider: 首选的提供者名称（可选）
+
+        Returns:
+            (与 texts 顺序一致的 embedding 列表, provider_name) 或 (None, error_message)
+        """
+        if not texts:
+            return [], "empty_input"
+
+        providers = self._get_ordered_providers(preferred_provider)
 
         if not providers:
             logger.warning("⚠️ 没有可用的 embedding 提供者")
             return None, "no_provider_available"
 
-        # 如果指定了首选提供者，将其放到最前面
-        if preferred_provider:
-            providers = sorted(providers,
-                             key=lambda x: (0 if x.name == preferred_provider else 1, x.priority))
+        # 批内去重：重复文本只请求一次
+        unique_texts = list(dict.fromkeys(texts))
 
         # 按优先级尝试各个提供者
         for provider in providers:
             try:
-                embedding = self._call_provider(provider, text)
-                if embedding:
-                    logger.info(f"✅ 使用 {provider.display_name} 获取 embedding 成功")
-                    return embedding, provider.name
+                embeddings = self._call_provider_batch(provider, unique_texts)
+                if embeddings and len(embeddings) == len(unique_texts) and all(embeddings):
+                    logger.info(f"✅ 使用 {provider.display_name} 获取 embedding 成功 (共 {len(texts)} 条)")
+                    if len(unique_texts) != len(texts):
+                        by_text = dict(zip(unique_texts, embeddings))
+                        embeddings = [by_text[text] for text in texts]
+                    return embeddings, provider.name
             except Exception as e:
                 logger.warning(f"⚠️ {provider.display_name} 获取 embedding 失败: {e}")
                 continue
 
         return None, "all_providers_failed"
 
+    async def get_embedding_async(
+        self,
+        text: str,
+        preferred_provider: Optional[str] = None,
+        fanout: int = 2
+    ) -> Tuple[Optional[List[float]], str]:
+        """
+        并发获取文本的 embedding（最先成功者胜出）
+
+        每次同时请求 fanout 个提供者，取第一个成功的结果并取消其余请求；
+        若这一组全部失败，再尝试下一组。耗时取决于最快的提供者，
+        而不是失败提供者的超时之和
+
+        Args:
+            text: 要获取 embedding 的文本
+            preferred_provider: 首选的提供者名称（可选）
+            fanout: 每组并发请求的提供者数量
+
+        Returns:
+            (embedding_vector, provider_name) 或 (None, error_message)
+        """
+        providers = self._get_ordered_providers(preferred_provider)
+
+        if not providers:
+            logger.warning("⚠️ 没有可用的 embedding 提供者")
+            return None, "no_provider_available"
+
+        fanout = max(1, fanout)
+        for start in range(0, len(providers), fanout):
+            tasks = {
+                asyncio.create_task(asyncio.to_thread(self._call_provider, provider, text)): provider
+                for provider in providers[start:start + fanout]
+            }
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider = tasks[task]
+                    try:
+                        embedding = task.result()
+                    except Exception as e:
+                        logger.warning(f"⚠️ {provider.display_name} 获取 embedding 失败: {e}")
+                        continue
+                    if embedding:
+                        for other in pending:
+                            other.cancel()
+                        logger.info(f"✅ 使用 {provider.display_name} 获取 embedding 成功")
+                        return embedding, provider.name
+
+        return None, "all_providers_failed"
+
+    def _get_ordered_providers(self, preferred_provider: Optional[str] = None) -> List[EmbeddingProviderConfig]:
+        """获取按优先级排序的提供者列表，首选提供者排在最前面"""
+        providers = self.get_available_providers()
+
+        # 如果指定了首选提供者，将其放到最前面
+        if preferred_provider:
+            providers = sorted(providers,
+                             key=lambda x: (0 if x.name == preferred_provider else 1, x.priority))
+        return providers
+
     def _call_provider(self, provider: EmbeddingProviderConfig, text: str) -> Optional[List[float]]:
         """调用指定提供者获取 embedding"""
+        embeddings = self._call_provider_batch(provider, [text])
+        return embeddings[0] if embeddings else None
+
+    def _call_provider_batch(self, provider: EmbeddingProviderConfig, texts: List[str]) -> Optional[List[List[float]]]:
+        """调用指定提供者批量获取 embedding"""
 
         if provider.name in ("dashscope", "alibaba"):
-            return self._call_dashscope(provider, text)
+            return self._call_dashscope_batch(provider, texts)
         elif provider.name == "openai":
-            return self._call_openai(provider, text)
+            return self._call_openai_batch(provider, texts)
         elif provider.name == "google":
-            return self._call_google(provider, text)
+            return self._call_google_batch(provider, texts)
         elif provider.name == "siliconflow":
-            return self._call_siliconflow(provider, text)
+            return self._call_siliconflow_batch(provider, texts)
         else:
             # 默认尝试 OpenAI 兼容接口
-            return self._call_openai_compatible(provider, text)
+            return self._call_openai_compatible_batch(provider, texts)
 
-    def _call_dashscope(self, provider: EmbeddingProviderConfig, text: str) -> Optional[List[float]]:
-        """调用阿里百练 embedding API"""
+    def _call_dashscope_batch(self, provider: EmbeddingProviderConfig, texts: List[str]) -> Optional[List[List[float]]]:
+        """调用阿里百练 embedding API（按 DASHSCOPE_BATCH_SIZE 分批）"""
         try:
             import dashscope
             from dashscope import TextEmbedding
 
-            dashscope.api_key = provider.api_key
+            if self._dashscope_api_key != provider.api_key:
+                dashscope.api_key = provider.api_key
+                self._dashscope_api_key = provider.api_key
 
-            response = TextEmbedding.call(
-                model=provider.model,
-                input=text
-            )
+            embeddings: List[List[float]] = []
+            for start in range(0, len(texts), DASHSCOPE_BATCH_SIZE):
+                chunk = texts[start:start + DASHSCOPE_BATCH_SIZE]
+                response = TextEmbedding.call(
+                    model=provider.model,
+                    input=chunk
+                )
+
+                if response.status_code != 200:
+                    logger.warning(f"DashScope API 错误: {response.code} - {response.message}")
+                    return None
 
-            if response.status_code == 200:
-                return response.output['embeddings'][0]['embedding']
-            else:
-                logger.warning(f"DashScope API 错误: {response.code} - {response.message}")
-                return None
+                # 返回结果带 text_index，按其排序保证与输入顺序一致
+                items = sorted(response.output['embeddings'], key=lambda item: item.get('text_index', 0))
+                embeddings.extend(item['embedding'] for item in items)
+
+            return embeddings
 
         except Exception as e:
             logger.warning(f"DashScope 调用失败: {e}")
             raise
 
-    def _call_openai(self, provider: EmbeddingProviderConfig, text: str) -> Optional[List[float]]:
+    def _call_openai_batch(self, provider: EmbeddingProviderConfig, texts: List[str]) -> Optional[List[List[float]]]:
         """调用 OpenAI embedding API"""
-        return self._call_openai_compatible(provider, text)
+        return self._call_openai_compatible_batch(provider, texts)
 
-    def _call_openai_compatible(self, provider: EmbeddingProviderConfig, text: str) -> Optional[List[float]]:
+    def _call_openai_compatible_batch(self, provider: EmbeddingProviderConfig, texts: List[str]) -> Optional[List[List[float]]]:
         """调用 OpenAI 兼容的 embedding API"""
         try:
-            from openai import OpenAI
-
-            client = OpenAI(
-                api_key=provider.api_key,
-                base_url=provider.base_url,
-                timeout=30.0
-            )
+            client = self._get_openai_client(provider)
 
             response = client.embeddings.create(
                 model=provider.model,
-                input=text
+                input=texts
             )
 
-            return response.data[0].embedding
+            # response.data 与 input 顺序一致，按 index 排序以防万一
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
 
         except Exception as e:
             logger.warning(f"OpenAI 兼容 API 调用失败: {e}")
             raise
 
-    def _call_google(self, provider: EmbeddingProviderConfig, text: str) -> Optional[List[float]]:
+    def _call_google_batch(self, provider: EmbeddingProviderConfig, texts: List[str]) -> Optional[List[List[float]]]:
         """调用 Google embedding API"""
         try:
             import google.generativeai as genai
 
-            genai.configure(api_key=provider.api_key)
+            if self._google_api_key != provider.api_key:
+                genai.configure(api_key=provider.api_key)
+                self._google_api_key = provider.api_key
 
             result = genai.embed_content(
                 model=f"models/{provider.model}",
-                content=text
+                content=texts
             )
 
             return result['embedding']
@@ -324,14 +511,34 @@ class EmbeddingProviderManager:
             logger.warning(f"Google API 调用失败: {e}")
             raise
 
-    def _call_siliconflow(self, provider: EmbeddingProviderConfig, text: str) -> Optional[List[float]]:
+    def _call_siliconflow_batch(self, provider: EmbeddingProviderConfig, texts: List[str]) -> Optional[List[List[float]]]:
         """调用硅基流动 embedding API (OpenAI 兼容)"""
-        return self._call_openai_compatible(provider, text)
+        return self._call_openai_compatible_batch(provider, texts)
 
 
 # 全局单例
 _embedding_manager: Optional[EmbeddingProviderManager] = None
 
+# 并发获取 embedding 使用的后台事件循环（供同步调用方通过 run_coroutine_threadsafe 提交）
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """获取（或启动）后台事件循环"""
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name="embedding-provider-loop",
+                    daemon=True
+                ).start()
+                _background_loop = loop
+    return _background_loop
+
 
 def get_embedding_manager() -> EmbeddingProviderManager:
     """获取 Embedding 管理器单例"""
@@ -357,3 +564,18 @@ def get_embedding_with_fallback(text: str, preferred_provider: Optional[str] = N
     manager = get_embedding_manager()
     return manager.get_embedding(text, preferred_provider)
 
+
+
+def get_embeddings_with_fallback(texts: List[str], preferred_provider: Optional[str] = None) -> Tuple[Optional[List[List[float]]], str]:
+    """
+    批量获取文本的 embedding（带自动降级）
+
+    Args:
+        texts: 要获取 embedding 的文本列表
+        preferred_provider: 首选的提供者名称
+
+    Returns:
+        (embedding_vectors, provider_name) 或 (None, error_message)
+    """
+    manager = get_embedding_manager()
+    return manager.get_embeddings(texts, preferred_provider)
@@ -31,6 +31,10 @@ class EmbeddingService(ABC):
         """获取文本的向量嵌入"""
         pass
     
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """批量获取文本的向量嵌入（默认逐条调用，支持批量接口的服务可覆盖）"""
+        return [self.get_embedding(text) for text in texts]
+    
     @abstractmethod
     def get_service_name(self) -> str:
         """获取服务名称"""
@@ -48,6 +52,8 @@ class OllamaEmbeddingService(EmbeddingService):
         self.base_url = base_url.rstrip('/')
         self.model = model
         self._available = None
+        # 复用 HTTP 连接（keep-alive），避免每次请求重新建立 TCP 连接
+        self._session = requests.Session()
     
     def is_available(self) -> bool:
         """检测 Ollama 是否运行且模型可用"""
@@ -56,16 +62,17 @@ class OllamaEmbeddingService(EmbeddingService):
         
         try:
             # 检查 Ollama 服务是否运行
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=2)
             if response.status_code != 200:
                 self._available = False
                 return False
             
             # 检查模型是否已下载
             models = response.json().get("models", [])
-            model_names = [m.get("name", "").split(":")[0] for m in models]
+            full_names = {m.get("name", "") for m in models}
+            model_names = {name.split(":")[0] for name in full_names}
             
-            if self.model not in model_names and f"{self.model}:latest" not in [m.get("name", "") for m in models]:
+            if self.model not in model_names and f"{self.model}:latest" not in full_names:
                 logger.warning(f"⚠️ Ollama 运行中但未找到 {self.model} 模型")
                 logger.info(f"💡 请运行: ollama pull {self.model}")
                 self._available = False
@@ -87,7 +94,7 @@ class OllamaEmbeddingService(EmbeddingService):
     def get_embedding(self, text: str) -> List[float]:
         """通过 Ollama API 获取嵌入向量"""
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/api/embeddings",
                 json={"model": self.model, "prompt": text},
                 timeout=30
@@ -139,6 +146,30 @@ class DashScopeEmbeddingService(EmbeddingService):
             logger.error(f"DashScope embedding 异常: {e}")
             return [0.0] * 1536
     
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """批量获取嵌入向量（按 DASHSCOPE_BATCH_SIZE 分批，一次请求多条文本）"""
+        from .embedding_provider import DASHSCOPE_BATCH_SIZE
+        
+        embeddings: List[List[float]] = []
+        try:
+            from dashscope import TextEmbedding
+            for start in range(0, len(texts), DASHSCOPE_BATCH_SIZE):
+                chunk = texts[start:start + DASHSCOPE_BATCH_SIZE]
+                response = TextEmbedding.call(
+                    model=self.model,
+                    input=chunk
+                )
+                if response.status_code == 200:
+                    items = sorted(response.output['embeddings'], key=lambda item: item.get('text_index', 0))
+                    embeddings.extend(item['embedding'] for item in items)
+                else:
+                    logger.error(f"DashScope embedding 失败: {response.message}")
+                    embeddings.extend([0.0] * 1536 for _ in chunk)
+        except Exception as e:
+            logger.error(f"DashScope embedding 异常: {e}")
+            embeddings.extend([0.0] * 1536 for _ in range(len(texts) - len(embeddings)))
+        return embeddings
+    
     def get_service_name(self) -> str:
         return f"DashScope ({self.model})"
 
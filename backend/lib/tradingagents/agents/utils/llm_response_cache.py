@@ -0,0 +1,226 @@
+# tradingagents/agents/utils/llm_response_cache.py
+"""
+LLM 响应缓存
+
+在 llm.invoke 前增加一层进程内缓存，避免相同输入（同一 ticker/日期的重复运行、
+图重放等）重复调用 LLM：
+
+1. 精确匹配：按 (模型名, 提供商/base_url, 温度, prompt) 的 blake2b 哈希查找，LRU 淘汰，
+   条目超过 TTL 后失效
+2. 语义匹配（可选）：对 prompt 取 embedding，与最近若干条记录做余弦相似度比较，
+   相似度 ≥ 阈值时复用响应。高温度（temperature > 0.5）配置下跳过语义匹配
+
+环境变量：
+- LLM_RESPONSE_CACHE_ENABLED: 是否启用缓存（默认 false，进程启动时读取一次）
+- LLM_RESPONSE_CACHE_SIZE: 精确匹配缓存条数（默认 256）
+- LLM_RESPONSE_CACHE_TTL: 缓存条目有效期，单位秒（默认 600）
+- LLM_SEMANTIC_CACHE_ENABLED: 是否启用语义匹配（默认 false，需要额外的 embedding 调用）
+- LLM_SEMANTIC_CACHE_THRESHOLD: 语义匹配相似度阈值（默认 0.97）
+"""
+
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, List, Optional, Tuple
+
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger("agents.utils.llm_cache")
+
+# 超过该温度的模型输出随机性较大，不做语义匹配
+SEMANTIC_MAX_TEMPERATURE = 0.5
+# 语义匹配比较的最近记录条数
+SEMANTIC_WINDOW = 32
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# 缓存默认关闭：同一 ticker/日期重新分析时通常需要新的 LLM 输出
+LLM_RESPONSE_CACHE_ENABLED = _env_flag("LLM_RESPONSE_CACHE_ENABLED", False)
+
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    if len(a) != len(b):
+        return 0.0
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(y * y for y in b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+class LLMResponseCache:
+    """线程安全的 LLM 响应缓存（精确匹配 + 可选语义匹配）"""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 600.0,
+        semantic_enabled: bool = False,
+        semantic_threshold: float = 0.97,
+        semantic_window: int = SEMANTIC_WINDOW
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.semantic_enabled = semantic_enabled
+        self.semantic_threshold = semantic_threshold
+        # key -> (过期时间, 响应)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # (模型标识, embedding, 响应, 过期时间)
+        self._recent_embeddings: Deque[Tuple[str, List[float], str, float]] = deque(maxlen=semantic_window)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        model_name: str,
+        prompt: str,
+        temperature: Optional[float] = None,
+        provider: str = ""
+    ) -> str:
+        """根据模型名、提供商、温度和 prompt 计算缓存键"""
+        h = hashlib.blake2b(digest_size=16)
+        for part in (model_name, provider, repr(temperature), prompt):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """精确匹配查找（过期条目视为未命中并移除）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, response: str, embedding: Optional[List[float]] = None, model_name: str = "") -> None:
+        """写入缓存"""
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if embedding:
+                self._recent_embeddings.append((model_name, embedding, response, expires_at))
+
+    def find_similar(self, embedding: List[float], model_name: str = "") -> Optional[str]:
+        """语义匹配查找：返回相似度最高且超过阈值的未过期响应"""
+        with self._lock:
+            candidates = list(self._recent_embeddings)
+        now = time.monotonic()
+        best_score = 0.0
+        best_response = None
+        for cached_model, cached_embedding, response, expires_at in candidates:
+            if cached_model != model_name or expires_at <= now:
+                continue
+            score = _cosine_similarity(embedding, cached_embedding)
+            if score > best_score:
+                best_score = score
+                best_response = response
+        if best_score >= self.semantic_threshold:
+            logger.debug(f"🎯 [LLM缓存] 语义匹配命中 (相似度: {best_score:.4f})")
+            return best_response
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._recent_embeddings.clear()
+
+
+# 全局单例
+_response_cache: Optional[LLMResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> LLMResponseCache:
+    """获取 LLM 响应缓存单例"""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = LLMResponseCache(
+                    max_entries=int(os.getenv("LLM_RESPONSE_CACHE_SIZE", "256")),
+                    ttl_seconds=float(os.getenv("LLM_RESPONSE_CACHE_TTL", "600")),
+                    semantic_enabled=_env_flag("LLM_SEMANTIC_CACHE_ENABLED", False),
+                    semantic_threshold=float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD", "0.97"))
+                )
+    return _response_cache
+
+
+def _get_model_name(llm: Any) -> str:
+    return str(getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__)
+
+
+def _get_provider(llm: Any) -> str:
+    """提供商标识：LLM 类名加 base_url，同名模型在不同服务商之间不共用缓存"""
+    base_url = (
+        getattr(llm, "openai_api_base", None)
+        or getattr(llm, "base_url", None)
+        or getattr(llm, "api_base", None)
+        or ""
+    )
+    return f"{type(llm).__name__}|{base_url}"
+
+
+def invoke_with_cache(llm: Any, prompt: str, no_cache: bool = False) -> str:
+    """
+    调用 llm.invoke(prompt) 并返回响应文本，命中缓存时直接返回
+
+    Args:
+        llm: LangChain 兼容的 LLM 对象
+        prompt: 完整提示词
+        no_cache: 为 True 时跳过缓存查找（结果仍会写入缓存）
+
+    Returns:
+        LLM 响应文本
+    """
+    if not LLM_RESPONSE_CACHE_ENABLED:
+        return llm.invoke(prompt).content
+
+    cache = get_response_cache()
+    model_name = _get_model_name(llm)
+    temperature = getattr(llm, "temperature", None)
+    provider = _get_provider(llm)
+    key = cache.make_key(model_name, prompt, temperature, provider)
+    # 语义匹配同样只在同一模型、提供商和温度的记录之间进行
+    model_identity = f"{model_name}|{provider}|{temperature!r}"
+
+    if not no_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"🎯 [LLM缓存] 精确匹配命中: model={model_name}")
+            return cached
+
+    embedding = None
+    use_semantic = cache.semantic_enabled and (temperature is None or temperature <= SEMANTIC_MAX_TEMPERATURE)
+    if use_semantic:
+        try:
+            from .embedding_provider import get_embedding_with_fallback
+            embedding, _ = get_embedding_with_fallback(prompt)
+        except Exception as e:
+            logger.debug(f"⚠️ [LLM缓存] 获取 embedding 失败，跳过语义匹配: {e}")
+            embedding = None
+        if embedding and not no_cache:
+            similar = cache.find_similar(embedding, model_identity)
+            if similar is not None:
+                logger.info(f"🎯 [LLM缓存] 语义匹配命中: model={model_name}")
+                cache.put(key, similar)
+                return similar
+
+    response_content = llm.invoke(prompt).content
+    cache.put(key, response_content, embedding, model_identity)
+    return response_content
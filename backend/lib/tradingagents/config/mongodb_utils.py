@@ -5,9 +5,84 @@ MongoDB 连接字符串工具函数
 """
 
 import os
-from typing import Optional
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+from urllib.parse import quote, unquote
 
 
+@lru_cache(maxsize=None)
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    读取环境变量（带缓存）
+
+    进程运行期间连接相关的环境变量不会变化，缓存后避免每次构建连接字符串时重复读取
+    """
+    return os.environ.get(name, default)
+
+
+def _quote_credential(value: str) -> str:
+    """
+    对连接字符串中的用户名/密码做百分号编码
+
+    密码中的 @ / : 等字符会破坏 URI 结构。先 unquote 再 quote，
+    已经手动编码过的值不会被重复编码。
+    """
+    return quote(unquote(value), safe='') if value else value
+
+
+@lru_cache(maxsize=1)
+def _mongo_defaults() -> Tuple[str, str, str, str, str, str]:
+    """
+    MongoDB 连接参数的环境变量默认值（首次使用时解析一次）
+
+    端口已转为字符串、用户名/密码已做百分号编码，可直接用于拼接连接字符串。
+
+    Returns:
+        (host, port, username, password, database, auth_source)
+    """
+    return (
+        _env('MONGODB_HOST', 'localhost'),
+        str(int(_env('MONGODB_PORT', '27017'))),
+        _quote_credential(_env('MONGODB_USERNAME', '')),
+        _quote_credential(_env('MONGODB_PASSWORD', '')),
+        _env('MONGODB_DATABASE', 'tradingagents'),
+        _env('MONGODB_AUTH_SOURCE', 'admin'),
+    )
+
+
+@lru_cache(maxsize=1)
+def _redis_defaults() -> Tuple[str, str, str, str]:
+    """
+    Redis 连接参数的环境变量默认值（首次使用时解析一次）
+
+    端口/库编号已转为字符串、密码已做百分号编码，可直接用于拼接连接字符串。
+
+    Returns:
+        (host, port, password, db)
+    """
+    return (
+        _env('REDIS_HOST', 'localhost'),
+        str(int(_env('REDIS_PORT', '6379'))),
+        _quote_credential(_env('REDIS_PASSWORD', '')),
+        str(int(_env('REDIS_DB', '0'))),
+    )
+
+
+def clear_connection_cache() -> None:
+    """清空环境变量缓存（环境变量在运行时被修改后调用，如测试或重新加载 .env）"""
+    global _CONFIG_CACHE
+    _env.cache_clear()
+    _mongo_defaults.cache_clear()
+    _redis_defaults.cache_clear()
+    build_mongodb_connection_string.cache_clear()
+    build_redis_connection_string.cache_clear()
+    with _CONFIG_LOCK:
+        _CONFIG_CACHE = None
+
+
+@lru_cache(maxsize=32)
 def build_mongodb_connection_string(
     host: Optional[str] = None,
     port: Optional[int] = None,
@@ -48,34 +123,32 @@ def build_mongodb_connection_string(
         ... )
     """
     # 优先使用 MONGODB_CONNECTION_STRING 环境变量
-    env_conn_str = os.getenv('MONGODB_CONNECTION_STRING')
+    env_conn_str = _env('MONGODB_CONNECTION_STRING')
     if env_conn_str:
         return env_conn_str
     
     # 从参数或环境变量获取配置
-    host = host or os.getenv('MONGODB_HOST', 'localhost')
-    port = port or int(os.getenv('MONGODB_PORT', '27017'))
-    username = username or os.getenv('MONGODB_USERNAME', '')
-    password = password or os.getenv('MONGODB_PASSWORD', '')
-    database = database or os.getenv('MONGODB_DATABASE', 'tradingagents')
-    auth_source = auth_source or os.getenv('MONGODB_AUTH_SOURCE', 'admin')
+    (
+        default_host, default_port, default_username,
+        default_password, default_database, default_auth_source,
+    ) = _mongo_defaults()
+    # 显式传入的参数在此编码/转换，环境变量默认值已预先处理
+    host = host or default_host
+    port = str(port) if port else default_port
+    username = _quote_credential(username) if username else default_username
+    password = _quote_credential(password) if password else default_password
+    database = database or default_database
+    auth_source = auth_source or default_auth_source
     
-    # 构建连接字符串
+    # 构建连接字符串（一次 join 完成拼接，避免多段 f-string 逐段分配）
     if username and password:
-        # 带认证的连接字符串
-        connection_string = f"mongodb://{username}:{password}@{host}:{port}/"
-        # 添加 authSource 参数
-        if database:
-            connection_string += f"{database}?authSource={auth_source}"
-        else:
-            connection_string += f"?authSource={auth_source}"
-    else:
-        # 不带认证的连接字符串
-        connection_string = f"mongodb://{host}:{port}/"
-        if database:
-            connection_string += database
-    
-    return connection_string
+        # 带认证的连接字符串，附加 authSource 参数（database 为空时为 "/?authSource=..."）
+        return ''.join((
+            'mongodb://', username, ':', password, '@', host, ':', port, '/',
+            database or '', '?authSource=', auth_source
+        ))
+    # 不带认证的连接字符串
+    return ''.join(('mongodb://', host, ':', port, '/', database or ''))
 
 
 def get_mongodb_database_name() -> str:
@@ -90,23 +163,36 @@ def get_mongodb_database_name() -> str:
     Returns:
         str: 数据库名称
     """
-    return os.getenv('MONGODB_DATABASE_NAME') or os.getenv('MONGODB_DATABASE', 'tradingagents')
+    return _env('MONGODB_DATABASE_NAME') or _env('MONGODB_DATABASE', 'tradingagents')
+
 
+# get_mongodb_config() 懒加载单例
+_CONFIG_CACHE: Optional[Mapping[str, str]] = None
+_CONFIG_LOCK = threading.Lock()
 
-def get_mongodb_config() -> dict:
+
+def get_mongodb_config() -> Mapping[str, str]:
     """
     获取完整的 MongoDB 配置
 
+    首次调用时构建，之后直接返回同一个只读映射（调用方不可修改）
+
     Returns:
-        dict: 包含 connection_string 和 database_name 的字典
+        Mapping: 包含 connection_string 和 database_name 的只读字典
     """
-    return {
-        'connection_string': build_mongodb_connection_string(),
-        'database_name': get_mongodb_database_name(),
-        'auth_source': os.getenv('MONGODB_AUTH_SOURCE', 'admin')
-    }
-
-
+    global _CONFIG_CACHE
+    if _CONFIG_CACHE is None:
+        with _CONFIG_LOCK:
+            if _CONFIG_CACHE is None:
+                _CONFIG_CACHE = MappingProxyType({
+                    'connection_string': build_mongodb_connection_string(),
+                    'database_name': get_mongodb_database_name(),
+                    'auth_source': _env('MONGODB_AUTH_SOURCE', 'admin')
+                })
+    return _CONFIG_CACHE
+
+
+@lru_cache(maxsize=32)
 def build_redis_connection_string(
     host: Optional[str] = None,
     port: Optional[int] = None,
@@ -143,23 +229,22 @@ def build_redis_connection_string(
         ... )
     """
     # 优先使用 REDIS_URL 环境变量
-    env_conn_str = os.getenv('REDIS_URL')
+    env_conn_str = _env('REDIS_URL')
     if env_conn_str:
         return env_conn_str
 
     # 从参数或环境变量获取配置
-    host = host or os.getenv('REDIS_HOST', 'localhost')
-    port = port or int(os.getenv('REDIS_PORT', '6379'))
-    password = password or os.getenv('REDIS_PASSWORD', '')
-    db = db if db is not None else int(os.getenv('REDIS_DB', '0'))
+    default_host, default_port, default_password, default_db = _redis_defaults()
+    # 显式传入的参数在此编码/转换，环境变量默认值已预先处理
+    host = host or default_host
+    port = str(port) if port else default_port
+    password = _quote_credential(password) if password else default_password
+    db = str(db) if db is not None else default_db
 
     # 构建连接字符串
     if password:
         # 带密码的连接字符串
-        connection_string = f"redis://:{password}@{host}:{port}/{db}"
-    else:
-        # 不带密码的连接字符串
-        connection_string = f"redis://{host}:{port}/{db}"
-
-    return connection_string
+        return ''.join(('redis://:', password, '@', host, ':', port, '/', db))
+    # 不带密码的连接字符串
+    return ''.join(('redis://', host, ':', port, '/', db))
 
@@ -6,8 +6,14 @@
 - 分析师契约 (analysts)
 - 研究员契约 (researchers)
 - 交易员和风控契约 (traders, risk_managers)
+- 按依赖关系分组的执行阶段 (EXECUTION_PHASES)
 """
 
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
+
+from tradingagents.core.engine.data_contract import AgentDataContract
+
 from tradingagents.core.contracts.analysts import (
     MARKET_ANALYST_CONTRACT,
     NEWS_ANALYST_CONTRACT,
@@ -32,12 +38,60 @@ from tradingagents.core.contracts.traders import (
     TRADER_CONTRACTS,
 )
 
-# 所有契约汇总
-ALL_CONTRACTS = {
+# 所有契约汇总（只读）
+ALL_CONTRACTS: Mapping[str, AgentDataContract] = MappingProxyType({
     **ANALYST_CONTRACTS,
     **RESEARCHER_CONTRACTS,
     **TRADER_CONTRACTS,
-}
+})
+
+# 按 agent_id 排序的 (agent_id, 契约) 元组，供需要遍历全部契约的调用方直接线性扫描
+CONTRACT_ITEMS: Tuple[Tuple[str, AgentDataContract], ...] = tuple(sorted(ALL_CONTRACTS.items()))
+
+
+def _build_execution_phases(contracts: Mapping[str, AgentDataContract]) -> Tuple[Tuple[str, ...], ...]:
+    """
+    按 depends_on 对契约做拓扑排序（Kahn 算法），按依赖深度分组
+
+    同一组内的 Agent 互不依赖，可并行执行。契约是静态的，结果在导入时计算一次。
+    不在 contracts 中的依赖视为外部输入，不参与排序。
+
+    Raises:
+        ValueError: 契约之间存在循环依赖
+    """
+    in_degree: Dict[str, int] = {agent_id: 0 for agent_id in contracts}
+    dependents: Dict[str, list] = {agent_id: [] for agent_id in contracts}
+    for agent_id, contract in contracts.items():
+        for dep_id in contract.depends_on:
+            if dep_id in contracts:
+                in_degree[agent_id] += 1
+                dependents[dep_id].append(agent_id)
+
+    phases = []
+    # 组内按契约定义顺序排列，保证结果稳定
+    order = {agent_id: i for i, agent_id in enumerate(contracts)}
+    current = [agent_id for agent_id, degree in in_degree.items() if degree == 0]
+    visited = 0
+    while current:
+        phases.append(tuple(current))
+        visited += len(current)
+        next_phase = []
+        for agent_id in current:
+            for dependent in dependents[agent_id]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    next_phase.append(dependent)
+        current = sorted(next_phase, key=order.__getitem__)
+
+    if visited != len(contracts):
+        cyclic = sorted(agent_id for agent_id, degree in in_degree.items() if degree > 0)
+        raise ValueError(f"契约存在循环依赖: {cyclic}")
+
+    return tuple(phases)
+
+
+# 按依赖深度分组的执行阶段（导入时计算一次）
+EXECUTION_PHASES = _build_execution_phases(ALL_CONTRACTS)
 
 __all__ = [
     # 分析师契约
@@ -62,5 +116,7 @@ __all__ = [
     "TRADER_CONTRACTS",
     # 汇总
     "ALL_CONTRACTS",
+    "CONTRACT_ITEMS",
+    "EXECUTION_PHASES",
 ]
 
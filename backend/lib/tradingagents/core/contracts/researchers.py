@@ -6,139 +6,120 @@
 研究员需要读取所有分析师报告进行综合研判
 """
 
+import sys
+from types import MappingProxyType
+
 from tradingagents.core.engine.data_contract import (
+    CONTEXT_FIELDS as _CONTEXT_FIELDS,
     AgentDataContract,
     DataAccess,
     DataLayer,
 )
 
-
-# =========================================
-# 看多研究员 (Bull Researcher)
-# =========================================
-BULL_RESEARCHER_CONTRACT = AgentDataContract(
-    agent_id="bull_researcher",
-    description="看多研究员 - 从乐观角度综合分析报告，寻找买入理由",
-    inputs=[
-        DataAccess(
-            layer=DataLayer.CONTEXT,
-            fields=["ticker", "company_name", "trade_date"],
-            required=True
-        ),
-        # 读取所有分析师报告
-        DataAccess(
-            layer=DataLayer.REPORTS,
-            fields=[
-                "market_report",
-                "news_report",
-                "sentiment_report",
-                "fundamentals_report",
-                "sector_report",
-                "index_report",
-            ],
-            required=False  # 部分报告可能不存在
-        ),
-        # 读取结构化分析数据
-        DataAccess(
-            layer=DataLayer.ANALYSIS_DATA,
-            fields=["technical", "valuation", "sentiment"],
-            required=False
-        ),
-    ],
-    outputs=[
-        DataAccess(
-            layer=DataLayer.REPORTS,
-            fields=["bull_report"]
-        ),
-    ],
-    depends_on={
-        "market_analyst",
-        "news_analyst",
-        "sentiment_analyst",
-        "fundamentals_analyst",
-    }
+# 多空研究员读取的全部分析师报告
+_ALL_ANALYST_REPORTS = (
+    sys.intern("market_report"),
+    sys.intern("news_report"),
+    sys.intern("sentiment_report"),
+    sys.intern("fundamentals_report"),
+    sys.intern("sector_report"),
+    sys.intern("index_report"),
 )
 
+# 多空研究员读取的结构化分析数据
+_ANALYSIS_FIELDS = (sys.intern("technical"), sys.intern("valuation"), sys.intern("sentiment"))
+
+# 多空研究员依赖的分析师
+_ANALYST_DEPENDENCIES = frozenset({
+    "market_analyst",
+    "news_analyst",
+    "sentiment_analyst",
+    "fundamentals_analyst",
+})
+
 
 # =========================================
-# 看空研究员 (Bear Researcher)
+# 研究员契约规格表
+# 每项: (agent_id, description, inputs, outputs, depends_on)
 # =========================================
-BEAR_RESEARCHER_CONTRACT = AgentDataContract(
-    agent_id="bear_researcher",
-    description="看空研究员 - 从谨慎角度综合分析报告，识别风险因素",
-    inputs=[
-        DataAccess(
-            layer=DataLayer.CONTEXT,
-            fields=["ticker", "company_name", "trade_date"],
-            required=True
+_SPEC = (
+    # 看多研究员 (Bull Researcher)
+    (
+        "bull_researcher",
+        "看多研究员 - 从乐观角度综合分析报告，寻找买入理由",
+        (
+            DataAccess(layer=DataLayer.CONTEXT, fields=_CONTEXT_FIELDS, required=True),
+            # 读取所有分析师报告
+            DataAccess(
+                layer=DataLayer.REPORTS,
+                fields=_ALL_ANALYST_REPORTS,
+                required=False  # 部分报告可能不存在
+            ),
+            # 读取结构化分析数据
+            DataAccess(
+                layer=DataLayer.ANALYSIS_DATA,
+                fields=_ANALYSIS_FIELDS,
+                required=False
+            ),
         ),
-        DataAccess(
-            layer=DataLayer.REPORTS,
-            fields=[
-                "market_report",
-                "news_report",
-                "sentiment_report",
-                "fundamentals_report",
-                "sector_report",
-                "index_report",
-            ],
-            required=False
+        (
+            DataAccess(layer=DataLayer.REPORTS, fields=["bull_report"]),
         ),
-        DataAccess(
-            layer=DataLayer.ANALYSIS_DATA,
-            fields=["technical", "valuation", "sentiment"],
-            required=False
+        _ANALYST_DEPENDENCIES,
+    ),
+    # 看空研究员 (Bear Researcher)
+    (
+        "bear_researcher",
+        "看空研究员 - 从谨慎角度综合分析报告，识别风险因素",
+        (
+            DataAccess(layer=DataLayer.CONTEXT, fields=_CONTEXT_FIELDS, required=True),
+            DataAccess(
+                layer=DataLayer.REPORTS,
+                fields=_ALL_ANALYST_REPORTS,
+                required=False
+            ),
+            DataAccess(
+                layer=DataLayer.ANALYSIS_DATA,
+                fields=_ANALYSIS_FIELDS,
+                required=False
+            ),
         ),
-    ],
-    outputs=[
-        DataAccess(
-            layer=DataLayer.REPORTS,
-            fields=["bear_report"]
-        ),
-    ],
-    depends_on={
-        "market_analyst",
-        "news_analyst",
-        "sentiment_analyst",
-        "fundamentals_analyst",
-    }
-)
-
-
-# =========================================
-# 研究经理 (Research Manager)
-# =========================================
-RESEARCH_MANAGER_CONTRACT = AgentDataContract(
-    agent_id="research_manager",
-    description="研究经理 - 主持多空辩论，综合研判，形成投资建议",
-    inputs=[
-        DataAccess(
-            layer=DataLayer.CONTEXT,
-            fields=["ticker", "company_name", "trade_date"],
-            required=True
+        (
+            DataAccess(layer=DataLayer.REPORTS, fields=["bear_report"]),
         ),
-        DataAccess(
-            layer=DataLayer.REPORTS,
-            fields=["bull_report", "bear_report"],
-            required=True
+        _ANALYST_DEPENDENCIES,
+    ),
+    # 研究经理 (Research Manager)
+    (
+        "research_manager",
+        "研究经理 - 主持多空辩论，综合研判，形成投资建议",
+        (
+            DataAccess(layer=DataLayer.CONTEXT, fields=_CONTEXT_FIELDS, required=True),
+            DataAccess(layer=DataLayer.REPORTS, fields=["bull_report", "bear_report"], required=True),
         ),
-    ],
-    outputs=[
-        DataAccess(
-            layer=DataLayer.DECISIONS,
-            fields=["investment_debate", "investment_plan"]
+        (
+            DataAccess(layer=DataLayer.DECISIONS, fields=["investment_debate", "investment_plan"]),
         ),
-    ],
-    depends_on={"bull_researcher", "bear_researcher"}
+        frozenset({"bull_researcher", "bear_researcher"}),
+    ),
 )
 
 
 # =========================================
-# 研究员契约汇总
+# 研究员契约汇总（只读）
 # =========================================
-RESEARCHER_CONTRACTS = {
-    "bull_researcher": BULL_RESEARCHER_CONTRACT,
-    "bear_researcher": BEAR_RESEARCHER_CONTRACT,
-    "research_manager": RESEARCH_MANAGER_CONTRACT,
-}
+RESEARCHER_CONTRACTS = MappingProxyType({
+    agent_id: AgentDataContract(
+        agent_id=agent_id,
+        description=description,
+        inputs=inputs,
+        outputs=outputs,
+        depends_on=depends_on,
+    )
+    for agent_id, description, inputs, outputs, depends_on in _SPEC
+})
 
+# 兼容按名称导入单个契约
+BULL_RESEARCHER_CONTRACT = RESEARCHER_CONTRACTS["bull_researcher"]
+BEAR_RESEARCHER_CONTRACT = RESEARCHER_CONTRACTS["bear_researcher"]
+RESEARCH_MANAGER_CONTRACT = RESEARCHER_CONTRACTS["research_manager"]
@@ -10,7 +10,12 @@ Agent 集成器
 所有 Agent 配置统一从 core/agents/config.py 的 BUILTIN_AGENTS 读取
 """
 
-from typing import Any, Dict, Optional, Callable, Tuple
+import importlib
+import logging
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Callable, Protocol, Sequence, Set, Tuple
 
 from tradingagents.utils.logging_init import get_logger
 
@@ -23,14 +28,17 @@ logger = get_logger("default")
 # ========================================
 # Agent 工厂函数映射 (从模块名到工厂函数名)
 # 这是唯一需要维护的映射，配置信息从 BUILTIN_AGENTS 读取
+# 仅保存字符串元数据，模块在 _create_agent 首次用到该 Agent 时才导入，
+# 因此只运行分析师时不会加载研究员/交易员/风控模块
+# 只读映射，防止运行时被意外修改
 # ========================================
-AGENT_FACTORY_REGISTRY = {
+AGENT_FACTORY_REGISTRY: Mapping[str, Tuple[str, str, str]] = MappingProxyType({
     # 分析师 - 需要 (llm, toolkit)
-    "market_analyst": ("tradingagents.agents", "create_market_analyst", "analyst"),
-    "news_analyst": ("tradingagents.agents", "create_news_analyst", "analyst"),
-    "sentiment_analyst": ("tradingagents.agents", "create_social_media_analyst", "analyst"),
-    "social_analyst": ("tradingagents.agents", "create_social_media_analyst", "analyst"),  # 别名
-    "fundamentals_analyst": ("tradingagents.agents", "create_fundamentals_analyst", "analyst"),
+    "market_analyst": ("tradingagents.agents.analysts.market_analyst", "create_market_analyst", "analyst"),
+    "news_analyst": ("tradingagents.agents.analysts.news_analyst", "create_news_analyst", "analyst"),
+    "sentiment_analyst": ("tradingagents.agents.analysts.social_media_analyst", "create_social_media_analyst", "analyst"),
+    "social_analyst": ("tradingagents.agents.analysts.social_media_analyst", "create_social_media_analyst", "analyst"),  # 别名
+    "fundamentals_analyst": ("tradingagents.agents.analysts.fundamentals_analyst", "create_fundamentals_analyst", "analyst"),
     # 研究员 - 需要 (llm, memory)
     "bull_researcher": ("tradingagents.agents.researchers.bull_researcher", "create_bull_researcher", "researcher"),
     "bear_researcher": ("tradingagents.agents.researchers.bear_researcher", "create_bear_researcher", "researcher"),
@@ -42,9 +50,126 @@ AGENT_FACTORY_REGISTRY = {
     "safe_analyst": ("tradingagents.agents.risk_mgmt.conservative_debator", "create_safe_debator", "risk"),
     "neutral_analyst": ("tradingagents.agents.risk_mgmt.neutral_debator", "create_neutral_debator", "risk"),
     "risk_manager": ("tradingagents.agents.managers.risk_manager", "create_risk_manager", "manager"),
+})
+
+# 工厂函数缓存: (module_path, factory_name) -> 工厂函数，进程内所有 AgentIntegrator 共享
+_FACTORY_CACHE: Dict[Tuple[str, str], Callable] = {}
+
+
+def _cached_import(module_path: str, factory_name: str) -> Optional[Callable]:
+    """
+    获取工厂函数（带缓存）
+
+    已加载的模块直接从 sys.modules 读取，避免 importlib.import_module 的查找开销；
+    未找到的工厂函数不缓存，以便模块修复后可重新获取。
+    """
+    key = (module_path, factory_name)
+    factory = _FACTORY_CACHE.get(key)
+    if factory is None:
+        module = sys.modules.get(module_path)
+        if module is None:
+            module = importlib.import_module(module_path)
+        factory = getattr(module, factory_name, None)
+        if factory is not None:
+            _FACTORY_CACHE[key] = factory
+    return factory
+
+
+class AgentMetadataLike(Protocol):
+    """BUILTIN_AGENTS 中 Agent 元数据的结构约定（仅用于类型标注）"""
+    output_field: Optional[str]
+    outputs: Optional[Sequence[Any]]
+
+
+# toolkit 上提供工具集的方法名，查找工具时按此顺序遍历
+_TOOL_SET_GETTERS = (
+    "get_general_tools",
+    "get_market_analysis_tools",
+    "get_social_media_tools",
+    "get_fundamental_tools",
+    "get_us_tools",
+    "get_china_tools",
+)
+
+
+# v2.0 agent输出字段到标准报告字段的映射
+_V2_FIELD_MAPPING = {
+    # research_manager_v2: investment_advice -> investment_plan
+    'investment_advice': 'investment_plan',
+    # trader_v2: trade_plan -> trader_investment_plan
+    'trade_plan': 'trader_investment_plan',
+    # risk_manager_v2: risk_assessment -> risk_management_decision
+    'risk_assessment': 'risk_management_decision',
+    # 其他v2字段映射
+    'bull_report': 'bull_researcher',
+    'bear_report': 'bear_researcher',
+    'risky_opinion': 'risky_analyst',
+    'safe_opinion': 'safe_analyst',
+    'neutral_opinion': 'neutral_analyst',
 }
 
 
+# context_to_state 的基础状态模板（固定结构，每次调用复制后填入可变字段）
+_BASE_STATE_TEMPLATE: Mapping[str, Any] = MappingProxyType({
+    "company_of_interest": "",
+    "trade_date": "",
+    "messages": (),
+    # 初始化工具调用计数器
+    "market_tool_call_count": 0,
+    "news_tool_call_count": 0,
+    "sentiment_tool_call_count": 0,
+    "fundamentals_tool_call_count": 0,
+})
+
+
+@lru_cache(maxsize=None)
+def _tool_call_counter_key(agent_id: str) -> str:
+    """Agent 对应的工具调用计数器字段名，如 market_analyst -> market_tool_call_count"""
+    return f"{agent_id.replace('_analyst', '')}_tool_call_count"
+
+
+@lru_cache(maxsize=1)
+def _builtin_agents() -> Optional[Dict[str, Any]]:
+    """获取 BUILTIN_AGENTS 配置（只导入一次），不可用时返回 None"""
+    try:
+        from core.agents.config import BUILTIN_AGENTS
+        return BUILTIN_AGENTS
+    except ImportError:
+        logger.warning(f"⚠️ [AgentIntegrator] 无法导入 BUILTIN_AGENTS 配置")
+        return None
+
+
+@lru_cache(maxsize=1)
+def _builtin_output_fields() -> Tuple[str, ...]:
+    """BUILTIN_AGENTS 中声明的所有 output_field（去重，保持配置顺序）"""
+    builtin_agents = _builtin_agents()
+    if not builtin_agents:
+        return ()
+    return tuple(dict.fromkeys(
+        metadata.output_field
+        for metadata in builtin_agents.values()
+        if getattr(metadata, 'output_field', None)
+    ))
+
+
+# langchain_core.messages.ToolMessage 类，首次执行工具调用时导入
+_TOOL_MESSAGE_CLS = None
+
+
+def _get_tool_message_cls():
+    """
+    获取 ToolMessage 类（延迟导入并缓存）
+
+    避免在模块导入时加载 langchain_core，也避免每次工具调用重复执行 import 语句。
+    导入本身是线程安全的，并发首次调用只会重复赋值同一个类，无需加锁。
+    """
+    global _TOOL_MESSAGE_CLS
+    if _TOOL_MESSAGE_CLS is None:
+        from langchain_core.messages import ToolMessage
+        _TOOL_MESSAGE_CLS = ToolMessage
+    return _TOOL_MESSAGE_CLS
+
+
 class AgentIntegrator:
     """
     Agent 集成器
@@ -72,9 +197,19 @@ class AgentIntegrator:
         self.toolkit = toolkit
         self.memory_config = memory_config or {}
         self._agent_cache: Dict[str, Callable] = {}
-        self._metadata_cache: Dict[str, Any] = {}
-
-    def _get_agent_metadata(self, agent_id: str) -> Optional[Any]:
+        self._metadata_cache: Dict[str, AgentMetadataLike] = {}
+        # 不在 BUILTIN_AGENTS 中的 Agent ID（如扩展 Agent），避免重复查找
+        self._metadata_miss: Set[str] = set()
+        # 工具集获取方法（绑定一次，toolkit 未提供的方法跳过）
+        self._tool_set_getters: Tuple[Callable, ...] = tuple(
+            getattr(toolkit, name) for name in _TOOL_SET_GETTERS if hasattr(toolkit, name)
+        )
+        # 工具名 -> 工具对象索引，首次查找工具时构建
+        self._tool_index: Optional[Dict[str, Any]] = None
+        # 已确认不存在的工具名（LLM 常在多轮中重复请求同一个不存在的工具）
+        self._tool_miss_cache: Set[str] = set()
+
+    def _get_agent_metadata(self, agent_id: str) -> Optional[AgentMetadataLike]:
         """
         从 BUILTIN_AGENTS 配置获取 Agent 元数据
 
@@ -86,17 +221,17 @@ class AgentIntegrator:
         """
         if agent_id in self._metadata_cache:
             return self._metadata_cache[agent_id]
-
-        try:
-            from core.agents.config import BUILTIN_AGENTS
-            metadata = BUILTIN_AGENTS.get(agent_id)
-            if metadata:
-                self._metadata_cache[agent_id] = metadata
-            return metadata
-        except ImportError:
-            logger.warning(f"⚠️ [AgentIntegrator] 无法导入 BUILTIN_AGENTS 配置")
+        if agent_id in self._metadata_miss:
             return None
 
+        builtin_agents = _builtin_agents()
+        metadata = builtin_agents.get(agent_id) if builtin_agents else None
+        if metadata:
+            self._metadata_cache[agent_id] = metadata
+        else:
+            self._metadata_miss.add(agent_id)
+        return metadata
+
     def get_output_field(self, agent_id: str) -> Optional[str]:
         """
         获取 Agent 的输出字段名
@@ -108,12 +243,15 @@ class AgentIntegrator:
             输出字段名，如 "market_report"
         """
         metadata = self._get_agent_metadata(agent_id)
-        if metadata and hasattr(metadata, 'output_field') and metadata.output_field:
-            return metadata.output_field
+        if not metadata:
+            return None
+        # 单次 getattr 代替 hasattr + 属性访问
+        output_field = getattr(metadata, 'output_field', None)
+        if output_field:
+            return output_field
         # 回退：从 outputs 列表获取
-        if metadata and hasattr(metadata, 'outputs') and metadata.outputs:
-            return metadata.outputs[0].name
-        return None
+        outputs = getattr(metadata, 'outputs', None)
+        return outputs[0].name if outputs else None
         
     def get_agent(self, agent_id: str) -> Optional[Callable]:
         """
@@ -148,10 +286,8 @@ class AgentIntegrator:
         module_path, factory_name, agent_type = factory_info
 
         try:
-            # 动态导入模块
-            import importlib
-            module = importlib.import_module(module_path)
-            factory = getattr(module, factory_name, None)
+            # 动态导入模块（带缓存）
+            factory = _cached_import(module_path, factory_name)
 
             if factory:
                 # 根据 Agent 类型传递不同的参数
@@ -206,31 +342,22 @@ class AgentIntegrator:
         Returns:
             AgentState 兼容的字典
         """
-        ticker = context.get(DataLayer.CONTEXT, "ticker") or ""
-        trade_date = context.get(DataLayer.CONTEXT, "trade_date") or ""
-
-        # 构建基础状态
-        state = {
-            "company_of_interest": ticker,
-            "trade_date": trade_date,
-            "messages": [],
-            # 初始化工具调用计数器
-            "market_tool_call_count": 0,
-            "news_tool_call_count": 0,
-            "sentiment_tool_call_count": 0,
-            "fundamentals_tool_call_count": 0,
-        }
-
-        # 从配置动态获取所有可能的报告字段
-        try:
-            from core.agents.config import BUILTIN_AGENTS
-            for agent_id, metadata in BUILTIN_AGENTS.items():
-                if hasattr(metadata, 'output_field') and metadata.output_field:
-                    existing_report = context.get(DataLayer.REPORTS, metadata.output_field)
-                    if existing_report:
-                        state[metadata.output_field] = existing_report
-        except ImportError:
-            pass
+        context_layer = context.view_layer(DataLayer.CONTEXT)
+        ticker = context_layer.get("ticker") or ""
+        trade_date = context_layer.get("trade_date") or ""
+
+        # 构建基础状态（从模板复制，messages 每次使用新列表）
+        state = dict(_BASE_STATE_TEMPLATE)
+        state["company_of_interest"] = ticker
+        state["trade_date"] = trade_date
+        state["messages"] = []
+
+        # 从配置获取所有可能的报告字段（字段列表只计算一次）
+        reports = context.view_layer(DataLayer.REPORTS)
+        for output_field in _builtin_output_fields():
+            existing_report = reports.get(output_field)
+            if existing_report:
+                state[output_field] = existing_report
 
         return state
     
@@ -258,10 +385,12 @@ class AgentIntegrator:
         Returns:
             最终的 Agent 执行结果
         """
-        from langchain_core.messages import ToolMessage
-
-        current_state = state.copy()
+        current_state = dict(state)
+        # 复制一次消息列表，之后每轮原地追加，避免每轮重新拼接整个历史（也不修改调用方的列表）
+        history = list(state.get("messages", []))
+        current_state["messages"] = history
         report_field = self.get_output_field(agent_id)
+        counter_key = _tool_call_counter_key(agent_id)
 
         for iteration in range(max_iterations):
             # 执行 Agent
@@ -289,10 +418,10 @@ class AgentIntegrator:
             tool_results = self._execute_tool_calls(last_message.tool_calls)
 
             # 更新状态：添加 AI 消息和工具结果到历史
-            current_state["messages"] = current_state.get("messages", []) + [last_message] + tool_results
+            history.append(last_message)
+            history.extend(tool_results)
 
             # 更新工具调用计数器
-            counter_key = f"{agent_id.replace('_analyst', '')}_tool_call_count"
             current_state[counter_key] = current_state.get(counter_key, 0) + 1
 
         logger.warning(f"⚠️ [AgentIntegrator] {agent_id} 达到最大迭代次数 {max_iterations}")
@@ -300,7 +429,7 @@ class AgentIntegrator:
 
     def _execute_tool_calls(self, tool_calls: list) -> list:
         """执行工具调用并返回 ToolMessage 列表"""
-        from langchain_core.messages import ToolMessage
+        ToolMessage = _get_tool_message_cls()
 
         tool_messages = []
         for tc in tool_calls:
@@ -308,20 +437,33 @@ class AgentIntegrator:
             tool_args = tc.get('args', {})
             tool_id = tc.get('id', '')
 
+            # 快速路径：已知不存在的工具直接返回错误消息
+            if tool_name in self._tool_miss_cache:
+                logger.debug(f"⚠️ [AgentIntegrator] 工具 {tool_name} 不存在（重复请求）")
+                tool_messages.append(ToolMessage(
+                    content=f"工具 {tool_name} 不存在",
+                    tool_call_id=tool_id,
+                    name=tool_name
+                ))
+                continue
+
             logger.info(f"🔧 [AgentIntegrator] 执行工具: {tool_name}")
-            logger.debug(f"  参数: {tool_args}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"  参数: {tool_args}")
 
             try:
                 # 从 toolkit 获取工具函数
                 tool_func = self._get_tool_function(tool_name)
                 if tool_func:
                     result = tool_func.invoke(tool_args)
+                    # 工具结果可能很大，只转换一次字符串
+                    content = str(result)
                     tool_messages.append(ToolMessage(
-                        content=str(result),
+                        content=content,
                         tool_call_id=tool_id,
                         name=tool_name
                     ))
-                    logger.info(f"✅ [AgentIntegrator] 工具 {tool_name} 执行成功，结果长度: {len(str(result))}")
+                    logger.info(f"✅ [AgentIntegrator] 工具 {tool_name} 执行成功，结果长度: {len(content)}")
                 else:
                     error_msg = f"工具 {tool_name} 不存在"
                     logger.warning(f"⚠️ [AgentIntegrator] {error_msg}")
@@ -341,27 +483,51 @@ class AgentIntegrator:
 
         return tool_messages
 
-    def _get_tool_function(self, tool_name: str):
-        """从 toolkit 获取工具函数"""
-        # 尝试从不同的工具集获取
-        tool_sets = [
-            self.toolkit.get_general_tools,
-            self.toolkit.get_market_analysis_tools,
-            self.toolkit.get_social_media_tools,
-            self.toolkit.get_fundamental_tools,
-            self.toolkit.get_us_tools,
-            self.toolkit.get_china_tools,
-        ]
-
-        for get_tools in tool_sets:
+    def _build_tool_index(self) -> Tuple[Dict[str, Any], bool]:
+        """
+        遍历 toolkit 的各个工具集，构建 工具名 -> 工具对象 索引
+
+        Returns:
+            (索引, 是否所有工具集都获取成功)
+        """
+        index: Dict[str, Any] = {}
+        complete = True
+        for get_tools in self._tool_set_getters:
             try:
                 tools = get_tools()
                 for tool in tools:
-                    if hasattr(tool, 'name') and tool.name == tool_name:
-                        return tool
-            except Exception:
-                continue
-        return None
+                    # 同名工具以先出现的工具集为准
+                    if hasattr(tool, 'name'):
+                        index.setdefault(tool.name, tool)
+            except Exception as e:
+                complete = False
+                logger.warning(
+                    f"⚠️ [AgentIntegrator] 获取工具集 {getattr(get_tools, '__name__', get_tools)} 失败: {e}"
+                )
+        logger.debug(f"🔧 [AgentIntegrator] 工具索引已构建: {len(index)} 个工具")
+        return index, complete
+
+    def invalidate_tool_index(self) -> None:
+        """清空工具索引（toolkit 的工具集发生变化后调用）"""
+        self._tool_index = None
+        self._tool_miss_cache.clear()
+
+    def _get_tool_function(self, tool_name: str):
+        """
+        从 toolkit 获取工具函数，不存在时记入未命中缓存
+
+        有工具集获取失败时索引不完整：本次结果不缓存索引也不记录未命中，
+        下次查找时重新获取全部工具集
+        """
+        index = self._tool_index
+        if index is None:
+            index, complete = self._build_tool_index()
+            if complete:
+                self._tool_index = index
+        tool = index.get(tool_name)
+        if tool is None and self._tool_index is not None:
+            self._tool_miss_cache.add(tool_name)
+        return tool
 
     def extract_report(
         self,
@@ -380,25 +546,9 @@ class AgentIntegrator:
         """
         report_field = self.get_output_field(agent_id)
         
-        # v2.0 agent输出字段到标准报告字段的映射
-        v2_field_mapping = {
-            # research_manager_v2: investment_advice -> investment_plan
-            'investment_advice': 'investment_plan',
-            # trader_v2: trade_plan -> trader_investment_plan  
-            'trade_plan': 'trader_investment_plan',
-            # risk_manager_v2: risk_assessment -> risk_management_decision
-            'risk_assessment': 'risk_management_decision',
-            # 其他v2字段映射
-            'bull_report': 'bull_researcher',
-            'bear_report': 'bear_researcher',
-            'risky_opinion': 'risky_analyst',
-            'safe_opinion': 'safe_analyst',
-            'neutral_opinion': 'neutral_analyst',
-        }
-        
         if report_field and report_field in result:
             # 如果是v2字段，映射到标准字段
-            mapped_field = v2_field_mapping.get(report_field, report_field)
+            mapped_field = _V2_FIELD_MAPPING.get(report_field, report_field)
             return mapped_field, result[report_field]
         
         return report_field, None
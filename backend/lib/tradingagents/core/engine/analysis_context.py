@@ -9,12 +9,23 @@
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, Mapping, Optional
 from datetime import datetime
 from tradingagents.core.engine.data_contract import DataLayer
 
 
-@dataclass
+# 数据层 -> AnalysisContext 属性名（导入时构建一次）
+_LAYER_ATTRS = {
+    DataLayer.CONTEXT: "context",
+    DataLayer.RAW_DATA: "raw_data",
+    DataLayer.ANALYSIS_DATA: "analysis_data",
+    DataLayer.REPORTS: "reports",
+    DataLayer.DECISIONS: "decisions",
+}
+
+
+@dataclass(slots=True)
 class AnalysisContext:
     """
     股票分析上下文 - 分层数据容器
@@ -48,17 +59,15 @@ class AnalysisContext:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     data_lineage: Dict[str, str] = field(default_factory=dict)
+    # 按层分区的血缘（层 -> 字段名 -> 来源 Agent），按层查询时只扫描该层
+    _lineage_by_layer: Dict[DataLayer, Dict[str, str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
     
     def _get_layer_data(self, layer: DataLayer) -> Dict[str, Any]:
         """获取指定层的数据字典"""
-        layer_map = {
-            DataLayer.CONTEXT: self.context,
-            DataLayer.RAW_DATA: self.raw_data,
-            DataLayer.ANALYSIS_DATA: self.analysis_data,
-            DataLayer.REPORTS: self.reports,
-            DataLayer.DECISIONS: self.decisions,
-        }
-        return layer_map.get(layer, {})
+        attr = _LAYER_ATTRS.get(layer)
+        return getattr(self, attr) if attr else {}
     
     def get(self, layer: DataLayer, field_name: str, default=None) -> Any:
         """
@@ -75,6 +84,20 @@ class AnalysisContext:
         layer_data = self._get_layer_data(layer)
         return layer_data.get(field_name, default)
     
+    def get_many(self, layer: DataLayer, fields: Iterable[str]) -> Dict[str, Any]:
+        """
+        批量获取指定层的多个字段（数据层只分派一次）
+
+        Args:
+            layer: 数据层
+            fields: 字段名列表
+
+        Returns:
+            字段名 -> 值，只包含该层中存在的字段
+        """
+        layer_data = self._get_layer_data(layer)
+        return {f: layer_data[f] for f in fields if f in layer_data}
+    
     def set(self, layer: DataLayer, field_name: str, value: Any, source: str = None) -> None:
         """
         设置指定层的指定字段数据
@@ -93,17 +116,58 @@ class AnalysisContext:
         if source:
             lineage_key = f"{layer.value}.{field_name}"
             self.data_lineage[lineage_key] = source
+            self._lineage_by_layer.setdefault(layer, {})[field_name] = source
+    
+    def set_many(self, layer: DataLayer, values: Mapping[str, Any], source: str = None) -> None:
+        """
+        批量设置指定层的多个字段（数据层只分派一次，更新时间只刷新一次）
+
+        Args:
+            layer: 数据层
+            values: 字段名 -> 字段值
+            source: 数据来源（Agent ID），用于血缘追踪
+        """
+        layer_data = self._get_layer_data(layer)
+        layer_data.update(values)
+        self.updated_at = datetime.now()
+
+        # 记录数据血缘
+        if source:
+            layer_lineage = self._lineage_by_layer.setdefault(layer, {})
+            prefix = f"{layer.value}."
+            for field_name in values:
+                self.data_lineage[prefix + field_name] = source
+                layer_lineage[field_name] = source
+    
+    def get_layer(self, layer: DataLayer, copy: bool = True) -> Mapping[str, Any]:
+        """
+        获取整层数据
+
+        Args:
+            layer: 数据层
+            copy: True 返回副本；False 返回只读视图（不复制，内容随上下文实时变化）
+        """
+        layer_data = self._get_layer_data(layer)
+        return layer_data.copy() if copy else MappingProxyType(layer_data)
+    
+    def view_layer(self, layer: DataLayer) -> Mapping[str, Any]:
+        """
+        获取整层数据的直接引用（不复制、不包装，仅供读取）
+
+        需要从同一层读取多个字段时，先取一次再逐个读取，避免每次 get 都重新分派数据层
+        """
+        return self._get_layer_data(layer)
     
-    def get_layer(self, layer: DataLayer) -> Dict[str, Any]:
-        """获取整层数据的副本"""
-        return self._get_layer_data(layer).copy()
+    def get_layer_lineage(self, layer: DataLayer) -> Mapping[str, str]:
+        """获取指定层的血缘只读视图（字段名 -> 来源 Agent）"""
+        return MappingProxyType(self._lineage_by_layer.get(layer, {}))
     
     def get_field_source(self, layer: DataLayer, field_name: str) -> Optional[str]:
         """获取字段的数据来源"""
         lineage_key = f"{layer.value}.{field_name}"
         return self.data_lineage.get(lineage_key)
     
-    def get_reports_for_phase(self, phase: int) -> Dict[str, str]:
+    def get_reports_for_phase(self, phase: int) -> Mapping[str, str]:
         """
         根据执行阶段获取可访问的报告
 
@@ -111,12 +175,12 @@ class AnalysisContext:
             phase: 执行阶段（1-7）
 
         Returns:
-            可访问的报告字典
+            可访问报告的只读视图（不复制，反映 reports 的实时内容；需要修改时请 dict(...)）
         """
         # 阶段 3+ 可以访问所有报告
         if phase >= 3:
-            return self.reports.copy()
-        return {}
+            return MappingProxyType(self.reports)
+        return MappingProxyType({})
 
     def to_legacy_state(self) -> Dict[str, Any]:
         """
@@ -125,20 +189,23 @@ class AnalysisContext:
         Returns:
             兼容旧版代码的状态字典
         """
+        context = self.context
+        reports = self.reports
+        decisions = self.decisions
         return {
-            "company_of_interest": self.context.get("ticker", ""),
-            "trade_date": self.context.get("trade_date", ""),
-            "market_report": self.reports.get("market_report", ""),
-            "sentiment_report": self.reports.get("sentiment_report", ""),
-            "news_report": self.reports.get("news_report", ""),
-            "fundamentals_report": self.reports.get("fundamentals_report", ""),
-            "sector_report": self.reports.get("sector_report", ""),
-            "index_report": self.reports.get("index_report", ""),
-            "investment_debate_state": self.decisions.get("investment_debate", {}),
-            "investment_plan": self.decisions.get("investment_plan", ""),
-            "trader_investment_plan": self.decisions.get("trade_signal", ""),
-            "risk_debate_state": self.decisions.get("risk_assessment", {}),
-            "final_trade_decision": self.decisions.get("final_decision", ""),
+            "company_of_interest": context.get("ticker", ""),
+            "trade_date": context.get("trade_date", ""),
+            "market_report": reports.get("market_report", ""),
+            "sentiment_report": reports.get("sentiment_report", ""),
+            "news_report": reports.get("news_report", ""),
+            "fundamentals_report": reports.get("fundamentals_report", ""),
+            "sector_report": reports.get("sector_report", ""),
+            "index_report": reports.get("index_report", ""),
+            "investment_debate_state": decisions.get("investment_debate", {}),
+            "investment_plan": decisions.get("investment_plan", ""),
+            "trader_investment_plan": decisions.get("trade_signal", ""),
+            "risk_debate_state": decisions.get("risk_assessment", {}),
+            "final_trade_decision": decisions.get("final_decision", ""),
         }
 
     @classmethod
@@ -15,7 +15,7 @@ from tradingagents.core.engine.data_contract import AgentDataContract, DataLayer
 from tradingagents.core.engine.data_schema import DynamicDataSchema, data_schema
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationError:
     """验证错误"""
     agent_id: str
@@ -25,7 +25,7 @@ class ValidationError:
     layer: Optional[DataLayer] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """验证结果"""
     is_valid: bool
@@ -37,6 +37,12 @@ class ValidationResult:
         self.errors.append(error)
         self.is_valid = False
     
+    def add_errors(self, errors: List[ValidationError]):
+        """批量添加错误"""
+        if errors:
+            self.errors.extend(errors)
+            self.is_valid = False
+    
     def add_warning(self, warning: str):
         """添加警告"""
         self.warnings.append(warning)
@@ -110,15 +116,19 @@ class ContractValidator:
             if not access.fields:
                 continue
             
-            for field_name in access.fields:
-                if not self.schema.is_valid_field(access.layer, field_name):
-                    result.add_error(ValidationError(
-                        agent_id=contract.agent_id,
-                        error_type="invalid_input",
-                        message=f"输入字段无效: {access.layer.value}.{field_name}",
-                        field_name=field_name,
-                        layer=access.layer
-                    ))
+            # 每个访问声明只取一次该层的合法字段集合
+            valid = self.schema.valid_fields(access.layer)
+            result.add_errors([
+                ValidationError(
+                    agent_id=contract.agent_id,
+                    error_type="invalid_input",
+                    message=f"输入字段无效: {access.layer.value}.{field_name}",
+                    field_name=field_name,
+                    layer=access.layer
+                )
+                for field_name in access.fields
+                if field_name not in valid
+            ])
     
     def _validate_outputs(self, contract: AgentDataContract, result: ValidationResult) -> None:
         """
@@ -131,30 +141,36 @@ class ContractValidator:
         from tradingagents.core.engine.data_contract import DataLayer
 
         for access in contract.outputs:
-            for field_name in access.fields:
-                if self.schema.is_core_field(access.layer, field_name):
-                    # DECISIONS 层的核心字段允许写入
-                    if access.layer == DataLayer.DECISIONS:
-                        continue
+            # DECISIONS 层的核心字段允许写入
+            if access.layer is DataLayer.DECISIONS:
+                continue
 
-                    # 其他层的核心字段不允许覆盖
-                    result.add_error(ValidationError(
-                        agent_id=contract.agent_id,
-                        error_type="core_conflict",
-                        message=f"不能覆盖核心字段: {access.layer.value}.{field_name}",
-                        field_name=field_name,
-                        layer=access.layer
-                    ))
+            # 其他层的核心字段不允许覆盖
+            core = self.schema.core_fields(access.layer)
+            result.add_errors([
+                ValidationError(
+                    agent_id=contract.agent_id,
+                    error_type="core_conflict",
+                    message=f"不能覆盖核心字段: {access.layer.value}.{field_name}",
+                    field_name=field_name,
+                    layer=access.layer
+                )
+                for field_name in access.fields
+                if field_name in core
+            ])
     
     def _validate_dependencies(self, contract: AgentDataContract, result: ValidationResult) -> None:
         """验证依赖的 Agent 是否已注册"""
-        for dep_id in contract.depends_on:
-            if dep_id not in self._registered_agents:
-                result.add_error(ValidationError(
-                    agent_id=contract.agent_id,
-                    error_type="missing_dependency",
-                    message=f"依赖的 Agent 未注册: {dep_id}"
-                ))
+        # 集合差一次求出所有未注册依赖，排序保证错误顺序稳定
+        missing = contract.depends_on - self._registered_agents.keys()
+        result.add_errors([
+            ValidationError(
+                agent_id=contract.agent_id,
+                error_type="missing_dependency",
+                message=f"依赖的 Agent 未注册: {dep_id}"
+            )
+            for dep_id in sorted(missing)
+        ])
     
     def validate_all_contracts(
         self, 
@@ -171,17 +187,12 @@ class ContractValidator:
         Returns:
             agent_id -> ValidationResult 的字典
         """
-        # 先注册所有契约
-        for contract in contracts:
-            self.register_contract(contract)
+        # 先注册所有契约（一次性批量写入）
+        self._registered_agents.update({contract.agent_id: contract for contract in contracts})
         
         # 再逐个验证
-        results = {}
-        for contract in contracts:
-            results[contract.agent_id] = self.validate_contract(
-                contract, 
-                check_dependencies=check_dependencies
-            )
-        
-        return results
+        return {
+            contract.agent_id: self.validate_contract(contract, check_dependencies=check_dependencies)
+            for contract in contracts
+        }
 
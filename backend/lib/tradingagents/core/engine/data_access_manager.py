@@ -9,7 +9,11 @@
 - 访问日志：记录所有数据访问操作
 """
 
-from typing import Dict, Any, List, Optional
+import os
+import sys
+import time
+from array import array
+from typing import Dict, Any, List, Mapping, Optional, Sequence, Set
 from datetime import datetime
 from dataclasses import dataclass, field
 
@@ -17,17 +21,43 @@ from tradingagents.core.engine.data_contract import AgentDataContract, DataAcces
 from tradingagents.core.engine.analysis_context import AnalysisContext
 
 
-@dataclass
+@dataclass(slots=True)
 class AccessLogEntry:
     """访问日志条目"""
     agent_id: str
     layer: str
-    fields: List[str]
+    fields: Sequence[str]  # 整层读取时为 ("*",)
     action: str  # 'read' or 'write'
-    timestamp: str
+    timestamp: int  # 纳秒级 Unix 时间戳，查询/导出时再格式化
     success: bool = True
     error: Optional[str] = None
 
+    @property
+    def timestamp_iso(self) -> str:
+        """ISO 格式的访问时间"""
+        return datetime.fromtimestamp(self.timestamp / 1e9).isoformat()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """导出为字典（时间戳格式化为 ISO 字符串）"""
+        return {
+            "agent_id": self.agent_id,
+            "layer": self.layer,
+            "fields": self.fields,
+            "action": self.action,
+            "timestamp": self.timestamp_iso,
+            "success": self.success,
+            "error": self.error,
+        }
+
+
+# 访问动作编码（日志按列存储时 action 列只存一个字节）
+_ACTION_CODES = {"read": 0, "write": 1}
+_ACTION_NAMES = ("read", "write")
+
+# 整层读取时日志中记录的字段占位。导出时保持原样：按该层当前字段展开会把
+# 读取之后才写入的字段也记为已读取
+_WHOLE_LAYER = ("*",)
+
 
 class DataAccessManager:
     """
@@ -40,20 +70,68 @@ class DataAccessManager:
     
     Attributes:
         context: 分析上下文
-        access_log: 访问日志列表
+        access_log: 访问日志列表（由按列存储的日志按需生成）
+        logging_enabled: 是否记录访问日志
     """
     
-    def __init__(self, context: AnalysisContext):
+    # 新实例默认是否记录访问日志（DATA_ACCESS_LOG_ENABLED=false 或 configure(enabled=False) 关闭）
+    default_logging_enabled: bool = os.getenv("DATA_ACCESS_LOG_ENABLED", "true").lower() == "true"
+    
+    def __init__(self, context: AnalysisContext, logging_enabled: Optional[bool] = None):
         """
         初始化数据访问管理器
         
         Args:
             context: 分析上下文实例
+            logging_enabled: 是否记录访问日志，None 时使用类级默认值
         """
         self.context = context
-        self.access_log: List[AccessLogEntry] = []
+        self.logging_enabled = (
+            self.default_logging_enabled if logging_enabled is None else logging_enabled
+        )
+        # 访问日志按列存储：每次访问只追加几个标量，查询时再组装 AccessLogEntry
+        self._agent_ids: List[str] = []
+        self._layers: List[str] = []
+        self._fields: List[Sequence[str]] = []
+        self._actions = array("b")
+        self._timestamps = array("q")
+        self._successes = array("b")
+        self._errors: List[Optional[str]] = []
+        self._read_count = 0
+        self._write_count = 0
+        # 出现过的数据层，随日志增量维护
+        self._layers_seen: Set[str] = set()
+        # Agent -> 该 Agent 日志所在行号，按 Agent 查询时只组装对应行（键即出现过的 Agent）
+        self._log_by_agent: Dict[str, List[int]] = {}
     
-    def get_data(self, agent_id: str, contract: AgentDataContract) -> Dict[str, Any]:
+    @classmethod
+    def configure(cls, enabled: bool) -> None:
+        """设置之后新建实例默认是否记录访问日志"""
+        cls.default_logging_enabled = enabled
+    
+    @property
+    def access_log(self) -> List[AccessLogEntry]:
+        """访问日志列表（每次访问都重新组装）"""
+        return [self._entry(i) for i in range(len(self._agent_ids))]
+    
+    def _entry(self, i: int) -> AccessLogEntry:
+        """将第 i 条按列存储的日志组装为 AccessLogEntry"""
+        return AccessLogEntry(
+            agent_id=self._agent_ids[i],
+            layer=self._layers[i],
+            fields=self._fields[i],
+            action=_ACTION_NAMES[self._actions[i]],
+            timestamp=self._timestamps[i],
+            success=bool(self._successes[i]),
+            error=self._errors[i],
+        )
+    
+    def get_data(
+        self,
+        agent_id: str,
+        contract: AgentDataContract,
+        copy: bool = True
+    ) -> Mapping[str, Any]:
         """
         根据契约获取 Agent 的输入数据
         
@@ -64,6 +142,7 @@ class DataAccessManager:
         Args:
             agent_id: Agent 标识
             contract: Agent 数据契约
+            copy: 契约只声明一个整层输入时，False 直接返回该层的只读视图（不复制）
             
         Returns:
             聚合的输入数据字典
@@ -71,10 +150,18 @@ class DataAccessManager:
         Raises:
             PermissionError: 如果访问了契约未声明的数据
         """
+        inputs = contract.inputs
+        if len(inputs) == 1 and not inputs[0].fields:
+            # 常见形态：只读取一整层，无需逐项聚合
+            access = inputs[0]
+            self._log_access(agent_id, access.layer, _WHOLE_LAYER, "read")
+            return self.context.get_layer(access.layer, copy=copy)
+        
         data = {}
         
-        for access in contract.inputs:
-            layer_data = self.context.get_layer(access.layer)
+        for access in inputs:
+            # 只读访问，使用视图避免复制整层
+            layer_data = self.context.get_layer(access.layer, copy=False)
             
             if access.fields:
                 # 获取指定字段
@@ -89,7 +176,8 @@ class DataAccessManager:
                 data.update(layer_data)
             
             # 记录访问日志
-            self._log_access(agent_id, access.layer, access.fields or list(layer_data.keys()), "read")
+            # 整层读取只记录占位，不在热路径上物化整层字段名列表
+            self._log_access(agent_id, access.layer, access.fields or _WHOLE_LAYER, "read")
         
         return data
     
@@ -112,33 +200,47 @@ class DataAccessManager:
         Raises:
             PermissionError: 如果写入了契约未声明的字段
         """
-        for access in contract.outputs:
-            for field_name in access.fields:
-                if field_name in outputs:
-                    # 写入数据并记录血缘
-                    self.context.set(access.layer, field_name, outputs[field_name], agent_id)
-                    self._log_access(agent_id, access.layer, [field_name], "write")
+        for layer, declared in contract.output_field_sets.items():
+            # 遍历一次产出字典，用契约预先生成的字段集合判断是否声明过
+            written = [field_name for field_name in outputs if field_name in declared]
+            if not written:
+                continue
+            for field_name in written:
+                # 写入数据并记录血缘
+                self.context.set(layer, field_name, outputs[field_name], agent_id)
+            # 每层只记一条写日志
+            self._log_access(agent_id, layer, written, "write")
     
     def _log_access(
         self, 
         agent_id: str, 
         layer: DataLayer, 
-        fields: List[str], 
+        fields: Sequence[str],
         action: str,
         success: bool = True,
         error: str = None
     ) -> None:
         """记录数据访问日志"""
-        entry = AccessLogEntry(
-            agent_id=agent_id,
-            layer=layer.value,
-            fields=fields,
-            action=action,
-            timestamp=datetime.now().isoformat(),
-            success=success,
-            error=error
-        )
-        self.access_log.append(entry)
+        if not self.logging_enabled:
+            return
+        code = _ACTION_CODES[action]
+        layer_value = layer.value
+        # 同一 Agent 的大量日志共用一个 agent_id 对象，按 Agent 过滤时可走指针比较
+        agent_id = sys.intern(agent_id)
+        self._log_by_agent.setdefault(agent_id, []).append(len(self._agent_ids))
+        self._agent_ids.append(agent_id)
+        self._layers.append(layer_value)
+        self._fields.append(fields)
+        self._actions.append(code)
+        # 热路径只取整数时间戳，避免每次访问都构造 datetime 并格式化
+        self._timestamps.append(time.time_ns())
+        self._successes.append(success)
+        self._errors.append(error)
+        if code:
+            self._write_count += 1
+        else:
+            self._read_count += 1
+        self._layers_seen.add(layer_value)
     
     def get_access_log(self, agent_id: str = None) -> List[AccessLogEntry]:
         """
@@ -151,8 +253,8 @@ class DataAccessManager:
             访问日志列表
         """
         if agent_id:
-            return [log for log in self.access_log if log.agent_id == agent_id]
-        return self.access_log.copy()
+            return [self._entry(i) for i in self._log_by_agent.get(agent_id, ())]
+        return self.access_log
     
     def get_data_lineage(self, layer: DataLayer = None, field_name: str = None) -> Dict[str, str]:
         """
@@ -165,16 +267,21 @@ class DataAccessManager:
         Returns:
             字段路径 -> 来源 Agent 的字典
         """
-        lineage = self.context.data_lineage.copy()
-
         if layer:
+            # 按层查询只遍历该层分区
             prefix = f"{layer.value}."
-            lineage = {k: v for k, v in lineage.items() if k.startswith(prefix)}
+            layer_lineage = self.context.get_layer_lineage(layer)
+            if field_name:
+                source = layer_lineage.get(field_name)
+                return {prefix + field_name: source} if source is not None else {}
+            return {prefix + k: v for k, v in layer_lineage.items()}
 
-        if field_name:
-            lineage = {k: v for k, v in lineage.items() if k.endswith(f".{field_name}")}
+        lineage = self.context.data_lineage
+        if not field_name:
+            return lineage.copy()
 
-        return lineage
+        suffix = f".{field_name}"
+        return {k: v for k, v in lineage.items() if k.endswith(suffix)}
 
     def validate_access(self, agent_id: str, contract: AgentDataContract,
                        layer: DataLayer, field_name: str, action: str) -> bool:
@@ -217,7 +324,17 @@ class DataAccessManager:
 
     def clear_access_log(self) -> None:
         """清空访问日志"""
-        self.access_log.clear()
+        self._agent_ids.clear()
+        self._layers.clear()
+        self._fields.clear()
+        del self._actions[:]
+        del self._timestamps[:]
+        del self._successes[:]
+        self._errors.clear()
+        self._read_count = 0
+        self._write_count = 0
+        self._layers_seen.clear()
+        self._log_by_agent.clear()
 
     def get_access_summary(self) -> Dict[str, Any]:
         """
@@ -226,18 +343,12 @@ class DataAccessManager:
         Returns:
             包含读写次数、Agent 活动等统计信息
         """
-        read_count = sum(1 for log in self.access_log if log.action == "read")
-        write_count = sum(1 for log in self.access_log if log.action == "write")
-
-        agents = set(log.agent_id for log in self.access_log)
-        layers_accessed = set(log.layer for log in self.access_log)
-
         return {
-            "total_operations": len(self.access_log),
-            "read_count": read_count,
-            "write_count": write_count,
-            "unique_agents": len(agents),
-            "agents": list(agents),
-            "layers_accessed": list(layers_accessed),
+            "total_operations": len(self._agent_ids),
+            "read_count": self._read_count,
+            "write_count": self._write_count,
+            "unique_agents": len(self._log_by_agent),
+            "agents": list(self._log_by_agent),
+            "layers_accessed": list(self._layers_seen),
         }
 
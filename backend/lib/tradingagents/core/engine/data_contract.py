@@ -8,9 +8,11 @@
 - AgentDataContract: Agent 数据契约
 """
 
+import sys
 from enum import Enum
-from typing import List, Set, Optional
-from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, Set, Optional, Tuple
+from dataclasses import dataclass, field as dc_field
 
 
 class DataLayer(str, Enum):
@@ -31,7 +33,15 @@ class DataLayer(str, Enum):
     DECISIONS = "decisions"
 
 
-@dataclass
+# 各 Agent 契约共用的 Context 层字段（共享同一元组对象，字段名已驻留）
+CONTEXT_FIELDS: Tuple[str, ...] = (
+    sys.intern("ticker"),
+    sys.intern("company_name"),
+    sys.intern("trade_date"),
+)
+
+
+@dataclass(slots=True, frozen=True)
 class DataAccess:
     """
     数据访问声明
@@ -39,8 +49,8 @@ class DataAccess:
     声明 Agent 对某一数据层的访问需求。
     
     Attributes:
-        layer: 数据层
-        fields: 需要访问的字段列表，空列表表示访问整层所有数据
+        layer: 数据层（也可传入层名字符串，构造时解析为 DataLayer）
+        fields: 需要访问的字段元组（构造时由列表/元组转换并驻留字符串），空表示访问整层所有数据
         required: 是否必需，False 表示可选（数据不存在时不报错）
     
     Examples:
@@ -48,24 +58,67 @@ class DataAccess:
         DataAccess(layer=DataLayer.CONTEXT, fields=["ticker", "trade_date"])
         
         # 访问整层所有数据
-        DataAccess(layer=DataLayer.REPORTS)  # fields 默认为空列表
+        DataAccess(layer=DataLayer.REPORTS)  # fields 默认为空元组
         
         # 可选访问
         DataAccess(layer=DataLayer.DECISIONS, fields=["debate"], required=False)
     """
     layer: DataLayer
-    fields: List[str] = field(default_factory=list)
+    fields: Tuple[str, ...] = ()
     required: bool = True
+    # fields 的集合形式（构造时生成），字段成员判断为 O(1)
+    _fields_set: FrozenSet[str] = dc_field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        """验证字段类型"""
+        """验证字段类型，将 layer 解析为枚举成员、fields 转为驻留字符串元组"""
         if not isinstance(self.layer, DataLayer):
-            raise ValueError(f"layer must be DataLayer, got {type(self.layer)}")
-        if not isinstance(self.fields, list):
-            raise ValueError(f"fields must be list, got {type(self.fields)}")
+            # 允许传入层名字符串（如 "reports"），构造时一次性解析为枚举单例，
+            # 之后各处可直接用 access.layer is DataLayer.X 判断
+            try:
+                object.__setattr__(self, "layer", DataLayer(self.layer))
+            except ValueError:
+                raise ValueError(f"layer must be DataLayer, got {type(self.layer)}") from None
+        if not isinstance(self.fields, (list, tuple)):
+            raise ValueError(f"fields must be list or tuple, got {type(self.fields)}")
+        # 契约在导入时构造、执行时反复做 field in access.fields 判断，
+        # 驻留后字段名比较可走指针相等的快速路径；已是驻留元组时直接复用共享对象
+        if type(self.fields) is not tuple or any(sys.intern(f) is not f for f in self.fields):
+            object.__setattr__(self, "fields", tuple(sys.intern(f) for f in self.fields))
+        object.__setattr__(self, "_fields_set", frozenset(self.fields))
+    
+    def has_field(self, field: str) -> bool:
+        """检查字段是否在声明范围内（fields 为空表示整层）"""
+        return not self.fields or field in self._fields_set
 
 
-@dataclass
+# 无依赖契约共用的空集合（CPython 3.10+ 不再缓存空 frozenset 单例）
+_NO_DEPENDENCIES: FrozenSet[str] = frozenset()
+
+
+def _build_layer_index(
+    accesses: Tuple[DataAccess, ...],
+) -> Tuple[Mapping[DataLayer, Tuple[str, ...]], Mapping[DataLayer, Optional[FrozenSet[str]]]]:
+    """
+    按数据层建立访问声明索引
+
+    Returns:
+        (层 -> 首个声明的字段元组, 层 -> 允许访问的字段集合；None 表示整层可访问)
+    """
+    fields_by_layer: Dict[DataLayer, Tuple[str, ...]] = {}
+    allowed: Dict[DataLayer, Optional[FrozenSet[str]]] = {}
+    for access in accesses:
+        fields_by_layer.setdefault(access.layer, access.fields)
+        if not access.fields:
+            allowed[access.layer] = None
+        elif access.layer not in allowed:
+            allowed[access.layer] = access._fields_set
+        elif allowed[access.layer] is not None:
+            # 同一层多次声明时合并字段
+            allowed[access.layer] = allowed[access.layer] | access._fields_set
+    return MappingProxyType(fields_by_layer), MappingProxyType(allowed)
+
+
+@dataclass(slots=True, frozen=True)
 class AgentDataContract:
     """
     Agent 数据契约
@@ -74,8 +127,8 @@ class AgentDataContract:
     
     Attributes:
         agent_id: Agent 唯一标识
-        inputs: 输入数据声明列表
-        outputs: 输出数据声明列表
+        inputs: 输入数据声明元组（传入列表时自动转换）
+        outputs: 输出数据声明元组（传入列表时自动转换）
         depends_on: 依赖的 Agent ID 集合
         description: 契约描述
     
@@ -90,24 +143,57 @@ class AgentDataContract:
                 DataAccess(layer=DataLayer.ANALYSIS_DATA, fields=["technical"]),
                 DataAccess(layer=DataLayer.REPORTS, fields=["market_report"]),
             ],
-            depends_on={"data_collector"},
+            depends_on=frozenset({"data_collector"}),
             description="市场分析师 - 负责技术分析"
         )
     """
     agent_id: str
-    inputs: List[DataAccess] = field(default_factory=list)
-    outputs: List[DataAccess] = field(default_factory=list)
-    depends_on: Set[str] = field(default_factory=set)
+    inputs: Tuple[DataAccess, ...] = ()
+    outputs: Tuple[DataAccess, ...] = ()
+    depends_on: FrozenSet[str] = _NO_DEPENDENCIES
     description: str = ""
+    # 按层索引（构造时由 inputs/outputs 生成），权限检查和字段查询无需遍历声明列表
+    _input_fields: Mapping[DataLayer, Tuple[str, ...]] = dc_field(init=False, repr=False, compare=False)
+    _input_index: Mapping[DataLayer, Optional[FrozenSet[str]]] = dc_field(init=False, repr=False, compare=False)
+    _output_fields: Mapping[DataLayer, Tuple[str, ...]] = dc_field(init=False, repr=False, compare=False)
+    _output_index: Mapping[DataLayer, Optional[FrozenSet[str]]] = dc_field(init=False, repr=False, compare=False)
+    _output_field_sets: Mapping[DataLayer, FrozenSet[str]] = dc_field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """验证契约完整性"""
         if not self.agent_id:
             raise ValueError("agent_id cannot be empty")
+        # agent_id 作为各类注册表/映射的键，驻留后查找时可走指针比较
+        object.__setattr__(self, "agent_id", sys.intern(self.agent_id))
+        
+        # 契约在导入时构造后只读，输入/输出声明统一存为元组
+        if not isinstance(self.inputs, tuple):
+            object.__setattr__(self, "inputs", tuple(self.inputs))
+        if not isinstance(self.outputs, tuple):
+            object.__setattr__(self, "outputs", tuple(self.outputs))
         
-        # 确保 depends_on 是集合
-        if isinstance(self.depends_on, (list, tuple)):
-            self.depends_on = set(self.depends_on)
+        # 确保 depends_on 是不可变集合，契约可在多次拓扑排序/验证间安全共享
+        if not self.depends_on:
+            object.__setattr__(self, "depends_on", _NO_DEPENDENCIES)
+        elif not isinstance(self.depends_on, frozenset):
+            object.__setattr__(self, "depends_on", frozenset(self.depends_on))
+        
+        input_fields, input_index = _build_layer_index(self.inputs)
+        output_fields, output_index = _build_layer_index(self.outputs)
+        object.__setattr__(self, "_input_fields", input_fields)
+        object.__setattr__(self, "_input_index", input_index)
+        object.__setattr__(self, "_output_fields", output_fields)
+        object.__setattr__(self, "_output_index", output_index)
+        
+        # 各层显式声明的输出字段（整层声明不含具体字段，不参与写入）
+        output_field_sets: Dict[DataLayer, FrozenSet[str]] = {}
+        for access in self.outputs:
+            if access.fields:
+                declared = output_field_sets.get(access.layer)
+                output_field_sets[access.layer] = (
+                    access._fields_set if declared is None else declared | access._fields_set
+                )
+        object.__setattr__(self, "_output_field_sets", MappingProxyType(output_field_sets))
     
     def get_input_layers(self) -> Set[DataLayer]:
         """获取所有输入数据层"""
@@ -117,37 +203,35 @@ class AgentDataContract:
         """获取所有输出数据层"""
         return {access.layer for access in self.outputs}
     
-    def get_input_fields(self, layer: DataLayer) -> List[str]:
-        """获取指定层的输入字段列表"""
-        for access in self.inputs:
-            if access.layer == layer:
-                return access.fields
-        return []
+    def get_input_fields(self, layer: DataLayer) -> Tuple[str, ...]:
+        """获取指定层的输入字段元组"""
+        return self._input_fields.get(layer, ())
     
-    def get_output_fields(self, layer: DataLayer) -> List[str]:
-        """获取指定层的输出字段列表"""
-        for access in self.outputs:
-            if access.layer == layer:
-                return access.fields
-        return []
+    def get_output_fields(self, layer: DataLayer) -> Tuple[str, ...]:
+        """获取指定层的输出字段元组"""
+        return self._output_fields.get(layer, ())
+    
+    @property
+    def output_field_sets(self) -> Mapping[DataLayer, FrozenSet[str]]:
+        """各输出层显式声明的字段集合（层 -> 字段名集合）"""
+        return self._output_field_sets
     
     def has_input_access(self, layer: DataLayer, field: str = None) -> bool:
         """检查是否有指定层/字段的输入访问权限"""
-        for access in self.inputs:
-            if access.layer == layer:
-                if not field:
-                    return True
-                if not access.fields or field in access.fields:
-                    return True
-        return False
+        return _check_access(self._input_index, layer, field)
     
     def has_output_access(self, layer: DataLayer, field: str = None) -> bool:
         """检查是否有指定层/字段的输出访问权限"""
-        for access in self.outputs:
-            if access.layer == layer:
-                if not field:
-                    return True
-                if not access.fields or field in access.fields:
-                    return True
-        return False
+        return _check_access(self._output_index, layer, field)
 
+
+def _check_access(
+    index: Mapping[DataLayer, Optional[FrozenSet[str]]],
+    layer: DataLayer,
+    field: Optional[str],
+) -> bool:
+    """按层索引判断访问权限：层未声明返回 False，整层声明或字段在集合内返回 True"""
+    if layer not in index:
+        return False
+    allowed = index[layer]
+    return not field or allowed is None or field in allowed
@@ -8,8 +8,15 @@
 3. 扩展字段 - YAML 配置文件定义
 """
 
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from collections import ChainMap
 from dataclasses import dataclass, field
-from typing import Dict, Set, Any, Optional, List
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, Set, Any, Optional, List
 from pathlib import Path
 
 try:
@@ -21,7 +28,74 @@ except ImportError:
 from tradingagents.core.engine.data_contract import DataLayer
 
 
-@dataclass
+def _schema_cache_dir() -> Path:
+    """
+    字段扩展配置 JSON 缓存目录（不写入源码/配置目录）
+
+    优先使用环境变量 RADARX_SCHEMA_CACHE_DIR，
+    其次为 $XDG_CACHE_HOME/tradingagents/schema（默认 ~/.cache/tradingagents/schema）
+    """
+    configured = os.getenv("RADARX_SCHEMA_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "tradingagents" / "schema"
+
+
+def _schema_cache_path(path: Path) -> Path:
+    """YAML 配置对应的 JSON 缓存文件路径（按 YAML 绝对路径区分，避免同名配置互相覆盖）"""
+    digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:12]
+    return _schema_cache_dir() / f"{path.stem}-{digest}.json.cache"
+
+
+def _write_schema_cache(cache_path: Path, config: Any) -> None:
+    """
+    原子写入 JSON 缓存：先写同目录临时文件再 os.replace，
+    其他进程只会读到旧缓存或完整的新缓存；写入失败时忽略（只读目录或含 JSON 不支持的类型）
+    """
+    tmp_name = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cache_path.parent,
+            prefix=cache_path.name + ".", suffix=".tmp", delete=False,
+        ) as f:
+            tmp_name = f.name
+            json.dump(config, f, ensure_ascii=False)
+        os.replace(tmp_name, cache_path)
+    except (OSError, TypeError, ValueError):
+        if tmp_name is not None:
+            try:
+                os.remove(tmp_name)
+            except OSError:
+                pass
+
+
+def _read_schema_config(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    读取字段扩展配置
+
+    JSON 缓存比 YAML 新时直接读取缓存，跳过 YAML 解析；
+    否则解析 YAML 并尽量回写缓存（缓存目录见 _schema_cache_dir）。
+    """
+    cache_path = _schema_cache_path(path)
+    try:
+        if os.stat(cache_path).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    if not HAS_YAML:
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+
+    _write_schema_cache(cache_path, config)
+    return config
+
+
+@dataclass(slots=True)
 class FieldDefinition:
     """
     字段定义
@@ -91,6 +165,13 @@ class DynamicDataSchema:
             layer: {} for layer in DataLayer
         }
         
+        # 核心字段名集合（静态），以及各层合并字段/合法字段名缓存（字段变化时清空）
+        self._core_field_names: Dict[DataLayer, FrozenSet[str]] = {
+            layer: frozenset(self._core_fields.get(layer, {})) for layer in DataLayer
+        }
+        self._merged_cache: Dict[DataLayer, Mapping[str, FieldDefinition]] = {}
+        self._valid_fields_cache: Dict[DataLayer, FrozenSet[str]] = {}
+        
         # 加载 YAML 配置
         self._load_extend_schema()
     
@@ -197,8 +278,7 @@ class DynamicDataSchema:
             return
 
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
+            config = _read_schema_config(path)
         except Exception:
             return
 
@@ -216,6 +296,8 @@ class DynamicDataSchema:
                 # 跳过核心字段（不允许覆盖）
                 if field_name in self._core_fields.get(layer, {}):
                     continue
+                # YAML 解析出的字段名不会自动驻留，与契约中的字段名统一驻留后比较走指针快速路径
+                field_name = sys.intern(field_name)
 
                 self._extend_fields[layer][field_name] = FieldDefinition(
                     name=field_name,
@@ -234,11 +316,14 @@ class DynamicDataSchema:
             agent_id: Agent 标识
             outputs: Agent 的输出声明列表 [DataAccess, ...]
         """
+        self._invalidate_caches()
+        agent_id = sys.intern(agent_id)
         for access in outputs:
             for field_name in access.fields:
                 # 跳过核心字段
                 if field_name in self._core_fields.get(access.layer, {}):
                     continue
+                field_name = sys.intern(field_name)
 
                 self._agent_fields[access.layer][field_name] = FieldDefinition(
                     name=field_name,
@@ -247,9 +332,14 @@ class DynamicDataSchema:
                     description=f"由 {agent_id} 产出"
                 )
 
-    def get_all_fields(self, layer: DataLayer) -> Dict[str, FieldDefinition]:
+    def _invalidate_caches(self) -> None:
+        """字段定义变化后清空缓存（合并视图引用各来源字典，来源字典被替换时必须重建）"""
+        self._merged_cache.clear()
+        self._valid_fields_cache.clear()
+
+    def get_all_fields(self, layer: DataLayer) -> Mapping[str, FieldDefinition]:
         """
-        获取某层的所有字段（合并三个来源）
+        获取某层的所有字段（三个来源的合并视图，带缓存）
 
         优先级：核心字段 > Agent 字段 > 扩展字段
 
@@ -257,28 +347,46 @@ class DynamicDataSchema:
             layer: 数据层
 
         Returns:
-            字段名 -> FieldDefinition 的字典
+            字段名 -> FieldDefinition 的只读映射（不复制，随字段注册实时变化）
         """
-        result = {}
-
-        # 先加载扩展字段（最低优先级）
-        result.update(self._extend_fields.get(layer, {}))
+        merged = self._merged_cache.get(layer)
+        if merged is not None:
+            return merged
 
-        # 再加载 Agent 字段
-        result.update(self._agent_fields.get(layer, {}))
+        # ChainMap 按顺序查找实现优先级，不复制字段；外层只读包装防止经由视图写入核心字段
+        result = ChainMap(
+            self._core_fields.get(layer, {}),
+            self._agent_fields.get(layer, {}),
+            self._extend_fields.get(layer, {}),
+        )
 
-        # 最后加载核心字段（最高优先级）
-        result.update(self._core_fields.get(layer, {}))
-
-        return result
+        merged = MappingProxyType(result)
+        self._merged_cache[layer] = merged
+        return merged
 
     def get_field_names(self, layer: DataLayer) -> Set[str]:
         """获取某层的所有字段名"""
-        return set(self.get_all_fields(layer).keys())
+        return set(self.valid_fields(layer))
+
+    def valid_fields(self, layer: DataLayer) -> FrozenSet[str]:
+        """
+        获取某层所有合法字段名的不可变集合（带缓存）
+
+        批量校验时每层只需取一次集合，再逐个做成员判断
+        """
+        names = self._valid_fields_cache.get(layer)
+        if names is None:
+            names = frozenset(self.get_all_fields(layer))
+            self._valid_fields_cache[layer] = names
+        return names
+
+    def core_fields(self, layer: DataLayer) -> FrozenSet[str]:
+        """获取某层核心字段名的不可变集合"""
+        return self._core_field_names.get(layer, frozenset())
 
     def is_valid_field(self, layer: DataLayer, field_name: str) -> bool:
         """检查字段是否合法"""
-        return field_name in self.get_field_names(layer)
+        return field_name in self.valid_fields(layer)
 
     def get_field_info(self, layer: DataLayer, field_name: str) -> Optional[FieldDefinition]:
         """获取字段详细信息"""
@@ -311,10 +419,12 @@ class DynamicDataSchema:
     def reset_agent_fields(self) -> None:
         """重置所有 Agent 动态字段（用于测试）"""
         self._agent_fields = {layer: {} for layer in DataLayer}
+        self._invalidate_caches()
 
     def reload_extend_schema(self, config_path: str = None) -> None:
         """重新加载扩展字段配置"""
         self._extend_fields = {layer: {} for layer in DataLayer}
+        self._invalidate_caches()
         self._load_extend_schema(config_path)
 
 
@@ -14,7 +14,8 @@ Memory 提供者
 - llm_provider: 使用的 LLM 提供商（影响嵌入模型选择）
 """
 
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
 from tradingagents.utils.logging_init import get_logger
 
@@ -32,6 +33,22 @@ MEMORY_AGENT_MAPPING = {
     "risk_memory": ["risk_manager"],  # 别名
 }
 
+# 默认 Memory（未映射的 Agent 使用）
+DEFAULT_MEMORY_NAME = "invest_judge_memory"
+
+
+def _build_agent_to_memory() -> Mapping[str, str]:
+    """构建 Agent ID -> Memory 名称的反向索引（同一 Agent 出现多次时以首个映射为准）"""
+    index: Dict[str, str] = {}
+    for memory_name, agent_ids in MEMORY_AGENT_MAPPING.items():
+        for agent_id in agent_ids:
+            index.setdefault(agent_id, memory_name)
+    return MappingProxyType(index)
+
+
+# Agent ID -> Memory 名称（导入时构建一次）
+AGENT_TO_MEMORY = _build_agent_to_memory()
+
 
 class MemoryProvider:
     """
@@ -55,6 +72,8 @@ class MemoryProvider:
         self.config = config or self._get_default_config()
         self.memory_enabled = memory_enabled
         self._memories: Dict[str, Any] = {}
+        # get_memory_config 结果缓存（clear_memories 时失效）
+        self._memory_config_cache: Optional[Mapping[str, Any]] = None
         
         if memory_enabled:
             logger.info("🧠 [MemoryProvider] Memory 功能已启用")
@@ -105,13 +124,16 @@ class MemoryProvider:
             logger.warning(f"⚠️ [MemoryProvider] 创建 Memory 失败 {memory_name}: {e}")
             return None
     
-    def get_memory_config(self) -> Dict[str, Any]:
+    def get_memory_config(self) -> Mapping[str, Any]:
         """
-        获取所有 Agent 的 Memory 配置
+        获取所有 Agent 的 Memory 配置（首次调用时构建，之后复用）
 
         Returns:
-            字典，key 为 agent_id 和 memory_name，value 为对应的 Memory 实例
+            只读映射，key 为 agent_id 和 memory_name，value 为对应的 Memory 实例
         """
+        if self._memory_config_cache is not None:
+            return self._memory_config_cache
+
         memory_config = {}
 
         for memory_name, agent_ids in MEMORY_AGENT_MAPPING.items():
@@ -122,9 +144,10 @@ class MemoryProvider:
                 memory_config[agent_id] = memory
 
         # 设置默认 memory
-        memory_config["default"] = self.get_memory("invest_judge_memory")
+        memory_config["default"] = self.get_memory(DEFAULT_MEMORY_NAME)
 
-        return memory_config
+        self._memory_config_cache = MappingProxyType(memory_config)
+        return self._memory_config_cache
     
     def get_memory_by_agent(self, agent_id: str) -> Optional[Any]:
         """
@@ -136,15 +159,12 @@ class MemoryProvider:
         Returns:
             对应的 Memory 实例或 None
         """
-        for memory_name, agent_ids in MEMORY_AGENT_MAPPING.items():
-            if agent_id in agent_ids:
-                return self.get_memory(memory_name)
-        
-        # 默认返回 invest_judge_memory
-        return self.get_memory("invest_judge_memory")
+        # 未映射的 Agent 默认返回 invest_judge_memory
+        return self.get_memory(AGENT_TO_MEMORY.get(agent_id, DEFAULT_MEMORY_NAME))
     
     def clear_memories(self):
         """清除所有 Memory 缓存"""
         self._memories.clear()
+        self._memory_config_cache = None
         logger.debug("🧹 [MemoryProvider] Memory 缓存已清除")
 
@@ -0,0 +1,112 @@
+# tradingagents/core/engine/phase_executors/_keyword_scan.py
+"""
+关键词分组计分
+
+交易/风控阶段从 LLM 输出文本中按关键词判断买卖方向和风险级别。
+所有关键词编译为一个正则交替式，一次扫描文本即可得到各组命中的关键词数，
+不再对每个关键词分别执行一次子串查找。
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# 提前结束判断: (各组当前得分, 各组尚未命中的关键词数) -> 结果是否已确定
+StopCondition = Callable[[List[int], List[int]], bool]
+
+
+class KeywordGroups:
+    """
+    预编译的关键词分组
+
+    计分规则与逐个 ``kw in text`` 相同：每组得分为该组在文本中出现过的不同关键词个数。
+    """
+
+    __slots__ = ("_pattern", "_implied", "_group_of", "_group_sizes", "group_count")
+
+    def __init__(self, *groups: Sequence[str]):
+        """
+        Args:
+            groups: 各组关键词（应为小写），组序号即 scores() 返回列表中的下标
+        """
+        self.group_count = len(groups)
+        self._group_of: Dict[str, Tuple[int, ...]] = {}
+        for index, keywords in enumerate(groups):
+            for kw in keywords:
+                self._group_of[kw] = self._group_of.get(kw, ()) + (index,)
+
+        self._group_sizes = [0] * self.group_count
+        for indexes in self._group_of.values():
+            for index in indexes:
+                self._group_sizes[index] += 1
+
+        keywords = sorted(self._group_of, key=len, reverse=True)
+        # 同一位置只会匹配最长的关键词，被其包含的较短关键词在此补记
+        self._implied: Dict[str, Tuple[str, ...]] = {
+            kw: tuple(other for other in keywords if other in kw) for kw in keywords
+        }
+        self._pattern = re.compile("|".join(map(re.escape, keywords)))
+
+    def scores(self, text_lower: str, stop: Optional[StopCondition] = None) -> List[int]:
+        """
+        计算各组得分
+
+        Args:
+            text_lower: 已转为小写的文本
+            stop: 可选的提前结束条件，每命中新关键词后调用，返回 True 时停止扫描。
+                调用方需保证此时剩余关键词已不会改变其最终结论（得分可能未计满）
+
+        Returns:
+            各组命中的不同关键词个数
+        """
+        counts = [0] * self.group_count
+        remaining = list(self._group_sizes)
+        found = set()
+        search = self._pattern.search
+        match = search(text_lower)
+        while match is not None:
+            new_hit = False
+            for kw in self._implied[match.group()]:
+                if kw in found:
+                    continue
+                found.add(kw)
+                new_hit = True
+                for index in self._group_of[kw]:
+                    counts[index] += 1
+                    remaining[index] -= 1
+            if new_hit and stop is not None and stop(counts, remaining):
+                break
+            # 从匹配起点的下一个字符继续，保留与当前匹配重叠的关键词
+            match = search(text_lower, match.start() + 1)
+        return counts
+
+
+def leader_decided(
+    counts: List[int],
+    remaining: List[int],
+    winners: Sequence[int],
+    saturate_at: Optional[int] = None,
+) -> bool:
+    """
+    按“严格最高分者胜出”规则判断结论是否已确定（供 KeywordGroups.scores 的 stop 使用）
+
+    Args:
+        counts: 各组当前得分
+        remaining: 各组尚未命中的关键词数
+        winners: 严格领先时会改变结论的组；其余组领先或并列时结论相同（回退结论）
+        saturate_at: 胜出组的置信度随得分增长、到此得分封顶时传入，
+            未封顶且仍有关键词未命中时不提前结束
+
+    Returns:
+        剩余关键词无论是否出现都不会改变结论时返回 True
+    """
+    for group in winners:
+        if all(
+            counts[group] > counts[other] + remaining[other]
+            for other in range(len(counts)) if other != group
+        ):
+            return saturate_at is None or counts[group] >= saturate_at or remaining[group] == 0
+    # 所有会改变结论的组都已无法严格领先，结论为回退结论
+    return all(
+        counts[group] + remaining[group] <= max(counts[o] for o in range(len(counts)) if o != group)
+        for group in winners
+    )
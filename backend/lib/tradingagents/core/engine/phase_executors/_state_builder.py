@@ -0,0 +1,50 @@
+# tradingagents/core/engine/phase_executors/_state_builder.py
+"""
+兼容旧版 Agent 的基础状态构建
+
+交易员、风控等 Agent 沿用 LangGraph 版本的状态字典（company_of_interest、trade_date
+和各分析师报告）。各阶段共用此处的构建逻辑，Context 层和 Reports 层各只取一次。
+"""
+
+from typing import Any, Dict, Iterable
+
+from ..analysis_context import AnalysisContext
+from ..data_contract import DataLayer
+
+# 交易员读取的全部分析师报告
+AGENT_REPORT_FIELDS = (
+    "market_report",
+    "sentiment_report",
+    "news_report",
+    "fundamentals_report",
+    "sector_report",
+    "index_report",
+)
+
+
+def build_agent_base_state(
+    context: AnalysisContext,
+    report_fields: Iterable[str] = AGENT_REPORT_FIELDS,
+) -> Dict[str, Any]:
+    """
+    构建 Agent 基础状态（股票代码、交易日期和分析师报告，缺失字段为空字符串）
+
+    每次返回新的字典，调用方可直接添加阶段特有的字段。
+    报告不在阶段间缓存：前序阶段仍可能写入 Reports 层。
+
+    Args:
+        context: 分析上下文
+        report_fields: 需要放入状态的报告字段
+
+    Returns:
+        基础状态字典
+    """
+    context_layer = context.view_layer(DataLayer.CONTEXT)
+    state = {
+        "company_of_interest": context_layer.get("ticker") or "",
+        "trade_date": context_layer.get("trade_date") or "",
+    }
+    reports = context.view_layer(DataLayer.REPORTS)
+    for field in report_fields:
+        state[field] = reports.get(field) or ""
+    return state
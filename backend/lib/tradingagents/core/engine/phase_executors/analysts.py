@@ -11,8 +11,10 @@
 - IndexAnalyst (大盘分析)
 """
 
-from typing import Any, Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from tradingagents.utils.logging_init import get_logger
 
@@ -20,10 +22,37 @@ from ..analysis_context import AnalysisContext
 from ..data_access_manager import DataAccessManager
 from ..data_contract import DataLayer, AgentDataContract
 from ..agent_integrator import AgentIntegrator
-from .base import PhaseExecutor
+from .base import PhaseExecutor, env_max_workers, resolve_max_workers, run_in_shared_pool
 
 logger = get_logger("default")
 
+# 默认分析师列表（执行顺序）
+DEFAULT_ANALYSTS: Tuple[str, ...] = (
+    "market_analyst",
+    "news_analyst",
+    "sentiment_analyst",
+    "fundamentals_analyst",
+    "sector_analyst",
+    "index_analyst",
+)
+_DEFAULT_ANALYSTS_SET = frozenset(DEFAULT_ANALYSTS)
+
+# 分析师 -> 报告字段（桩实现使用）
+OUTPUT_FIELD_MAP = MappingProxyType({
+    "market_analyst": "market_report",
+    "news_analyst": "news_report",
+    "sentiment_analyst": "sentiment_report",
+    "fundamentals_analyst": "fundamentals_report",
+    "sector_analyst": "sector_report",
+    "index_analyst": "index_report",
+})
+
+
+@lru_cache(maxsize=4096)
+def _stub_text(analyst_id: str, ticker: Optional[str]) -> str:
+    """桩报告文本（按 analyst_id/ticker 缓存，同一股票的桩报告逐字节一致）"""
+    return f"[{analyst_id}] 分析报告占位 - {ticker}"
+
 
 class AnalystsPhase(PhaseExecutor):
     """
@@ -40,7 +69,7 @@ class AnalystsPhase(PhaseExecutor):
         llm_provider: Any = None,
         config: Optional[Dict[str, Any]] = None,
         selected_analysts: Optional[List[str]] = None,
-        max_workers: int = 4,
+        max_workers: Optional[int] = None,
         llm: Any = None,
         toolkit: Any = None,
         use_stub: bool = False
@@ -52,15 +81,20 @@ class AnalystsPhase(PhaseExecutor):
             llm_provider: LLM 提供者（用于创建 LLM）
             config: 阶段配置
             selected_analysts: 选择的分析师列表，None 表示全部
-            max_workers: 并行执行的最大工作线程数
+            max_workers: 并行执行的最大工作线程数，None 时读取环境变量
+                RADARX_ANALYST_MAX_WORKERS，仍未设置则所有分析师同时执行（受 CPU 数上限约束）
             llm: 已创建的 LLM 实例（优先使用）
             toolkit: 工具集实例
             use_stub: 是否使用桩实现（用于测试）
         """
         super().__init__(llm_provider, config)
         self.selected_analysts = selected_analysts
+        if max_workers is None:
+            max_workers = env_max_workers("RADARX_ANALYST_MAX_WORKERS")
         self.max_workers = max_workers
         self.use_stub = use_stub
+        # 分析师并发执行时串行化对 AnalysisContext 的写入（set 会同时更新数据层和血缘）
+        self._context_lock = threading.Lock()
 
         # Agent 集成器（延迟初始化）
         self._integrator: Optional[AgentIntegrator] = None
@@ -85,7 +119,7 @@ class AnalystsPhase(PhaseExecutor):
         self.log_start()
         
         ticker = context.get(DataLayer.CONTEXT, "ticker")
-        logger.info(f"📊 [{self.phase_name}] 分析股票: {ticker}")
+        logger.info("📊 [%s] 分析股票: %s", self.phase_name, ticker)
         
         # 获取要执行的分析师列表
         analysts_to_run = self._get_analysts_to_run()
@@ -98,7 +132,7 @@ class AnalystsPhase(PhaseExecutor):
         }
         
         # 并行执行分析师
-        if self.max_workers > 1 and len(analysts_to_run) > 1:
+        if (self.max_workers is None or self.max_workers > 1) and len(analysts_to_run) > 1:
             self._run_parallel(analysts_to_run, context, data_manager, outputs)
         else:
             self._run_sequential(analysts_to_run, context, data_manager, outputs)
@@ -106,25 +140,15 @@ class AnalystsPhase(PhaseExecutor):
         self.log_end(outputs)
         return outputs
     
-    def _get_analysts_to_run(self) -> List[str]:
+    def _get_analysts_to_run(self) -> Tuple[str, ...]:
         """获取要执行的分析师列表"""
-        # 默认分析师列表
-        default_analysts = [
-            "market_analyst",
-            "news_analyst",
-            "sentiment_analyst",
-            "fundamentals_analyst",
-            "sector_analyst",
-            "index_analyst",
-        ]
-        
         if self.selected_analysts:
-            return [a for a in self.selected_analysts if a in default_analysts]
-        return default_analysts
+            return tuple(a for a in self.selected_analysts if a in _DEFAULT_ANALYSTS_SET)
+        return DEFAULT_ANALYSTS
     
     def _run_sequential(
         self,
-        analysts: List[str],
+        analysts: Sequence[str],
         context: AnalysisContext,
         data_manager: DataAccessManager,
         outputs: Dict[str, Any]
@@ -132,7 +156,9 @@ class AnalystsPhase(PhaseExecutor):
         """顺序执行分析师"""
         for analyst_id in analysts:
             try:
-                result = self._run_single_analyst(analyst_id, context, data_manager)
+                result = self._run_single_analyst(
+                    analyst_id, context, data_manager, ticker=outputs["ticker"]
+                )
                 outputs["analysts_run"].append(analyst_id)
                 if result.get("report_field"):
                     outputs["reports_generated"].append(result["report_field"])
@@ -142,30 +168,44 @@ class AnalystsPhase(PhaseExecutor):
     
     def _run_parallel(
         self,
-        analysts: List[str],
+        analysts: Sequence[str],
         context: AnalysisContext,
         data_manager: DataAccessManager,
         outputs: Dict[str, Any]
     ) -> None:
-        """并行执行分析师"""
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(
-                    self._run_single_analyst, analyst_id, context, data_manager
-                ): analyst_id
-                for analyst_id in analysts
-            }
-            
-            for future in as_completed(futures):
-                analyst_id = futures[future]
-                try:
-                    result = future.result()
-                    outputs["analysts_run"].append(analyst_id)
-                    if result.get("report_field"):
-                        outputs["reports_generated"].append(result["report_field"])
-                except Exception as e:
-                    logger.error(f"❌ [{self.phase_name}] {analyst_id} 执行失败: {e}")
-                    outputs["analysts_failed"].append(analyst_id)
+        """
+        并行执行分析师
+
+        分析师耗时几乎全部是等待 LLM 接口返回，未限制并发数时每个分析师一个线程同时发出，
+        阶段耗时约等于最慢的分析师，而不是按线程数分批执行
+        """
+        workers = resolve_max_workers(len(analysts), self.max_workers)
+        # 并行的分析师互不依赖彼此的报告，输入状态只转换一次，所有分析师共用
+        # （run_agent_with_tools 会复制状态和消息列表，不会修改共享的输入）
+        integrator = None if self.use_stub else self._get_integrator()
+        shared_state = integrator.context_to_state(context) if integrator is not None else None
+        completed = run_in_shared_pool(
+            lambda item: self._run_single_analyst(
+                item[1], context, data_manager, shared_state, ticker=outputs["ticker"]
+            ),
+            enumerate(analysts),
+            workers,
+        )
+        # 按提交位置收集结果，全部完成后再按分析师顺序写入 outputs，输出顺序与完成先后无关
+        results: List[Optional[Dict[str, Any]]] = [None] * len(analysts)
+        for (index, analyst_id), future in completed:
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                logger.error(f"❌ [{self.phase_name}] {analyst_id} 执行失败: {e}")
+
+        for analyst_id, result in zip(analysts, results):
+            if result is None:
+                outputs["analysts_failed"].append(analyst_id)
+                continue
+            outputs["analysts_run"].append(analyst_id)
+            if result.get("report_field"):
+                outputs["reports_generated"].append(result["report_field"])
 
     def _get_integrator(self) -> Optional[AgentIntegrator]:
         """获取或创建 Agent 集成器"""
@@ -174,7 +214,7 @@ class AnalystsPhase(PhaseExecutor):
 
         if self._llm is not None and self._toolkit is not None:
             self._integrator = AgentIntegrator(self._llm, self._toolkit)
-            logger.debug(f"🔧 [{self.phase_name}] 创建 Agent 集成器")
+            logger.debug("🔧 [%s] 创建 Agent 集成器", self.phase_name)
             return self._integrator
 
         return None
@@ -183,7 +223,9 @@ class AnalystsPhase(PhaseExecutor):
         self,
         analyst_id: str,
         context: AnalysisContext,
-        data_manager: DataAccessManager
+        data_manager: DataAccessManager,
+        state: Optional[Dict[str, Any]] = None,
+        ticker: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         执行单个分析师
@@ -192,37 +234,40 @@ class AnalystsPhase(PhaseExecutor):
             analyst_id: 分析师 ID
             context: 分析上下文
             data_manager: 数据访问管理器
+            state: 预先转换好的输入状态，None 时从上下文转换
+            ticker: 股票代码（execute 中已读取），None 时从上下文读取
 
         Returns:
             执行结果
         """
-        logger.info(f"🔍 [{self.phase_name}] 执行分析师: {analyst_id}")
+        logger.info("🔍 [%s] 执行分析师: %s", self.phase_name, analyst_id)
 
         # 强制使用桩或没有集成器时使用桩
         if self.use_stub:
-            return self._run_stub_analyst(analyst_id, context)
+            return self._run_stub_analyst(analyst_id, context, ticker)
 
         # 获取 Agent 集成器
         integrator = self._get_integrator()
         if integrator is None:
-            logger.debug(f"⚠️ [{self.phase_name}] 无集成器，使用桩: {analyst_id}")
-            return self._run_stub_analyst(analyst_id, context)
+            logger.debug("⚠️ [%s] 无集成器，使用桩: %s", self.phase_name, analyst_id)
+            return self._run_stub_analyst(analyst_id, context, ticker)
 
         # 获取 Agent
         agent = integrator.get_agent(analyst_id)
         if agent is None:
-            logger.debug(f"⚠️ [{self.phase_name}] Agent 不可用，使用桩: {analyst_id}")
-            return self._run_stub_analyst(analyst_id, context)
+            logger.debug("⚠️ [%s] Agent 不可用，使用桩: %s", self.phase_name, analyst_id)
+            return self._run_stub_analyst(analyst_id, context, ticker)
 
         # 执行实际 Agent
-        return self._run_real_analyst(analyst_id, agent, context, integrator)
+        return self._run_real_analyst(analyst_id, agent, context, integrator, state)
 
     def _run_real_analyst(
         self,
         analyst_id: str,
         agent: Any,
         context: AnalysisContext,
-        integrator: AgentIntegrator
+        integrator: AgentIntegrator,
+        state: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         执行实际的分析师 Agent
@@ -232,15 +277,17 @@ class AnalystsPhase(PhaseExecutor):
             agent: Agent 节点函数
             context: 分析上下文
             integrator: Agent 集成器
+            state: 预先转换好的输入状态，None 时从上下文转换
 
         Returns:
             执行结果
         """
         try:
             # 转换 Context 为 AgentState
-            state = integrator.context_to_state(context)
+            if state is None:
+                state = integrator.context_to_state(context)
 
-            logger.debug(f"📤 [{self.phase_name}] 调用 Agent: {analyst_id}")
+            logger.debug("📤 [%s] 调用 Agent: %s", self.phase_name, analyst_id)
 
             # 使用完整的工具调用循环执行 Agent
             result = integrator.run_agent_with_tools(agent, state, analyst_id)
@@ -250,8 +297,9 @@ class AnalystsPhase(PhaseExecutor):
 
             if report_content:
                 # 写入 Reports 层
-                context.set(DataLayer.REPORTS, report_field, report_content, source=analyst_id)
-                logger.info(f"📝 [{self.phase_name}] 生成报告: {report_field} ({len(report_content)} 字符)")
+                with self._context_lock:
+                    context.set(DataLayer.REPORTS, report_field, report_content, source=analyst_id)
+                logger.info("📝 [%s] 生成报告: %s (%d 字符)", self.phase_name, report_field, len(report_content))
             else:
                 logger.warning(f"⚠️ [{self.phase_name}] Agent 未返回报告: {analyst_id}")
 
@@ -264,33 +312,26 @@ class AnalystsPhase(PhaseExecutor):
     def _run_stub_analyst(
         self,
         analyst_id: str,
-        context: AnalysisContext
+        context: AnalysisContext,
+        ticker: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         运行桩分析师（用于测试）
 
         生成占位报告，写入 Reports 层
         """
-        # 分析师输出字段映射
-        output_field_map = {
-            "market_analyst": "market_report",
-            "news_analyst": "news_report",
-            "sentiment_analyst": "sentiment_report",
-            "fundamentals_analyst": "fundamentals_report",
-            "sector_analyst": "sector_report",
-            "index_analyst": "index_report",
-        }
-
-        report_field = output_field_map.get(analyst_id)
+        report_field = OUTPUT_FIELD_MAP.get(analyst_id)
         if report_field:
             # 生成占位报告
-            ticker = context.get(DataLayer.CONTEXT, "ticker")
-            stub_report = f"[{analyst_id}] 分析报告占位 - {ticker}"
+            if ticker is None:
+                ticker = context.get(DataLayer.CONTEXT, "ticker")
+            stub_report = _stub_text(analyst_id, ticker)
 
             # 写入 Reports 层
-            context.set(DataLayer.REPORTS, report_field, stub_report, source=analyst_id)
+            with self._context_lock:
+                context.set(DataLayer.REPORTS, report_field, stub_report, source=analyst_id)
 
-            logger.debug(f"📝 [{self.phase_name}] 生成桩报告: {report_field}")
+            logger.debug("📝 [%s] 生成桩报告: %s", self.phase_name, report_field)
 
         return {"analyst_id": analyst_id, "report_field": report_field}
 
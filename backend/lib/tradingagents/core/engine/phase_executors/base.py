@@ -5,9 +5,14 @@
 定义阶段执行的标准接口和通用功能
 """
 
+import atexit
+import logging
+import os
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 from tradingagents.utils.logging_init import get_logger
 
@@ -17,6 +22,94 @@ from ..data_contract import AgentDataContract, DataLayer
 
 logger = get_logger("default")
 
+# I/O 密集型线程池的默认上限（每个 CPU 5 个线程，最多 32 个）
+DEFAULT_IO_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 5)
+
+
+def resolve_max_workers(task_count: int, max_workers: Optional[int] = None) -> int:
+    """
+    计算 I/O 密集型任务（等待 LLM/数据接口）的线程池大小
+
+    线程数不超过任务数；未指定上限时使用 DEFAULT_IO_MAX_WORKERS。
+    LLM 接口有并发限流时，建议将上限设为接口允许的并发数（通常 2~8）。
+
+    Args:
+        task_count: 待执行的任务数
+        max_workers: 配置的最大线程数，None 或 0 表示使用默认上限
+
+    Returns:
+        线程池工作线程数（至少为 1）
+    """
+    limit = max_workers or DEFAULT_IO_MAX_WORKERS
+    return max(1, min(task_count, limit))
+
+
+_T = TypeVar("_T")
+
+# 共享线程池的线程上限（线程按需创建；单次调用的并发由 run_in_shared_pool 的 max_workers 控制）
+SHARED_POOL_MAX_WORKERS = 32
+
+# 各阶段共用的 I/O 线程池（首次使用时创建，进程退出时关闭）
+_shared_executor: Optional[ThreadPoolExecutor] = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_shared_executor() -> ThreadPoolExecutor:
+    """获取共享线程池，批量分析多只股票时复用已创建的线程，不再每次执行阶段都新建线程池"""
+    global _shared_executor
+    if _shared_executor is None:
+        with _shared_executor_lock:
+            if _shared_executor is None:
+                _shared_executor = ThreadPoolExecutor(
+                    max_workers=SHARED_POOL_MAX_WORKERS,
+                    thread_name_prefix="phase-io",
+                )
+                atexit.register(_shared_executor.shutdown, wait=False)
+    return _shared_executor
+
+
+def run_in_shared_pool(
+    fn: Callable[[_T], Any],
+    items: Iterable[_T],
+    max_workers: int,
+) -> Iterator[Tuple[_T, Future]]:
+    """
+    在共享线程池中对每个元素执行 fn，同时在途的任务不超过 max_workers
+
+    Yields:
+        按完成顺序产出 (元素, Future)，调用方通过 future.result() 取结果或异常
+    """
+    executor = get_shared_executor()
+    remaining = iter(items)
+    pending: Dict[Future, _T] = {}
+
+    def submit_next() -> None:
+        for item in remaining:
+            pending[executor.submit(fn, item)] = item
+            return
+
+    for _ in range(max(1, max_workers)):
+        submit_next()
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            item = pending.pop(future)
+            submit_next()
+            yield item, future
+
+
+def env_max_workers(env_var: str) -> Optional[int]:
+    """从环境变量读取线程数上限，未设置或非法时返回 None"""
+    value = os.getenv(env_var)
+    if not value:
+        return None
+    try:
+        workers = int(value)
+    except ValueError:
+        logger.warning(f"⚠️ 环境变量 {env_var}={value!r} 不是整数，忽略")
+        return None
+    return workers if workers > 0 else None
+
 
 @dataclass
 class PhaseContext:
@@ -29,18 +122,28 @@ class PhaseContext:
     data_manager: DataAccessManager
     llm_provider: Any = None
     config: Dict[str, Any] = field(default_factory=dict)
+    # 基础信息在阶段开始前已写入 Context 层，创建时读取一次
+    ticker: str = field(init=False)
+    trade_date: str = field(init=False)
+    market_type: str = field(init=False)
+    
+    def __post_init__(self):
+        context_layer = self.analysis_context.view_layer(DataLayer.CONTEXT)
+        self.ticker = context_layer.get("ticker") or ""
+        self.trade_date = context_layer.get("trade_date") or ""
+        self.market_type = context_layer.get("market_type") or "cn"
     
     def get_ticker(self) -> str:
         """获取股票代码"""
-        return self.analysis_context.get(DataLayer.CONTEXT, "ticker") or ""
+        return self.ticker
     
     def get_trade_date(self) -> str:
         """获取交易日期"""
-        return self.analysis_context.get(DataLayer.CONTEXT, "trade_date") or ""
+        return self.trade_date
     
     def get_market_type(self) -> str:
         """获取市场类型"""
-        return self.analysis_context.get(DataLayer.CONTEXT, "market_type") or "cn"
+        return self.market_type
 
 
 class PhaseExecutor(ABC):
@@ -72,6 +175,14 @@ class PhaseExecutor(ABC):
         """
         self.llm_provider = llm_provider
         self.config = config or {}
+        # 必需输入字段展开为 (层, 字段) 列表，每次阶段开始时平铺校验
+        self._required_fields: Tuple[Tuple[DataLayer, str], ...] = tuple(
+            (access.layer, field_name)
+            for contract in self.required_contracts
+            for access in contract.inputs
+            if access.required
+            for field_name in access.fields
+        )
     
     @abstractmethod
     def execute(
@@ -108,17 +219,12 @@ class PhaseExecutor(ABC):
         Returns:
             验证是否通过
         """
-        for contract in self.required_contracts:
-            for access in contract.inputs:
-                if access.required:
-                    for field_name in access.fields:
-                        value = context.get(access.layer, field_name)
-                        if value is None:
-                            logger.warning(
-                                f"⚠️ [{self.phase_name}] 缺少必需输入: "
-                                f"{access.layer.value}.{field_name}"
-                            )
-                            return False
+        for layer, field_name in self._required_fields:
+            if context.get(layer, field_name) is None:
+                logger.warning(
+                    "⚠️ [%s] 缺少必需输入: %s.%s", self.phase_name, layer.value, field_name
+                )
+                return False
         return True
     
     def create_phase_context(
@@ -136,10 +242,12 @@ class PhaseExecutor(ABC):
     
     def log_start(self) -> None:
         """记录阶段开始"""
-        logger.info(f"▶️ [{self.phase_name}] 阶段开始执行")
+        logger.info("▶️ [%s] 阶段开始执行", self.phase_name)
     
     def log_end(self, outputs: Dict[str, Any]) -> None:
         """记录阶段结束"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
         output_keys = list(outputs.keys()) if outputs else []
-        logger.info(f"✅ [{self.phase_name}] 阶段执行完成, 输出: {output_keys}")
+        logger.info("✅ [%s] 阶段执行完成, 输出: %s", self.phase_name, output_keys)
 
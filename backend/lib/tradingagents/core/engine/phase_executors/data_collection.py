@@ -13,6 +13,8 @@
 - Agent 将分析结果写入 Context 供其他 Agent 读取
 """
 
+import re
+from types import MappingProxyType
 from typing import Any, Dict, Optional
 
 from tradingagents.utils.logging_init import get_logger
@@ -24,6 +26,17 @@ from .base import PhaseExecutor
 
 logger = get_logger("default")
 
+# A 股交易所后缀（模块加载时编译一次）
+_CN_SUFFIX_RE = re.compile(r'\.(SZ|SH|BJ)$')
+
+# 交易所后缀 -> 市场类型
+_SUFFIX_MAP = MappingProxyType({
+    "SZ": "cn",
+    "SH": "cn",
+    "BJ": "cn",
+    "HK": "hk",
+})
+
 
 class DataCollectionPhase(PhaseExecutor):
     """
@@ -119,18 +132,17 @@ class DataCollectionPhase(PhaseExecutor):
         if not ticker:
             return "cn"
 
-        ticker_upper = ticker.upper()
+        # 带交易所后缀：A 股 (.SZ/.SH/.BJ) 或港股 (.HK)
+        parts = ticker.upper().rsplit(".", 1)
+        if len(parts) == 2:
+            market_type = _SUFFIX_MAP.get(parts[1])
+            if market_type:
+                return market_type
 
-        # 中国 A 股格式
-        if ticker_upper.endswith((".SZ", ".SH", ".BJ")):
-            return "cn"
+        # 纯 6 位数字为 A 股
         if ticker.isdigit() and len(ticker) == 6:
             return "cn"
 
-        # 港股格式
-        if ticker_upper.endswith(".HK"):
-            return "hk"
-
         # 默认为美股
         return "us"
 
@@ -147,8 +159,6 @@ class DataCollectionPhase(PhaseExecutor):
         Returns:
             规范化后的股票代码
         """
-        import re
-
         if not ticker:
             return ticker
 
@@ -156,8 +166,7 @@ class DataCollectionPhase(PhaseExecutor):
 
         if market_type == "cn":
             # 中国 A 股：去掉后缀，只保留纯 6 位数字（前后端统一）
-            ticker = re.sub(r'\.(SZ|SH|BJ)$', '', ticker)
-            return ticker
+            return _CN_SUFFIX_RE.sub('', ticker)
 
         # 其他市场保持原样
         return ticker
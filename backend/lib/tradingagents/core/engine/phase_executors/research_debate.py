@@ -8,17 +8,95 @@
 3. ResearchManager (研究经理) - 主持辩论，形成投资建议
 """
 
-from typing import Any, Dict, Optional
+import os
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 from tradingagents.utils.logging_init import get_logger
 
 from ..analysis_context import AnalysisContext
 from ..data_access_manager import DataAccessManager
 from ..data_contract import DataLayer
-from .base import PhaseExecutor
+from .base import PhaseExecutor, get_shared_executor
 
 logger = get_logger("default")
 
+# 研究员/研究经理工厂函数在模块加载时导入一次，首轮辩论不再串行等待三次冷导入；
+# 导入失败时为 None，对应 Agent 使用桩实现
+try:
+    from tradingagents.agents.researchers.bull_researcher import create_bull_researcher as _create_bull
+except Exception as e:
+    logger.error(f"❌ [ResearchDebate] 无法导入 BullResearcher，使用桩实现: {e}", exc_info=True)
+    _create_bull = None
+
+try:
+    from tradingagents.agents.researchers.bear_researcher import create_bear_researcher as _create_bear
+except Exception as e:
+    logger.error(f"❌ [ResearchDebate] 无法导入 BearResearcher，使用桩实现: {e}", exc_info=True)
+    _create_bear = None
+
+try:
+    from tradingagents.agents.managers.research_manager import create_research_manager as _create_mgr
+except Exception as e:
+    logger.error(f"❌ [ResearchDebate] 无法导入 ResearchManager，使用桩实现: {e}", exc_info=True)
+    _create_mgr = None
+
+
+def _load_analyst_report_fields() -> Tuple[str, ...]:
+    """从 Agent 配置获取分析师报告字段，配置不可用时回退到硬编码列表"""
+    try:
+        from core.agents.config import BUILTIN_AGENTS, AgentCategory
+    except ImportError:
+        return (
+            "market_report", "news_report", "sentiment_report",
+            "fundamentals_report", "sector_report", "index_report",
+        )
+    return tuple(
+        metadata.output_field
+        for metadata in BUILTIN_AGENTS.values()
+        if metadata.category == AgentCategory.ANALYST and getattr(metadata, "output_field", None)
+    )
+
+
+def merge_investment_debate_updates(
+    debate_state: Dict[str, Any],
+    bull_update: Optional[Dict[str, Any]],
+    bear_update: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    合并多空研究员在同一轮中并行产生的辩论状态
+
+    两个研究员基于同一份 investment_debate_state 运行，合并时按固定顺序（多头在前，
+    空头在后）追加历史，保证结果确定。某一方执行失败（update 为 None）时只合并另一方。
+    各方最新论点另存于 current_bull_response/current_bear_response，
+    下一轮分别作为对方提示词中的 current_response。
+
+    Args:
+        debate_state: 并行执行前的辩论状态
+        bull_update: 多头研究员返回的 investment_debate_state
+        bear_update: 空头研究员返回的 investment_debate_state
+
+    Returns:
+        合并后的 investment_debate_state
+    """
+    merged = dict(debate_state)
+    history = debate_state.get("history", "")
+    count = debate_state.get("count", 0)
+    for update, side_history, side_response in (
+        (bull_update, "bull_history", "current_bull_response"),
+        (bear_update, "bear_history", "current_bear_response"),
+    ):
+        if not update:
+            continue
+        argument = update.get("current_response", "")
+        history = history + "\n" + argument
+        merged[side_history] = update.get(side_history, "")
+        merged[side_response] = argument
+        merged["current_response"] = argument
+        count += 1
+    merged["history"] = history
+    merged["count"] = count
+    return merged
+
 
 class ResearchDebatePhase(PhaseExecutor):
     """
@@ -30,13 +108,17 @@ class ResearchDebatePhase(PhaseExecutor):
 
     phase_name = "ResearchDebatePhase"
 
+    # 分析师报告字段（首次使用时从 Agent 配置加载，之后所有实例共用）
+    _REPORT_FIELDS: ClassVar[Optional[Tuple[str, ...]]] = None
+
     def __init__(
         self,
         llm_provider: Any = None,
         config: Optional[Dict[str, Any]] = None,
         debate_rounds: int = 1,
         integrator: Any = None,
-        memory_config: Optional[Dict[str, Any]] = None
+        memory_config: Optional[Dict[str, Any]] = None,
+        parallel_debate: Optional[bool] = None
     ):
         """
         初始化研究辩论阶段
@@ -47,11 +129,17 @@ class ResearchDebatePhase(PhaseExecutor):
             debate_rounds: 辩论轮数
             integrator: AgentIntegrator 实例
             memory_config: Memory 配置字典
+            parallel_debate: 每轮多空研究员是否并发发言，None 时读取环境变量
+                PARALLEL_RESEARCH_DEBATE_ENABLED（默认开启）。并发时空头看到的是
+                上一轮的多头发言，耗时从两次 LLM 调用之和降为两者中的较大值
         """
         super().__init__(llm_provider, config)
         self.debate_rounds = debate_rounds
         self.integrator = integrator
         self.memory_config = memory_config or {}
+        if parallel_debate is None:
+            parallel_debate = os.getenv("PARALLEL_RESEARCH_DEBATE_ENABLED", "true").lower() == "true"
+        self.parallel_debate = parallel_debate
 
         # 研究员 Agent 缓存
         self._bull_researcher = None
@@ -68,8 +156,10 @@ class ResearchDebatePhase(PhaseExecutor):
         """
         self.log_start()
 
-        ticker = context.get(DataLayer.CONTEXT, "ticker")
-        logger.info(f"🔬 [{self.phase_name}] 研究辩论: {ticker}")
+        # 上下文层只取一次，ticker/trade_date 绑定为局部变量
+        context_layer = context.view_layer(DataLayer.CONTEXT)
+        ticker = context_layer.get("ticker")
+        logger.info("🔬 [%s] 研究辩论: %s", self.phase_name, ticker)
 
         outputs = {
             "ticker": ticker,
@@ -81,33 +171,46 @@ class ResearchDebatePhase(PhaseExecutor):
 
         # 1. 收集分析师报告
         analyst_reports = self._collect_analyst_reports(context)
-        logger.info(f"📋 [{self.phase_name}] 收集到 {len(analyst_reports)} 份分析报告")
+        logger.info("📋 [%s] 收集到 %d 份分析报告", self.phase_name, len(analyst_reports))
 
         # 2. 构建初始状态 (兼容现有 Agent)
-        state = self._build_initial_state(context, analyst_reports)
+        state = self._build_initial_state(
+            context, analyst_reports, ticker or "", context_layer.get("trade_date") or ""
+        )
 
         # 3. 执行多轮辩论
+        # 各方历史按轮收集为列表，结束后一次拼接，避免多轮辩论中反复拼接长字符串
+        bull_parts: List[str] = []
+        bear_parts: List[str] = []
         for round_num in range(self.debate_rounds):
-            logger.info(f"💬 [{self.phase_name}] 辩论第 {round_num + 1}/{self.debate_rounds} 轮")
+            logger.info("💬 [%s] 辩论第 %d/%d 轮", self.phase_name, round_num + 1, self.debate_rounds)
+
+            if self.parallel_debate and self._get_bull_researcher() and self._get_bear_researcher():
+                # 多空研究员并发发言，结束后合并
+                state, bull_argument, bear_argument = self._run_parallel_round(state)
+            else:
+                # 看多研究员发言
+                state = self._run_bull_researcher(state)
+                bull_argument = state["investment_debate_state"].get("current_response", "")
 
-            # 看多研究员发言
-            state = self._run_bull_researcher(state)
-            bull_argument = state["investment_debate_state"].get("current_response", "")
+                # 看空研究员发言
+                state = self._run_bear_researcher(state)
+                bear_argument = state["investment_debate_state"].get("current_response", "")
 
-            # 看空研究员发言
-            state = self._run_bear_researcher(state)
-            bear_argument = state["investment_debate_state"].get("current_response", "")
+            self._drain_side_histories(state, bull_parts, bear_parts)
+            logger.info("📈 [多头] 论点长度: %d 字符", len(bull_argument))
+            logger.info("📉 [空头] 论点长度: %d 字符", len(bear_argument))
 
-            logger.info(f"📈 [多头] 论点长度: {len(bull_argument)} 字符")
-            logger.info(f"📉 [空头] 论点长度: {len(bear_argument)} 字符")
+        bull_history = "".join(bull_parts)
+        bear_history = "".join(bear_parts)
+        state["investment_debate_state"]["bull_history"] = bull_history
+        state["investment_debate_state"]["bear_history"] = bear_history
 
         # 4. 研究经理总结并形成投资建议
         state = self._run_research_manager(state)
         investment_plan = state.get("investment_plan", "")
 
         # 5. 保存结果到 Context
-        bull_history = state["investment_debate_state"].get("bull_history", "")
-        bear_history = state["investment_debate_state"].get("bear_history", "")
 
         context.set(DataLayer.REPORTS, "bull_report", bull_history, source="bull_researcher")
         context.set(DataLayer.REPORTS, "bear_report", bear_history, source="bear_researcher")
@@ -119,47 +222,40 @@ class ResearchDebatePhase(PhaseExecutor):
         outputs["bear_report"] = "generated" if bear_history else None
         outputs["investment_plan"] = "generated" if investment_plan else None
 
-        logger.info(f"📝 [{self.phase_name}] 投资建议长度: {len(investment_plan)} 字符")
+        logger.info("📝 [%s] 投资建议长度: %d 字符", self.phase_name, len(investment_plan))
 
         self.log_end(outputs)
         return outputs
 
     def _collect_analyst_reports(self, context: AnalysisContext) -> Dict[str, str]:
         """收集所有分析师报告"""
-        # 从配置动态获取报告字段
-        try:
-            from core.agents.config import BUILTIN_AGENTS, AgentCategory
-            report_fields = []
-            for agent_id, metadata in BUILTIN_AGENTS.items():
-                if metadata.category == AgentCategory.ANALYST:
-                    if hasattr(metadata, 'output_field') and metadata.output_field:
-                        report_fields.append(metadata.output_field)
-        except ImportError:
-            # 回退到硬编码
-            report_fields = [
-                "market_report", "news_report", "sentiment_report",
-                "fundamentals_report", "sector_report", "index_report",
-            ]
-
-        reports = {}
-        for field in report_fields:
-            report = context.get(DataLayer.REPORTS, field)
-            if report:
-                reports[field] = report
-
-        return reports
+        reports = context.get_many(DataLayer.REPORTS, self._get_report_fields())
+        return {field: report for field, report in reports.items() if report}
+
+    @classmethod
+    def _get_report_fields(cls) -> Tuple[str, ...]:
+        """获取分析师报告字段（按类缓存，每只股票不再重复扫描 BUILTIN_AGENTS）"""
+        fields = cls._REPORT_FIELDS
+        if fields is None:
+            fields = cls._REPORT_FIELDS = _load_analyst_report_fields()
+        return fields
 
     def _build_initial_state(
         self,
         context: AnalysisContext,
-        analyst_reports: Dict[str, str]
+        analyst_reports: Dict[str, str],
+        ticker: Optional[str] = None,
+        trade_date: Optional[str] = None
     ) -> Dict[str, Any]:
-        """构建兼容现有 Agent 的初始状态"""
-        ticker = context.get(DataLayer.CONTEXT, "ticker") or ""
-        trade_date = context.get(DataLayer.CONTEXT, "trade_date") or ""
-
-        # 构建状态
-        state = {
+        """构建兼容现有 Agent 的初始状态（ticker/trade_date 未传入时从上下文读取）"""
+        if ticker is None:
+            ticker = context.get(DataLayer.CONTEXT, "ticker") or ""
+        if trade_date is None:
+            trade_date = context.get(DataLayer.CONTEXT, "trade_date") or ""
+
+        # 构建状态：分析师报告（不可变长字符串）按引用放入顶层，不做任何复制；
+        # 各 _run_* 方法只替换 investment_debate_state 等键，不得对 state 做 deepcopy
+        return {
             "company_of_interest": ticker,
             "trade_date": trade_date,
             "messages": [],
@@ -169,24 +265,40 @@ class ResearchDebatePhase(PhaseExecutor):
                 "bull_history": "",
                 "bear_history": "",
                 "current_response": "",
+                # 并发辩论时各方的最新论点（见 merge_investment_debate_updates）
+                "current_bull_response": "",
+                "current_bear_response": "",
                 "count": 0,
                 "judge_decision": ""
-            }
+            },
+            **analyst_reports,
         }
 
-        # 添加分析师报告
-        for field, report in analyst_reports.items():
-            state[field] = report
+    @staticmethod
+    def _drain_side_histories(
+        state: Dict[str, Any],
+        bull_parts: List[str],
+        bear_parts: List[str]
+    ) -> None:
+        """
+        取出本轮多空研究员追加的历史片段并清空状态中的对应字段
 
-        return state
+        研究员只在 bull_history/bear_history 末尾追加本轮论点（不用于提示词），
+        每轮清空后下一轮只需拼接一段，整场辩论的历史在 execute 结束时一次拼接。
+        """
+        debate_state = state["investment_debate_state"]
+        for key, parts in (("bull_history", bull_parts), ("bear_history", bear_parts)):
+            piece = debate_state.get(key)
+            if piece:
+                parts.append(piece)
+            debate_state[key] = ""
 
     def _get_bull_researcher(self):
         """获取或创建看多研究员"""
-        if self._bull_researcher is None:
+        if self._bull_researcher is None and _create_bull is not None:
             try:
-                from tradingagents.agents.researchers.bull_researcher import create_bull_researcher
                 memory = self.memory_config.get("bull_memory")
-                self._bull_researcher = create_bull_researcher(self.llm_provider, memory)
+                self._bull_researcher = _create_bull(self.llm_provider, memory)
                 logger.debug("🐂 [ResearchDebate] 创建 BullResearcher Agent")
             except Exception as e:
                 logger.error(f"❌ [ResearchDebate] 创建 BullResearcher 失败: {e}")
@@ -194,11 +306,10 @@ class ResearchDebatePhase(PhaseExecutor):
 
     def _get_bear_researcher(self):
         """获取或创建看空研究员"""
-        if self._bear_researcher is None:
+        if self._bear_researcher is None and _create_bear is not None:
             try:
-                from tradingagents.agents.researchers.bear_researcher import create_bear_researcher
                 memory = self.memory_config.get("bear_memory")
-                self._bear_researcher = create_bear_researcher(self.llm_provider, memory)
+                self._bear_researcher = _create_bear(self.llm_provider, memory)
                 logger.debug("🐻 [ResearchDebate] 创建 BearResearcher Agent")
             except Exception as e:
                 logger.error(f"❌ [ResearchDebate] 创建 BearResearcher 失败: {e}")
@@ -206,16 +317,57 @@ class ResearchDebatePhase(PhaseExecutor):
 
     def _get_research_manager(self):
         """获取或创建研究经理"""
-        if self._research_manager is None:
+        if self._research_manager is None and _create_mgr is not None:
             try:
-                from tradingagents.agents.managers.research_manager import create_research_manager
                 memory = self.memory_config.get("invest_judge_memory")
-                self._research_manager = create_research_manager(self.llm_provider, memory)
+                self._research_manager = _create_mgr(self.llm_provider, memory)
                 logger.debug("👔 [ResearchDebate] 创建 ResearchManager Agent")
             except Exception as e:
                 logger.error(f"❌ [ResearchDebate] 创建 ResearchManager 失败: {e}")
         return self._research_manager
 
+    def _run_parallel_round(self, state: Dict[str, Any]) -> Tuple[Dict[str, Any], str, str]:
+        """
+        并发执行一轮多空发言（两者只读取状态，互不修改）
+
+        每方的 current_response 替换为对方上一轮的论点，
+        避免空头把合并后留下的自己上一轮论点当作看涨论点反驳。
+
+        Returns:
+            (合并后的状态, 多头本轮论点, 空头本轮论点)，执行失败一方的论点为空字符串
+        """
+        debate_state = state["investment_debate_state"]
+        # 浅拷贝：顶层报告等字段按引用共享，只替换 investment_debate_state
+        bull_state = {**state, "investment_debate_state": {
+            **debate_state, "current_response": debate_state.get("current_bear_response", ""),
+        }}
+        bear_state = {**state, "investment_debate_state": {
+            **debate_state, "current_response": debate_state.get("current_bull_response", ""),
+        }}
+        executor = get_shared_executor()
+        futures = (
+            ("🐂 [多头研究员]", executor.submit(self._bull_researcher, bull_state)),
+            ("🐻 [空头研究员]", executor.submit(self._bear_researcher, bear_state)),
+        )
+        updates = []
+        for label, future in futures:
+            try:
+                updates.append(future.result().get("investment_debate_state"))
+                logger.info("%s 发言完成", label)
+            except Exception as e:
+                logger.error(f"❌ {label} 执行失败: {e}")
+                updates.append(None)
+
+        bull_update, bear_update = updates
+        state["investment_debate_state"] = merge_investment_debate_updates(
+            debate_state, bull_update, bear_update
+        )
+        return (
+            state,
+            bull_update.get("current_response", "") if bull_update else "",
+            bear_update.get("current_response", "") if bear_update else "",
+        )
+
     def _run_bull_researcher(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """执行看多研究"""
         agent = self._get_bull_researcher()
@@ -225,13 +377,14 @@ class ResearchDebatePhase(PhaseExecutor):
                 # 合并结果到状态
                 if "investment_debate_state" in result:
                     state["investment_debate_state"] = result["investment_debate_state"]
-                logger.info(f"🐂 [多头研究员] 发言完成")
+                logger.info("🐂 [多头研究员] 发言完成")
             except Exception as e:
                 logger.error(f"❌ [多头研究员] 执行失败: {e}")
         else:
             # 桩实现
             logger.warning("⚠️ [ResearchDebate] BullResearcher 不可用，使用桩实现")
-            state["investment_debate_state"]["bull_history"] = "[桩] 看多分析报告"
+            # 与真实研究员一致：每轮以换行开头追加一段历史
+            state["investment_debate_state"]["bull_history"] += "\n[桩] 看多分析报告"
             state["investment_debate_state"]["count"] += 1
         return state
 
@@ -243,12 +396,13 @@ class ResearchDebatePhase(PhaseExecutor):
                 result = agent(state)
                 if "investment_debate_state" in result:
                     state["investment_debate_state"] = result["investment_debate_state"]
-                logger.info(f"🐻 [空头研究员] 发言完成")
+                logger.info("🐻 [空头研究员] 发言完成")
             except Exception as e:
                 logger.error(f"❌ [空头研究员] 执行失败: {e}")
         else:
             logger.warning("⚠️ [ResearchDebate] BearResearcher 不可用，使用桩实现")
-            state["investment_debate_state"]["bear_history"] = "[桩] 看空分析报告"
+            # 与真实研究员一致：每轮以换行开头追加一段历史
+            state["investment_debate_state"]["bear_history"] += "\n[桩] 看空分析报告"
             state["investment_debate_state"]["count"] += 1
         return state
 
@@ -262,7 +416,7 @@ class ResearchDebatePhase(PhaseExecutor):
                     state["investment_debate_state"] = result["investment_debate_state"]
                 if "investment_plan" in result:
                     state["investment_plan"] = result["investment_plan"]
-                logger.info(f"👔 [研究经理] 投资建议生成完成")
+                logger.info("👔 [研究经理] 投资建议生成完成")
             except Exception as e:
                 logger.error(f"❌ [研究经理] 执行失败: {e}")
                 state["investment_plan"] = "[错误] 投资建议生成失败"
@@ -9,17 +9,131 @@
 4. RiskManager (风控经理) - 综合评估，形成最终决策
 """
 
-from typing import Any, Dict, List, Optional
+import os
+import threading
+from collections import OrderedDict
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, Dict, List, Mapping, Optional, Tuple
 
 from tradingagents.utils.logging_init import get_logger
 
 from ..analysis_context import AnalysisContext
 from ..data_access_manager import DataAccessManager
 from ..data_contract import DataLayer
-from .base import PhaseExecutor
+from ._keyword_scan import KeywordGroups, leader_decided
+from ._state_builder import build_agent_base_state
+from .base import PhaseExecutor, get_shared_executor
 
 logger = get_logger("default")
 
+# 风控 Agent 工厂函数在模块加载时导入一次，按股票新建阶段实例时不再重复导入；
+# 导入失败时为 None，对应风控跳过发言
+try:
+    from tradingagents.agents.risk_mgmt.aggresive_debator import create_risky_debator as _create_risky
+except Exception as e:
+    logger.error(f"❌ [RiskAssessment] 无法导入 RiskyAnalyst，使用桩实现: {e}", exc_info=True)
+    _create_risky = None
+
+try:
+    from tradingagents.agents.risk_mgmt.conservative_debator import create_safe_debator as _create_safe
+except Exception as e:
+    logger.error(f"❌ [RiskAssessment] 无法导入 SafeAnalyst，使用桩实现: {e}", exc_info=True)
+    _create_safe = None
+
+try:
+    from tradingagents.agents.risk_mgmt.neutral_debator import create_neutral_debator as _create_neutral
+except Exception as e:
+    logger.error(f"❌ [RiskAssessment] 无法导入 NeutralAnalyst，使用桩实现: {e}", exc_info=True)
+    _create_neutral = None
+
+try:
+    from tradingagents.agents.managers.risk_manager import create_risk_manager as _create_risk_mgr
+except Exception as e:
+    logger.error(f"❌ [RiskAssessment] 无法导入 RiskManager，使用桩实现: {e}", exc_info=True)
+    _create_risk_mgr = None
+
+# 风控辩论初始状态模板（只含不可变值，历史列表在 _new_risk_debate_state 中每次新建）
+_EMPTY_RISK_DEBATE_STATE = MappingProxyType({
+    "current_risky_response": "",
+    "current_safe_response": "",
+    "current_neutral_response": "",
+    "count": 0,
+    "judge_decision": "",
+})
+_RISK_HISTORY_KEYS = ("history", "risky_history", "safe_history", "neutral_history")
+
+# 风控 Agent 读取的分析师报告
+_RISK_REPORT_FIELDS = ("market_report", "sentiment_report", "news_report", "fundamentals_report")
+
+
+def _new_risk_debate_state() -> Dict[str, Any]:
+    """复制辩论状态模板，并为各历史字段新建空列表"""
+    debate_state = dict(_EMPTY_RISK_DEBATE_STATE)
+    for key in _RISK_HISTORY_KEYS:
+        debate_state[key] = []
+    return debate_state
+
+
+# 交易动作关键词（买入 / 卖出 / 持有）
+_ACTION_KEYWORDS = KeywordGroups(
+    ("买入", "增持", "看多", "建议买入", "buy", "bullish"),
+    ("卖出", "减持", "看空", "建议卖出", "sell", "bearish"),
+    ("持有", "观望", "hold", "neutral", "中性"),
+)
+# 买入/卖出严格领先时结论才不同；置信度 0.5 + 0.1 * 得分 在得分为 4 时达到上限 0.9
+_ACTION_DECIDED = partial(leader_decided, winners=(0, 1), saturate_at=4)
+
+# 风险级别关键词（高风险 / 低风险）
+_RISK_LEVEL_KEYWORDS = KeywordGroups(
+    ("高风险", "风险较大", "谨慎", "危险", "high risk"),
+    ("低风险", "安全", "稳健", "low risk"),
+)
+# 任一方严格领先即确定风险级别
+_RISK_LEVEL_DECIDED = partial(leader_decided, winners=(0, 1))
+
+# 风控类型 -> (日志标签, 历史字段, 当前发言字段, latest_speaker)，按发言顺序排列
+_PROFILE_KEYS = MappingProxyType({
+    "risky": ("🔥 [激进风控]", "risky_history", "current_risky_response", "Risky"),
+    "safe": ("🛡️ [稳健风控]", "safe_history", "current_safe_response", "Safe"),
+    "neutral": ("⚖️ [中性风控]", "neutral_history", "current_neutral_response", "Neutral"),
+})
+
+
+def merge_risk_debate_updates(
+    risk_debate_state: Dict[str, Any],
+    updates: Mapping[str, Optional[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """
+    合并各风控在同一轮中并行产生的辩论状态
+
+    各风控基于同一份 risk_debate_state 运行，合并时按固定顺序（激进、稳健、中性）
+    追加历史，保证结果确定。执行失败（update 为 None）或未参与的一方不合并。
+
+    Args:
+        risk_debate_state: 并行执行前的辩论状态
+        updates: 风控类型 -> 该风控返回的 risk_debate_state
+
+    Returns:
+        合并后的 risk_debate_state
+    """
+    merged = dict(risk_debate_state)
+    history = list(risk_debate_state.get("history") or [])
+    count = risk_debate_state.get("count", 0)
+    for profile, (_, history_key, response_key, speaker) in _PROFILE_KEYS.items():
+        update = updates.get(profile)
+        if not update:
+            continue
+        argument = update.get(response_key, "")
+        history.append(argument)
+        merged[history_key] = update.get(history_key, [])
+        merged[response_key] = argument
+        merged["latest_speaker"] = speaker
+        count += 1
+    merged["history"] = history
+    merged["count"] = count
+    return merged
+
 
 class RiskAssessmentPhase(PhaseExecutor):
     """
@@ -30,13 +144,22 @@ class RiskAssessmentPhase(PhaseExecutor):
 
     phase_name = "RiskAssessmentPhase"
 
+    # 风控辩论 Agent 不带 Memory，同一 LLM 提供者的所有阶段实例共用：
+    # (风控类型, id(llm_provider)) -> (llm_provider, Agent)，保留提供者引用防止 id 被复用。
+    # Agent 闭包本身引用 LLM，弱引用字典无法释放，因此按 LRU 限制条目数，
+    # 每次请求新建 LLM 时最多保留最近 _AGENT_CACHE_SIZE 个 Agent
+    _AGENT_CACHE: ClassVar["OrderedDict[Tuple[str, int], Tuple[Any, Any]]"] = OrderedDict()
+    _AGENT_CACHE_SIZE: ClassVar[int] = 12
+    _AGENT_CACHE_LOCK: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(
         self,
         llm_provider: Any = None,
         config: Optional[Dict[str, Any]] = None,
         risk_profiles: Optional[List[str]] = None,
         debate_rounds: int = 1,
-        memory_config: Optional[Dict[str, Any]] = None
+        memory_config: Optional[Dict[str, Any]] = None,
+        parallel_debate: Optional[bool] = None
     ):
         """
         初始化风险评估阶段
@@ -47,11 +170,19 @@ class RiskAssessmentPhase(PhaseExecutor):
             risk_profiles: 风控类型列表，默认全部
             debate_rounds: 辩论轮数
             memory_config: Memory 配置
+            parallel_debate: 每轮各风控是否并发发言，None 时读取环境变量
+                PARALLEL_RISK_PHASE_DEBATE_ENABLED（默认开启）。并发时激进/稳健/中性
+                三方同时发言，各自看到的是上一轮的其他发言，耗时从多次 LLM 调用之和降为
+                其中的最大值。注意与 LangGraph 流程的 PARALLEL_RISK_DEBATE_ENABLED 区分：
+                后者只让稳健/中性并行，激进风控仍先发言
         """
         super().__init__(llm_provider, config)
         self.risk_profiles = risk_profiles or ["risky", "safe", "neutral"]
         self.debate_rounds = debate_rounds
         self.memory_config = memory_config or {}
+        if parallel_debate is None:
+            parallel_debate = os.getenv("PARALLEL_RISK_PHASE_DEBATE_ENABLED", "true").lower() == "true"
+        self.parallel_debate = parallel_debate
 
         # Agent 缓存
         self._risky_analyst = None
@@ -92,9 +223,17 @@ class RiskAssessmentPhase(PhaseExecutor):
         state = self._build_initial_state(context, trader_plan or str(investment_plan))
 
         # 执行多轮风控辩论
+        active_profiles = [p for p in _PROFILE_KEYS if p in self.risk_profiles]
         for round_num in range(self.debate_rounds):
             logger.info(f"💬 [{self.phase_name}] 风控辩论第 {round_num + 1}/{self.debate_rounds} 轮")
 
+            agents = self._get_profile_agents(active_profiles) if self.parallel_debate else None
+            if agents and len(agents) == len(active_profiles) and len(agents) > 1:
+                # 各风控并发发言，结束后按固定顺序合并
+                state = self._run_parallel_round(state, agents)
+                outputs["risk_reports"].extend(active_profiles)
+                continue
+
             # 激进风控发言
             if "risky" in self.risk_profiles:
                 state = self._run_risky_analyst(state)
@@ -117,11 +256,20 @@ class RiskAssessmentPhase(PhaseExecutor):
         risk_debate_state = state.get("risk_debate_state", {})
 
         # 🔥 修改：生成 final_trade_decision（综合投资建议、交易计划、风险评估）
-        final_trade_decision = self._generate_final_trade_decision(context)
+        # 风控经理的结论已在 risk_debate_state.judge_decision 中，直接使用本次结果，
+        # 投资建议和交易计划沿用阶段开始时已读取的值，不再从 Context 重复读取
+        final_trade_decision = self._generate_final_trade_decision(
+            context,
+            investment_plan=investment_plan or "",
+            trader_plan=trader_plan or "",
+            risk_debate_state=risk_debate_state,
+        )
         state["final_trade_decision"] = final_trade_decision
 
-        context.set(DataLayer.DECISIONS, "risk_debate_state", risk_debate_state, source="risk_assessment")
-        context.set(DataLayer.DECISIONS, "final_trade_decision", final_trade_decision, source="risk_assessment")
+        context.set_many(DataLayer.DECISIONS, {
+            "risk_debate_state": risk_debate_state,
+            "final_trade_decision": final_trade_decision,
+        }, source="risk_assessment")
 
         # 生成最终决策
         final_decision = self._form_final_decision_from_text(context, trade_signal, final_trade_decision)
@@ -135,37 +283,35 @@ class RiskAssessmentPhase(PhaseExecutor):
 
     def _build_initial_state(self, context: AnalysisContext, trader_plan: str) -> Dict[str, Any]:
         """构建初始状态"""
-        ticker = context.get(DataLayer.CONTEXT, "ticker") or ""
-        trade_date = context.get(DataLayer.CONTEXT, "trade_date") or ""
+        state = build_agent_base_state(context, _RISK_REPORT_FIELDS)
+        state["trader_investment_plan"] = trader_plan
+        state["investment_plan"] = context.get(DataLayer.DECISIONS, "investment_plan") or ""
+        state["risk_debate_state"] = _new_risk_debate_state()
+        return state
 
-        return {
-            "company_of_interest": ticker,
-            "trade_date": trade_date,
-            "trader_investment_plan": trader_plan,
-            "investment_plan": context.get(DataLayer.DECISIONS, "investment_plan") or "",
-            "market_report": context.get(DataLayer.REPORTS, "market_report") or "",
-            "sentiment_report": context.get(DataLayer.REPORTS, "sentiment_report") or "",
-            "news_report": context.get(DataLayer.REPORTS, "news_report") or "",
-            "fundamentals_report": context.get(DataLayer.REPORTS, "fundamentals_report") or "",
-            "risk_debate_state": {
-                "history": "",
-                "risky_history": "",
-                "safe_history": "",
-                "neutral_history": "",
-                "current_risky_response": "",
-                "current_safe_response": "",
-                "current_neutral_response": "",
-                "count": 0,
-                "judge_decision": ""
-            }
-        }
+    def _get_shared_debator(self, profile: str, factory: Callable[[Any], Any]) -> Any:
+        """获取同一 LLM 提供者共用的风控辩论 Agent，未创建时用 factory 创建"""
+        key = (profile, id(self.llm_provider))
+        cache = self._AGENT_CACHE
+        with self._AGENT_CACHE_LOCK:
+            cached = cache.get(key)
+            if cached is not None and cached[0] is self.llm_provider:
+                cache.move_to_end(key)
+                return cached[1]
+
+        agent = factory(self.llm_provider)
+        with self._AGENT_CACHE_LOCK:
+            cache[key] = (self.llm_provider, agent)
+            cache.move_to_end(key)
+            while len(cache) > self._AGENT_CACHE_SIZE:
+                cache.popitem(last=False)
+        return agent
 
     def _get_risky_analyst(self):
         """获取或创建激进风控"""
-        if self._risky_analyst is None:
+        if self._risky_analyst is None and _create_risky is not None:
             try:
-                from tradingagents.agents.risk_mgmt.aggresive_debator import create_risky_debator
-                self._risky_analyst = create_risky_debator(self.llm_provider)
+                self._risky_analyst = self._get_shared_debator("risky", _create_risky)
                 logger.debug("🔥 [RiskAssessment] 创建 RiskyAnalyst")
             except Exception as e:
                 logger.error(f"❌ [RiskAssessment] 创建 RiskyAnalyst 失败: {e}")
@@ -173,10 +319,9 @@ class RiskAssessmentPhase(PhaseExecutor):
 
     def _get_safe_analyst(self):
         """获取或创建稳健风控"""
-        if self._safe_analyst is None:
+        if self._safe_analyst is None and _create_safe is not None:
             try:
-                from tradingagents.agents.risk_mgmt.conservative_debator import create_safe_debator
-                self._safe_analyst = create_safe_debator(self.llm_provider)
+                self._safe_analyst = self._get_shared_debator("safe", _create_safe)
                 logger.debug("🛡️ [RiskAssessment] 创建 SafeAnalyst")
             except Exception as e:
                 logger.error(f"❌ [RiskAssessment] 创建 SafeAnalyst 失败: {e}")
@@ -184,10 +329,9 @@ class RiskAssessmentPhase(PhaseExecutor):
 
     def _get_neutral_analyst(self):
         """获取或创建中性风控"""
-        if self._neutral_analyst is None:
+        if self._neutral_analyst is None and _create_neutral is not None:
             try:
-                from tradingagents.agents.risk_mgmt.neutral_debator import create_neutral_debator
-                self._neutral_analyst = create_neutral_debator(self.llm_provider)
+                self._neutral_analyst = self._get_shared_debator("neutral", _create_neutral)
                 logger.debug("⚖️ [RiskAssessment] 创建 NeutralAnalyst")
             except Exception as e:
                 logger.error(f"❌ [RiskAssessment] 创建 NeutralAnalyst 失败: {e}")
@@ -195,16 +339,45 @@ class RiskAssessmentPhase(PhaseExecutor):
 
     def _get_risk_manager(self):
         """获取或创建风控经理"""
-        if self._risk_manager is None:
+        if self._risk_manager is None and _create_risk_mgr is not None:
             try:
-                from tradingagents.agents.managers.risk_manager import create_risk_manager
                 memory = self.memory_config.get("risk_memory")
-                self._risk_manager = create_risk_manager(self.llm_provider, memory)
+                self._risk_manager = _create_risk_mgr(self.llm_provider, memory)
                 logger.debug("👔 [RiskAssessment] 创建 RiskManager")
             except Exception as e:
                 logger.error(f"❌ [RiskAssessment] 创建 RiskManager 失败: {e}")
         return self._risk_manager
 
+    def _get_profile_agents(self, profiles: List[str]) -> Dict[str, Any]:
+        """获取指定风控类型中可用的 Agent（风控类型 -> Agent）"""
+        getters = {
+            "risky": self._get_risky_analyst,
+            "safe": self._get_safe_analyst,
+            "neutral": self._get_neutral_analyst,
+        }
+        agents = {}
+        for profile in profiles:
+            agent = getters[profile]()
+            if agent:
+                agents[profile] = agent
+        return agents
+
+    def _run_parallel_round(self, state: Dict[str, Any], agents: Mapping[str, Any]) -> Dict[str, Any]:
+        """并发执行一轮风控发言（各风控只读取同一份状态，互不修改）"""
+        executor = get_shared_executor()
+        futures = [(profile, executor.submit(agent, state)) for profile, agent in agents.items()]
+        updates = {}
+        for profile, future in futures:
+            label = _PROFILE_KEYS[profile][0]
+            try:
+                updates[profile] = future.result().get("risk_debate_state")
+                logger.info("%s 发言完成", label)
+            except Exception as e:
+                logger.error(f"❌ {label} 执行失败: {e}")
+
+        state["risk_debate_state"] = merge_risk_debate_updates(state["risk_debate_state"], updates)
+        return state
+
     def _run_risky_analyst(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """执行激进风控"""
         agent = self._get_risky_analyst()
@@ -266,79 +439,50 @@ class RiskAssessmentPhase(PhaseExecutor):
         trade_signal: Optional[Dict[str, Any]],
         final_text: str
     ) -> Dict[str, Any]:
-        """从风控文本生成最终决策（使用 SignalProcessor 以保持与旧版一致）"""
+        """
+        从风控文本按关键词解析最终决策
+
+        SignalProcessor 需要 quick-thinking LLM，本阶段未接入；旧版无参构造总是失败并回退到
+        这里的关键词解析，因此直接使用关键词解析（小写文本和截断摘要只计算一次）
+        """
         ticker = context.get(DataLayer.CONTEXT, "ticker")
 
-        # 🔥 使用 SignalProcessor 处理 final_trade_decision 文本
-        # 这样可以提取 target_price 和 reasoning，与旧版保持一致
-        try:
-            from tradingagents.graph.signal_processing import SignalProcessor
-            signal_processor = SignalProcessor()
-            decision = signal_processor.process_signal(final_text, ticker)
-            logger.info(f"✅ [RiskAssessment] 使用 SignalProcessor 处理决策: {decision}")
-
-            # 将 reasoning 映射到 rationale 以保持兼容性
-            if "reasoning" in decision and "rationale" not in decision:
-                decision["rationale"] = decision["reasoning"]
-
-            # 添加 risk_level 字段
-            if "risk_level" not in decision:
-                decision["risk_level"] = self._determine_risk_level_from_text(final_text)
-
-            # 添加 ticker 字段
-            decision["ticker"] = ticker
-
-            # 如果有原始交易信号，添加 original_rationale
-            if trade_signal and isinstance(trade_signal, dict):
-                original_rationale = trade_signal.get("rationale", "")
-                decision["original_rationale"] = original_rationale[:200] if original_rationale else ""
-
-            return decision
-
-        except Exception as e:
-            logger.warning(f"⚠️ [RiskAssessment] SignalProcessor 处理失败，使用简单解析: {e}")
-
-            # 降级到简单解析
-            action, confidence = self._parse_action_from_text(final_text)
-
-            # 如果有原始交易信号，合并信息
-            if trade_signal and isinstance(trade_signal, dict):
-                original_position = trade_signal.get("position_size", 0.0)
-                original_rationale = trade_signal.get("rationale", "")
-            else:
-                original_position = 0.5
-                original_rationale = ""
-
-            # 根据风控建议调整仓位
-            if action == "HOLD":
-                position_size = 0.0
-            else:
-                position_size = min(confidence, 1.0) * original_position if original_position > 0 else confidence * 0.5
-
-            return {
-                "ticker": ticker,
-                "action": action,
-                "position_size": position_size,
-                "confidence": confidence,
-                "risk_level": self._determine_risk_level_from_text(final_text),
-                "rationale": final_text[:500] if len(final_text) > 500 else final_text,
-                "reasoning": final_text[:500] if len(final_text) > 500 else final_text,  # 添加 reasoning 字段
-                "original_rationale": original_rationale[:200] if original_rationale else "",
-                "target_price": None,  # 添加 target_price 字段
-                "risk_score": 0.5,  # 添加 risk_score 字段
-            }
-
-    def _parse_action_from_text(self, text: str) -> tuple:
-        """从文本解析交易动作"""
-        text_lower = text.lower()
-
-        buy_keywords = ["买入", "增持", "看多", "建议买入", "buy", "bullish"]
-        sell_keywords = ["卖出", "减持", "看空", "建议卖出", "sell", "bearish"]
-        hold_keywords = ["持有", "观望", "hold", "neutral", "中性"]
-
-        buy_score = sum(1 for kw in buy_keywords if kw in text_lower)
-        sell_score = sum(1 for kw in sell_keywords if kw in text_lower)
-        hold_score = sum(1 for kw in hold_keywords if kw in text_lower)
+        text_lower = final_text.lower()
+        action, confidence = self._parse_action_from_text(final_text, text_lower)
+
+        # 如果有原始交易信号，合并信息
+        if trade_signal and isinstance(trade_signal, dict):
+            original_position = trade_signal.get("position_size", 0.0)
+            original_rationale = trade_signal.get("rationale", "")
+        else:
+            original_position = 0.5
+            original_rationale = ""
+
+        # 根据风控建议调整仓位
+        if action == "HOLD":
+            position_size = 0.0
+        else:
+            position_size = min(confidence, 1.0) * original_position if original_position > 0 else confidence * 0.5
+
+        summary = final_text[:500] if len(final_text) > 500 else final_text
+        return {
+            "ticker": ticker,
+            "action": action,
+            "position_size": position_size,
+            "confidence": confidence,
+            "risk_level": self._determine_risk_level_from_text(final_text, text_lower),
+            "rationale": summary,
+            "reasoning": summary,  # 添加 reasoning 字段
+            "original_rationale": original_rationale[:200] if original_rationale else "",
+            "target_price": None,  # 添加 target_price 字段
+            "risk_score": 0.5,  # 添加 risk_score 字段
+        }
+
+    def _parse_action_from_text(self, text: str, text_lower: Optional[str] = None) -> tuple:
+        """从文本解析交易动作（text_lower 为调用方已计算好的小写文本）"""
+        if text_lower is None:
+            text_lower = text.lower()
+        buy_score, sell_score, hold_score = _ACTION_KEYWORDS.scores(text_lower, _ACTION_DECIDED)
 
         if buy_score > sell_score and buy_score > hold_score:
             return "BUY", min(0.5 + buy_score * 0.1, 0.9)
@@ -347,15 +491,11 @@ class RiskAssessmentPhase(PhaseExecutor):
         else:
             return "HOLD", 0.5
 
-    def _determine_risk_level_from_text(self, text: str) -> str:
-        """从文本判断风险级别"""
-        text_lower = text.lower()
-
-        high_risk_keywords = ["高风险", "风险较大", "谨慎", "危险", "high risk"]
-        low_risk_keywords = ["低风险", "安全", "稳健", "low risk"]
-
-        high_score = sum(1 for kw in high_risk_keywords if kw in text_lower)
-        low_score = sum(1 for kw in low_risk_keywords if kw in text_lower)
+    def _determine_risk_level_from_text(self, text: str, text_lower: Optional[str] = None) -> str:
+        """从文本判断风险级别（text_lower 为调用方已计算好的小写文本）"""
+        if text_lower is None:
+            text_lower = text.lower()
+        high_score, low_score = _RISK_LEVEL_KEYWORDS.scores(text_lower, _RISK_LEVEL_DECIDED)
 
         if high_score > low_score:
             return "high"
@@ -364,7 +504,13 @@ class RiskAssessmentPhase(PhaseExecutor):
         else:
             return "medium"
 
-    def _generate_final_trade_decision(self, context: "AnalysisContext") -> str:
+    def _generate_final_trade_decision(
+        self,
+        context: "AnalysisContext",
+        investment_plan: Optional[Any] = None,
+        trader_plan: Optional[Any] = None,
+        risk_debate_state: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
         生成最终交易决策
 
@@ -375,16 +521,20 @@ class RiskAssessmentPhase(PhaseExecutor):
 
         Args:
             context: 分析上下文
+            investment_plan: 投资建议，None 时从 Context 读取
+            trader_plan: 交易计划，None 时从 Context 读取
+            risk_debate_state: 风控辩论状态，None 时从 Context 读取
 
         Returns:
             最终交易决策文本（Markdown 格式）
         """
-        from ..data_contract import DataLayer
-
-        # 提取各个报告
-        investment_plan = context.get(DataLayer.DECISIONS, "investment_plan") or ""
-        trader_plan = context.get(DataLayer.DECISIONS, "trader_investment_plan") or ""
-        risk_debate_state = context.get(DataLayer.DECISIONS, "risk_debate_state") or {}
+        # 提取各个报告（调用方未传入时从 Context 读取）
+        if investment_plan is None:
+            investment_plan = context.get(DataLayer.DECISIONS, "investment_plan") or ""
+        if trader_plan is None:
+            trader_plan = context.get(DataLayer.DECISIONS, "trader_investment_plan") or ""
+        if risk_debate_state is None:
+            risk_debate_state = context.get(DataLayer.DECISIONS, "risk_debate_state") or {}
         risk_assessment = risk_debate_state.get("judge_decision", "") if isinstance(risk_debate_state, dict) else ""
 
         # 如果三个都为空，返回空字符串
@@ -392,20 +542,25 @@ class RiskAssessmentPhase(PhaseExecutor):
             logger.warning("⚠️ [RiskAssessment] 无法生成 final_trade_decision：所有输入报告均为空")
             return ""
 
-        # 构建最终决策（Markdown 格式）
-        sections = []
-
-        if investment_plan:
-            sections.append(f"## 📋 投资建议\n\n{investment_plan}")
-
-        if trader_plan:
-            sections.append(f"## 💼 交易计划\n\n{trader_plan}")
-
-        if risk_assessment:
-            sections.append(f"## ⚠️ 风险评估\n\n{risk_assessment}")
-
-        final_decision = "\n\n".join(sections)
-        logger.info(f"✅ [RiskAssessment] 生成 final_trade_decision，包含 {len(sections)} 个部分")
+        # 构建最终决策（Markdown 格式）：标题与正文作为片段收集，最后一次拼接，
+        # 不为每个部分单独生成包含整段正文的中间字符串
+        parts = []
+        section_count = 0
+        for title, body in (
+            ("## 📋 投资建议\n\n", investment_plan),
+            ("## 💼 交易计划\n\n", trader_plan),
+            ("## ⚠️ 风险评估\n\n", risk_assessment),
+        ):
+            if not body:
+                continue
+            if section_count:
+                parts.append("\n\n")
+            parts.append(title)
+            parts.append(body if isinstance(body, str) else str(body))
+            section_count += 1
+
+        final_decision = "".join(parts)
+        logger.info("✅ [RiskAssessment] 生成 final_trade_decision，包含 %d 个部分", section_count)
 
         return final_decision
 
@@ -6,6 +6,7 @@
 - Trader (交易员) - 生成具体的交易信号
 """
 
+from functools import partial
 from typing import Any, Dict, Optional
 
 from tradingagents.utils.logging_init import get_logger
@@ -13,10 +14,28 @@ from tradingagents.utils.logging_init import get_logger
 from ..analysis_context import AnalysisContext
 from ..data_access_manager import DataAccessManager
 from ..data_contract import DataLayer
+from ._keyword_scan import KeywordGroups, leader_decided
+from ._state_builder import build_agent_base_state
 from .base import PhaseExecutor
 
 logger = get_logger("default")
 
+# Trader 工厂函数在模块加载时导入一次；导入失败时为 None，回退到简单解析
+try:
+    from tradingagents.agents.trader.trader import create_trader as _create_trader
+except Exception as e:
+    logger.error(f"❌ [TradeDecision] 无法导入 Trader，回退到简单解析: {e}", exc_info=True)
+    _create_trader = None
+
+# 投资建议关键词（买入 / 卖出 / 持有）
+_RECOMMENDATION_KEYWORDS = KeywordGroups(
+    ("买入", "增持", "看多", "建议买入", "buy", "bullish", "看涨"),
+    ("卖出", "减持", "看空", "建议卖出", "sell", "bearish", "看跌"),
+    ("持有", "观望", "hold", "neutral", "中性"),
+)
+# 买入/卖出严格领先时结论才不同；置信度 0.5 + 0.1 * 得分 在得分为 4 时达到上限 0.9
+_RECOMMENDATION_DECIDED = partial(leader_decided, winners=(0, 1), saturate_at=4)
+
 
 class TradeDecisionPhase(PhaseExecutor):
     """
@@ -78,13 +97,15 @@ class TradeDecisionPhase(PhaseExecutor):
         if trader_result:
             trader_plan = trader_result.get("trader_investment_plan", "")
 
-            # 保存交易员的投资计划
-            context.set(DataLayer.DECISIONS, "trader_investment_plan", trader_plan, source="trader")
-            outputs["trader_investment_plan"] = "generated" if trader_plan else None
-
             # 从交易员结果中解析交易信号
             trade_signal = self._parse_trade_signal(context, trader_plan, investment_plan)
-            context.set(DataLayer.DECISIONS, "trade_signal", trade_signal, source="trader")
+
+            # 保存交易员的投资计划和交易信号
+            context.set_many(DataLayer.DECISIONS, {
+                "trader_investment_plan": trader_plan,
+                "trade_signal": trade_signal,
+            }, source="trader")
+            outputs["trader_investment_plan"] = "generated" if trader_plan else None
             outputs["trade_signal"] = trade_signal.get("action")
 
             logger.info(f"📝 [{self.phase_name}] 交易信号: {trade_signal.get('action')}, "
@@ -100,12 +121,11 @@ class TradeDecisionPhase(PhaseExecutor):
 
     def _get_trader(self):
         """获取或创建 Trader Agent"""
-        if self._trader is None:
+        if self._trader is None and _create_trader is not None:
             try:
-                from tradingagents.agents.trader.trader import create_trader
                 # 支持两种 key 格式: "trader" 或 "trader_memory"
                 memory = self.memory_config.get("trader") or self.memory_config.get("trader_memory")
-                self._trader = create_trader(self.llm_provider, memory)
+                self._trader = _create_trader(self.llm_provider, memory)
                 logger.debug("💰 [TradeDecision] 创建 Trader Agent")
             except Exception as e:
                 logger.error(f"❌ [TradeDecision] 创建 Trader 失败: {e}")
@@ -119,22 +139,11 @@ class TradeDecisionPhase(PhaseExecutor):
             return None
 
         try:
-            # 构建兼容现有 Agent 的状态
-            ticker = context.get(DataLayer.CONTEXT, "ticker") or ""
-            trade_date = context.get(DataLayer.CONTEXT, "trade_date") or ""
-
-            state = {
-                "company_of_interest": ticker,
-                "trade_date": trade_date,
-                "investment_plan": investment_plan if isinstance(investment_plan, str) else str(investment_plan),
-                # 收集所有分析报告
-                "market_report": context.get(DataLayer.REPORTS, "market_report") or "",
-                "sentiment_report": context.get(DataLayer.REPORTS, "sentiment_report") or "",
-                "news_report": context.get(DataLayer.REPORTS, "news_report") or "",
-                "fundamentals_report": context.get(DataLayer.REPORTS, "fundamentals_report") or "",
-                "sector_report": context.get(DataLayer.REPORTS, "sector_report") or "",
-                "index_report": context.get(DataLayer.REPORTS, "index_report") or "",
-            }
+            # 构建兼容现有 Agent 的状态（包含所有分析报告）
+            state = build_agent_base_state(context)
+            state["investment_plan"] = (
+                investment_plan if isinstance(investment_plan, str) else str(investment_plan)
+            )
 
             result = trader(state)
             logger.info("💰 [Trader] 交易决策生成完成")
@@ -254,16 +263,8 @@ class TradeDecisionPhase(PhaseExecutor):
         Returns:
             (recommendation, confidence) 元组
         """
-        text_lower = text.lower()
-
-        # 简单的关键词匹配
-        buy_keywords = ["买入", "增持", "看多", "建议买入", "buy", "bullish", "看涨"]
-        sell_keywords = ["卖出", "减持", "看空", "建议卖出", "sell", "bearish", "看跌"]
-        hold_keywords = ["持有", "观望", "hold", "neutral", "中性"]
-
-        buy_score = sum(1 for kw in buy_keywords if kw in text_lower)
-        sell_score = sum(1 for kw in sell_keywords if kw in text_lower)
-        hold_score = sum(1 for kw in hold_keywords if kw in text_lower)
+        # 简单的关键词匹配（一次扫描得到各组命中数）
+        buy_score, sell_score, hold_score = _RECOMMENDATION_KEYWORDS.scores(text.lower(), _RECOMMENDATION_DECIDED)
 
         # 确定建议
         if buy_score > sell_score and buy_score > hold_score:
@@ -13,7 +13,7 @@
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, List, Mapping, Optional, Type
 from datetime import datetime
 
 from tradingagents.utils.logging_init import get_logger
@@ -132,7 +132,7 @@ class StockAnalysisEngine:
             )
         return self._memory_provider
 
-    def _get_memory_config(self) -> Dict[str, Any]:
+    def _get_memory_config(self) -> Mapping[str, Any]:
         """获取 Memory 配置"""
         return self._get_memory_provider().get_memory_config()
     
@@ -17,6 +17,10 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # 风险辩论中保守/中性分析师并行发言（中性分析师将看到上一轮的保守观点）
+    # 仅作用于 LangGraph 流程；阶段执行引擎的 RiskAssessmentPhase 三方并行由
+    # PARALLEL_RISK_PHASE_DEBATE_ENABLED 单独控制
+    "parallel_risk_debate": os.getenv("PARALLEL_RISK_DEBATE_ENABLED", "true").lower() == "true",
     # Tool settings - 从环境变量读取，提供默认值
     "online_tools": os.getenv("ONLINE_TOOLS_ENABLED", "false").lower() == "true",
     "online_news": os.getenv("ONLINE_NEWS_ENABLED", "true").lower() == "true", 
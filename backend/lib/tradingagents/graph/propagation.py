@@ -39,7 +39,7 @@ class Propagator:
             ),
             "risk_debate_state": RiskDebateState(
                 {
-                    "history": "",
+                    "history": [],
                     "current_risky_response": "",
                     "current_safe_response": "",
                     "current_neutral_response": "",
@@ -28,6 +28,7 @@ from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
     RiskDebateState,
+    debate_history_text,
 )
 from tradingagents.dataflows.interface import set_config
 
@@ -1140,6 +1141,7 @@ class TradingAgentsGraph:
         - "Bull Researcher", "Bear Researcher", "Research Manager"
         - "Trader"
         - "Risky Analyst", "Safe Analyst", "Neutral Analyst", "Risk Judge"
+        - "Safe & Neutral Analysts"（并行风险辩论模式）
         """
         try:
             # 从chunk中提取当前执行的节点信息
@@ -1191,6 +1193,7 @@ class TradingAgentsGraph:
                 'Risky Analyst': "🔥 激进风险评估",
                 'Safe Analyst': "🛡️ 保守风险评估",
                 'Neutral Analyst': "⚖️ 中性风险评估",
+                'Safe & Neutral Analysts': "🛡️⚖️ 保守/中性风险评估",
                 'Risk Judge': "🎯 风险经理",
             }
 
@@ -1427,10 +1430,10 @@ class TradingAgentsGraph:
             },
             "trader_investment_decision": final_state.get("trader_investment_plan", ""),
             "risk_debate_state": {
-                "risky_history": risk_debate.get("risky_history", ""),
-                "safe_history": risk_debate.get("safe_history", ""),
-                "neutral_history": risk_debate.get("neutral_history", ""),
-                "history": risk_debate.get("history", ""),
+                "risky_history": debate_history_text(risk_debate.get("risky_history")),
+                "safe_history": debate_history_text(risk_debate.get("safe_history")),
+                "neutral_history": debate_history_text(risk_debate.get("neutral_history")),
+                "history": debate_history_text(risk_debate.get("history")),
                 "judge_decision": risk_debate.get("judge_decision", ""),
             },
             "investment_plan": final_state.get("investment_plan", ""),
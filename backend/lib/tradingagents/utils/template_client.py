@@ -14,6 +14,12 @@ from tradingagents.utils.logging_init import get_logger
 
 logger = get_logger("template_client")
 
+# 模板变量占位符（模块加载时编译一次，避免每次渲染重复编译）
+# 1. 双层花括号 {{variable.path}}（Jinja2风格）
+# 2. 单层花括号 {variable}（变量名只能是字母、数字、下划线的组合）
+_DOUBLE_BRACE_PATTERN = re.compile(r'\{\{([^}]+)\}\}')
+_SINGLE_BRACE_PATTERN = re.compile(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}')
+
 
 class TemplateClient:
     """提示词模板客户端 - 直接连接MongoDB"""
@@ -281,9 +287,6 @@ class TemplateClient:
             # 1. 双层花括号 {{variable.path}}（Jinja2风格，优先级高）
             # 2. 单层花括号 {variable}（简单变量，避免与内容冲突）
             # 先处理双层花括号，再处理单层花括号（避免冲突）
-            double_brace_pattern = re.compile(r'\{\{([^}]+)\}\}')
-            # 单层花括号：只匹配 {变量名}，变量名只能是字母、数字、下划线的组合
-            single_brace_pattern = re.compile(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}')
 
             for key, value in template_content.items():
                 if isinstance(value, str):
@@ -295,7 +298,7 @@ class TemplateClient:
                         val = get_nested_value(variables, var_path)
                         return str(val) if val is not None else ''
                     
-                    formatted_value = double_brace_pattern.sub(replacer_double, formatted_value)
+                    formatted_value = _DOUBLE_BRACE_PATTERN.sub(replacer_double, formatted_value)
                     
                     # 第二步：替换单层花括号变量 {variable}（仅匹配简单变量名）
                     def replacer_single(match):
@@ -304,15 +307,15 @@ class TemplateClient:
                         val = variables.get(var_name)
                         return str(val) if val is not None else ''
                     
-                    formatted_value = single_brace_pattern.sub(replacer_single, formatted_value)
+                    formatted_value = _SINGLE_BRACE_PATTERN.sub(replacer_single, formatted_value)
                     formatted[key] = formatted_value
 
                     # 检查是否还有未替换的变量（只针对system_prompt和user_prompt）
                     if key in ['system_prompt', 'user_prompt']:
                         # 检查双层花括号
-                        unmatched_double = re.findall(r'\{\{([^}]+)\}\}', formatted_value)
+                        unmatched_double = _DOUBLE_BRACE_PATTERN.findall(formatted_value)
                         # 检查单层花括号（简单变量名）
-                        unmatched_single = re.findall(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}', formatted_value)
+                        unmatched_single = _SINGLE_BRACE_PATTERN.findall(formatted_value)
                         if unmatched_double or unmatched_single:
                             total_unmatched = len(unmatched_double) + len(unmatched_single)
                             logger.warning(f"⚠️ [模板渲染] {key} 中可能有 {total_unmatched} 个未渲染的变量")
@@ -348,6 +351,71 @@ def get_template_client() -> TemplateClient:
     return _template_client
 
 
+def render_agent_prompt(
+    template_content: Dict[str, Any],
+    variables: Dict[str, str],
+    agent_type: str,
+    agent_name: str
+) -> str:
+    """
+    将模板内容渲染并组合为完整提示词
+
+    Args:
+        template_content: 模板内容字典（从get_effective_template返回）
+        variables: 模板变量字典
+        agent_type: Agent类型（仅用于日志）
+        agent_name: Agent名称（仅用于日志）
+
+    Returns:
+        完整的提示词字符串
+    """
+    client = get_template_client()
+
+    logger.info(f"📝 [模板渲染] 开始格式化模板，变量数量: {len(variables)}")
+    logger.info(f"📝 [模板渲染] 模板字段: {list(template_content.keys())}")
+
+    # 格式化模板
+    formatted = client.format_template(template_content, variables)
+
+    logger.info(f"📝 [模板渲染] 格式化完成，检查渲染结果...")
+    # 检查是否还有未渲染的变量
+    for key, value in formatted.items():
+        if isinstance(value, str) and ('{{' in value or '{' in value):
+            # 检查双层花括号
+            unmatched_double = _DOUBLE_BRACE_PATTERN.findall(value)
+            # 检查单层花括号（简单变量名）
+            unmatched_single = _SINGLE_BRACE_PATTERN.findall(value)
+
+            if unmatched_double or unmatched_single:
+                total_unmatched = len(unmatched_double) + len(unmatched_single)
+                logger.warning(f"⚠️ [模板渲染] {key} 中可能有 {total_unmatched} 个未渲染的变量")
+                # 显示前200字符
+                logger.warning(f"⚠️ [模板渲染] {key} 前200字符: {value[:200]}")
+                # 打印具体的未渲染变量名
+                if unmatched_double:
+                    logger.warning(f"  📌 未渲染变量(双层花括号): {', '.join(unmatched_double)}")
+                if unmatched_single:
+                    logger.warning(f"  📌 未渲染变量(单层花括号): {', '.join(unmatched_single)}")
+
+    # 组合完整提示词
+    parts = []
+    if formatted.get("system_prompt"):
+        parts.append(formatted["system_prompt"])
+    if formatted.get("tool_guidance"):
+        parts.append("\n\n" + formatted["tool_guidance"])
+    if formatted.get("analysis_requirements"):
+        parts.append("\n\n" + formatted["analysis_requirements"])
+    if formatted.get("output_format"):
+        parts.append("\n\n" + formatted["output_format"])
+    if formatted.get("constraints"):
+        parts.append("\n\n" + formatted["constraints"])
+
+    prompt = "\n".join(parts)
+    logger.info(f"✅ 成功生成提示词: {agent_type}/{agent_name} (长度: {len(prompt)})")
+    logger.info(f"📝 [模板渲染] 提示词: {prompt}")
+    return prompt
+
+
 def get_agent_prompt(
     agent_type: str,
     agent_name: str,
@@ -378,49 +446,7 @@ def get_agent_prompt(
         template_content = client.get_effective_template(agent_type, agent_name, user_id, preference_id, context)
 
         if template_content:
-            logger.info(f"📝 [模板渲染] 开始格式化模板，变量数量: {len(variables)}")
-            logger.info(f"📝 [模板渲染] 模板字段: {list(template_content.keys())}")
-
-            # 格式化模板
-            formatted = client.format_template(template_content, variables)
-
-            logger.info(f"📝 [模板渲染] 格式化完成，检查渲染结果...")
-            # 检查是否还有未渲染的变量
-            for key, value in formatted.items():
-                if isinstance(value, str) and ('{{' in value or '{' in value):
-                    # 检查双层花括号
-                    unmatched_double = re.findall(r'\{\{([^}]+)\}\}', value)
-                    # 检查单层花括号（简单变量名）
-                    unmatched_single = re.findall(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}', value)
-
-                    if unmatched_double or unmatched_single:
-                        total_unmatched = len(unmatched_double) + len(unmatched_single)
-                        logger.warning(f"⚠️ [模板渲染] {key} 中可能有 {total_unmatched} 个未渲染的变量")
-                        # 显示前200字符
-                        logger.warning(f"⚠️ [模板渲染] {key} 前200字符: {value[:200]}")
-                        # 打印具体的未渲染变量名
-                        if unmatched_double:
-                            logger.warning(f"  📌 未渲染变量(双层花括号): {', '.join(unmatched_double)}")
-                        if unmatched_single:
-                            logger.warning(f"  📌 未渲染变量(单层花括号): {', '.join(unmatched_single)}")
-
-            # 组合完整提示词
-            parts = []
-            if formatted.get("system_prompt"):
-                parts.append(formatted["system_prompt"])
-            if formatted.get("tool_guidance"):
-                parts.append("\n\n" + formatted["tool_guidance"])
-            if formatted.get("analysis_requirements"):
-                parts.append("\n\n" + formatted["analysis_requirements"])
-            if formatted.get("output_format"):
-                parts.append("\n\n" + formatted["output_format"])
-            if formatted.get("constraints"):
-                parts.append("\n\n" + formatted["constraints"])
-
-            prompt = "\n".join(parts)
-            logger.info(f"✅ 成功生成提示词: {agent_type}/{agent_name} (长度: {len(prompt)})")
-            logger.info(f"📝 [模板渲染] 提示词: {prompt}")
-            return prompt
+            return render_agent_prompt(template_content, variables, agent_type, agent_name)
         else:
             # 降级：使用硬编码提示词
             logger.warning(
@@ -481,8 +507,8 @@ def get_user_prompt(
             user_prompt = formatted.get("user_prompt", "")
             if user_prompt:
                 # 检查是否还有未渲染的变量
-                unmatched_double = re.findall(r'\{\{([^}]+)\}\}', user_prompt)
-                unmatched_single = re.findall(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}', user_prompt)
+                unmatched_double = _DOUBLE_BRACE_PATTERN.findall(user_prompt)
+                unmatched_single = _SINGLE_BRACE_PATTERN.findall(user_prompt)
 
                 if unmatched_double or unmatched_single:
                     total_unmatched = len(unmatched_double) + len(unmatched_single)
@@ -519,5 +545,7 @@ def close_template_client():
     if _template_client is not None:
         _template_client.client.close()
         _template_client = None
+        from tradingagents.agents.utils.agent_context import clear_system_prompt_cache
+        clear_system_prompt_cache()
         logger.info("✅ 模板客户端连接已关闭")
 